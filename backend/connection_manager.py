@@ -2,10 +2,17 @@
 WebSocket 连接管理器
 负责管理客户端连接和消息广播
 支持按用户隔离连接
+每个连接由一个 OutboundWriter 后台任务负责发送（合并短时间内的连续消息，缓冲区满时背压）
+以 delta 协议连接的客户端，round_state 由 RoundStateDeltaEncoder 编码为增量
 """
 from typing import List, Dict, Optional
 from fastapi import WebSocket
 
+from backend.json_codec import dumps
+from backend.outbound_writer import OutboundWriter
+from backend.state_delta import RoundStateDeltaEncoder
+from poker_assistant.utils.config import Config
+
 class ConnectionManager:
     def __init__(self):
         # 活跃连接列表（保留用于兼容性）
@@ -16,11 +23,31 @@ class ConnectionManager:
         
         # WebSocket 到用户 ID 的映射: {websocket: user_id}
         self.websocket_to_user: Dict[WebSocket, str] = {}
+        
+        # 每个连接的出站写入器: {websocket: OutboundWriter}
+        self.writers: Dict[WebSocket, OutboundWriter] = {}
+        
+        # delta 协议连接的增量编码器: {websocket: RoundStateDeltaEncoder}
+        self.delta_encoders: Dict[WebSocket, RoundStateDeltaEncoder] = {}
+        
+        config = Config()
+        self.send_buffer_size = config.WS_SEND_BUFFER_SIZE
+        self.batch_window = config.WS_BATCH_WINDOW_MS / 1000
 
-    async def connect(self, websocket: WebSocket, user_id: Optional[str] = None):
-        """接受新连接"""
+    async def connect(self, websocket: WebSocket, user_id: Optional[str] = None, delta: bool = False):
+        """
+        接受新连接
+        
+        Args:
+            delta: 是否使用 round_state 增量协议
+        """
         await websocket.accept()
         self.active_connections.append(websocket)
+        writer = OutboundWriter(websocket, self.send_buffer_size, self.batch_window)
+        writer.start()
+        self.writers[websocket] = writer
+        if delta:
+            self.delta_encoders[websocket] = RoundStateDeltaEncoder()
         
         # 如果提供了 user_id，添加到用户连接映射
         if user_id:
@@ -37,6 +64,11 @@ class ConnectionManager:
         if websocket in self.active_connections:
             self.active_connections.remove(websocket)
         
+        writer = self.writers.pop(websocket, None)
+        if writer is not None:
+            writer.close()
+        self.delta_encoders.pop(websocket, None)
+        
         # 从用户连接映射中移除
         user_id = self.websocket_to_user.get(websocket)
         if user_id and user_id in self.user_connections:
@@ -54,23 +86,41 @@ class ConnectionManager:
 
     async def send_personal_message(self, message: dict, websocket: WebSocket):
         """发送私信 (JSON)"""
-        await websocket.send_json(message)
+        encoder = self.delta_encoders.get(websocket)
+        if encoder is not None:
+            message = encoder.encode(message)
+        writer = self.writers.get(websocket)
+        if writer is not None:
+            await writer.send(message)
+        else:
+            await websocket.send_text(dumps(message))
+
+    async def resync(self, websocket: WebSocket):
+        """向 delta 协议连接重新发送完整 round_state（客户端发现 seq 不连续时请求）"""
+        encoder = self.delta_encoders.get(websocket)
+        if encoder is None:
+            return
+        writer = self.writers.get(websocket)
+        if writer is not None:
+            await writer.send(encoder.snapshot())
+        else:
+            await websocket.send_text(dumps(encoder.snapshot()))
 
     async def send_to_user(self, message: dict, user_id: str):
         """向特定用户的所有连接发送消息"""
         if user_id in self.user_connections:
-            for websocket in self.user_connections[user_id]:
+            for websocket in list(self.user_connections[user_id]):
                 try:
-                    await websocket.send_json(message)
+                    await self.send_personal_message(message, websocket)
                 except Exception as e:
                     print(f"Send to user {user_id} error: {e}")
                     # 可以在这里处理断开连接逻辑
 
     async def broadcast(self, message: dict):
         """广播消息给所有连接 (JSON) - 保留用于向后兼容"""
-        for connection in self.active_connections:
+        for connection in list(self.active_connections):
             try:
-                await connection.send_json(message)
+                await self.send_personal_message(message, connection)
             except Exception as e:
                 print(f"Broadcast error: {e}")
                 # 可以在这里处理断开连接逻辑
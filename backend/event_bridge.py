@@ -0,0 +1,85 @@
+"""
+游戏线程 -> asyncio 事件循环的事件通道
+替代 queue.Queue + get_nowait 轮询（空队列时每 0.1 秒唤醒一次，且每个事件最多延迟 100ms）:
+
+- 游戏线程 put() 把事件放入缓冲区，并通过 loop.call_soon_threadsafe 唤醒事件循环
+- 事件循环端 get_batch() 在缓冲区为空时挂起，不占用 CPU
+- 连续多个 put()（如多个机器人连续行动）只触发一次唤醒，get_batch() 一次取出全部积压事件
+"""
+import asyncio
+import threading
+from collections import deque
+from typing import Any, Deque, List, Optional
+
+
+class EventBridge:
+    """线程安全的事件通道（生产者为任意线程，消费者为绑定的事件循环）"""
+
+    def __init__(self):
+        self._buffer: Deque[Any] = deque()
+        self._lock = threading.Lock()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._event: Optional[asyncio.Event] = None
+        self._wakeup_pending = False
+
+    def bind(self, loop: asyncio.AbstractEventLoop):
+        """绑定消费者所在的事件循环（在事件循环线程中调用）"""
+        with self._lock:
+            self._loop = loop
+            self._event = asyncio.Event()
+            self._wakeup_pending = False
+            if self._buffer:
+                self._event.set()
+
+    def put(self, event: Any):
+        """放入事件（任意线程）"""
+        with self._lock:
+            self._buffer.append(event)
+        self.wakeup()
+
+    def wakeup(self):
+        """唤醒消费者（任意线程；已有未处理的唤醒时不重复调度）"""
+        with self._lock:
+            loop = self._loop
+            if loop is None or self._wakeup_pending:
+                return
+            self._wakeup_pending = True
+        try:
+            loop.call_soon_threadsafe(self._wake)
+        except RuntimeError:
+            # 事件循环已关闭
+            with self._lock:
+                self._wakeup_pending = False
+
+    def _wake(self):
+        with self._lock:
+            self._wakeup_pending = False
+        if self._event is not None:
+            self._event.set()
+
+    async def get_batch(self) -> List[Any]:
+        """
+        取出当前积压的全部事件（缓冲区为空时挂起等待）
+
+        被 wakeup() 唤醒但没有新事件时返回空列表，调用方可借此检查停止条件。
+        """
+        while True:
+            with self._lock:
+                if self._buffer:
+                    events = list(self._buffer)
+                    self._buffer.clear()
+                    return events
+            self._event.clear()
+            await self._event.wait()
+            with self._lock:
+                if not self._buffer:
+                    return []
+
+    def clear(self):
+        """丢弃所有未处理事件"""
+        with self._lock:
+            self._buffer.clear()
+
+    def empty(self) -> bool:
+        with self._lock:
+            return not self._buffer
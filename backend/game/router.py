@@ -13,6 +13,8 @@ from backend.database import crud
 from backend.services.game_session_service import GameSessionService
 from backend.auth import crud as auth_crud
 from backend.user_game_manager import user_game_manager
+from backend.json_codec import FastJSONResponse
+from poker_assistant.engine.bot_latency import get_bot_latency_stats
 
 router = APIRouter(prefix="/api/game", tags=["game"])
 
@@ -150,7 +152,8 @@ async def get_sessions(
             "config": session.config
         })
     
-    return {"sessions": result}
+    # 内容已是 JSON 原生类型，直接编码，跳过 jsonable_encoder 对 JSON 列的逐层遍历
+    return FastJSONResponse({"sessions": result})
 
 
 @router.get("/sessions/{session_id}")
@@ -166,7 +169,8 @@ async def get_session(
     
     rounds = crud.get_session_rounds(db, session_id, current_user.id)
     
-    return {
+    # 内容已是 JSON 原生类型，直接编码，跳过 jsonable_encoder 对 street_history 等 JSON 列的逐层遍历
+    return FastJSONResponse({
         "id": session.id,
         "started_at": session.started_at.isoformat() if session.started_at else None,
         "ended_at": session.ended_at.isoformat() if session.ended_at else None,
@@ -192,7 +196,7 @@ async def get_session(
             }
             for round_record in rounds
         ]
-    }
+    })
 
 
 @router.get("/sessions/{session_id}/rounds/{round_id}")
@@ -211,7 +215,7 @@ async def get_round(
     if round_record.session_id != session_id:
         raise HTTPException(status_code=400, detail="Round does not belong to this session")
     
-    return {
+    return FastJSONResponse({
         "id": round_record.id,
         "round_number": round_record.round_number,
         "hero_hole_cards": round_record.hero_hole_cards,
@@ -224,7 +228,7 @@ async def get_round(
         "pot_size": float(round_record.pot_size or 0),
         "review_analysis": round_record.review_analysis,
         "created_at": round_record.created_at.isoformat() if round_record.created_at else None
-    }
+    })
 
 
 @router.get("/statistics")
@@ -248,6 +252,16 @@ async def get_statistics(
     }
 
 
+@router.get("/bot-latency")
+async def get_bot_latency(
+    current_user: User = Depends(get_current_user)
+):
+    """获取机器人 LLM 决策耗时直方图（按性格汇总，仅管理员）"""
+    if not current_user.is_admin:
+        raise HTTPException(status_code=403, detail="Admin only")
+    return get_bot_latency_stats().snapshot()
+
+
 @router.post("/sessions/{session_id}/rounds/{round_id}/review")
 async def save_round_review(
     session_id: str,
@@ -10,11 +10,13 @@ from typing import Dict, Any, Optional, List
 from poker_assistant.engine.game_controller import GameController
 from poker_assistant.engine.async_human_player import AsyncHumanPlayer
 from poker_assistant.ai_analysis.review_analyzer import ReviewAnalyzer
-# 应用 PyPokerEngine 手牌评估修复补丁
+# 应用 PyPokerEngine 手牌评估修复补丁与回合状态热点补丁
 from poker_assistant.engine import patched_game_evaluator  # noqa: F401
+from poker_assistant.engine import patched_round_manager  # noqa: F401
 from poker_assistant.utils.config import Config
 from pypokerengine.api.game import setup_config, start_poker
 from backend.connection_manager import manager
+from backend.event_bridge import EventBridge
 
 class GameManager:
     """
@@ -30,9 +32,10 @@ class GameManager:
         self.is_running = False
         self.async_player = None  # Reference to AsyncHumanPlayer for signaling
         
-        # 通信队列
-        self.request_queue = Queue()  # Game -> Web
+        # 通信通道
+        self.request_queue = EventBridge()  # Game -> Web（事件驱动，无轮询）
         self.response_queue = Queue() # Web -> Game
+        self._listener_task: Optional[asyncio.Task] = None
         
         # 游戏控制器实例
         self.config = Config()
@@ -81,8 +84,11 @@ class GameManager:
         self.game_thread.start()
         print(f"[GameManager] Game thread started. Thread ID: {self.game_thread.ident}")
         
-        # 启动队列监听任务
-        asyncio.create_task(self._listen_to_game_events())
+        # 启动事件监听任务（旧任务可能仍在等待事件，先取消，避免两个监听者争抢事件）
+        if self._listener_task is not None and not self._listener_task.done():
+            self._listener_task.cancel()
+        self.request_queue.bind(asyncio.get_running_loop())
+        self._listener_task = asyncio.create_task(self._listen_to_game_events())
 
     def stop_game(self, clear_async_player=True):
         """停止游戏
@@ -100,12 +106,9 @@ class GameManager:
         if clear_async_player:
             self.async_player = None
         
-        # 清空队列，避免旧消息干扰
-        while not self.request_queue.empty():
-            try:
-                self.request_queue.get_nowait()
-            except Empty:
-                break
+        # 清空队列，避免旧消息干扰；唤醒监听任务使其退出
+        self.request_queue.clear()
+        self.request_queue.wakeup()
         while not self.response_queue.empty():
             try:
                 self.response_queue.get_nowait()
@@ -213,7 +216,7 @@ class GameManager:
         self.request_queue.put(debug_message)
         print(f"[GameManager] Debug log queued for {bot_name}")
     
-    async def handle_review_request(self, review_data: Dict[str, Any]) -> Dict[str, Any]:
+    async def handle_review_request(self, review_data: Dict[str, Any], on_delta=None) -> Dict[str, Any]:
         """
         处理复盘请求
         
@@ -226,6 +229,7 @@ class GameManager:
                 - hand_info: 手牌信息
                 - final_pot: 最终底池
                 - seats: 座位信息
+            on_delta: 异步流式回调，复盘文本每生成一段 await 一次（用于推送 review_delta）
         
         Returns:
             复盘结果消息（结构化 JSON）
@@ -289,20 +293,16 @@ class GameManager:
                     "stack": winner.get("stack", 0)
                 })
             
-            # 调用 ReviewAnalyzer（在线程池中执行以避免阻塞）
-            import asyncio
-            loop = asyncio.get_event_loop()
-            review_result = await loop.run_in_executor(
-                None,
-                lambda: analyzer.generate_review(
-                    round_count=1,
-                    hole_cards=hero_hole_cards,
-                    community_cards=community_cards,
-                    action_history=action_history,
-                    winners=winners_with_names,
-                    hand_info=hand_info or [],
-                    final_pot=final_pot
-                )
+            # 调用 ReviewAnalyzer（异步请求，在事件循环上等待，不占用线程）
+            review_result = await analyzer.agenerate_review(
+                round_count=1,
+                hole_cards=hero_hole_cards,
+                community_cards=community_cards,
+                action_history=action_history,
+                winners=winners_with_names,
+                hand_info=hand_info or [],
+                final_pot=final_pot,
+                on_delta=on_delta
             )
             
             print(f"[GameManager] Review generated successfully")
@@ -343,39 +343,48 @@ class GameManager:
             }
 
     async def _listen_to_game_events(self):
-        """监听游戏事件并广播到 WebSocket"""
+        """监听游戏事件并广播到 WebSocket（事件到达即唤醒，空闲时不占用 CPU）"""
         while self.is_running:
             try:
-                # 非阻塞获取，避免卡死 asyncio 循环
-                # 使用 run_in_executor 来执行阻塞的 queue.get
-                # 或者简单的轮询 + sleep
-                try:
-                    event = self.request_queue.get_nowait()
-                    event_type = event.get('type', '')
-                    
-                    # 保存待处理的状态，用于连接恢复
-                    if event_type == 'round_start':
-                        self.pending_round_start = event
-                        print("[GameManager] Saved pending round_start for reconnection")
-                    elif event_type == 'action_request':
-                        self.pending_action_request = event
-                        print("[GameManager] Saved pending action_request for reconnection")
-                    elif event_type == 'round_result':
-                        self.pending_round_result = event
-                        print("[GameManager] Saved pending round_result for reconnection")
-                    
-                    # 只向特定用户发送事件（如果 user_id 存在）
-                    if self.user_id:
-                        await manager.send_to_user(event, self.user_id)
-                    else:
-                        # 向后兼容：如果没有 user_id，广播给所有连接
-                        await manager.broadcast(event)
-                except Empty:
-                    await asyncio.sleep(0.1)
-                    
+                # 一次取出所有积压事件（多个机器人连续行动时的一串 game_update）
+                events = await self.request_queue.get_batch()
+                for event in events:
+                    await self._dispatch_event(event)
+            except asyncio.CancelledError:
+                raise
             except Exception as e:
                 print(f"Error in event listener: {e}")
                 await asyncio.sleep(1)
+
+    async def _dispatch_event(self, event: Dict[str, Any]):
+        """保存可恢复状态并发送单个事件"""
+        event_type = event.get('type', '')
+        
+        # 保存待处理的状态，用于连接恢复
+        if event_type == 'round_start':
+            self.pending_round_start = event
+            print("[GameManager] Saved pending round_start for reconnection")
+        elif event_type == 'action_request':
+            self.pending_action_request = event
+            print("[GameManager] Saved pending action_request for reconnection")
+        elif event_type == 'ai_advice':
+            # 后台生成的 AI 建议：并入仍在等待的 action_request，重连后直接带上建议
+            pending = self.pending_action_request
+            if pending and pending['data'].get('decision_id') == event['data'].get('decision_id'):
+                self.pending_action_request = {
+                    **pending,
+                    'data': {**pending['data'], 'ai_advice': event['data'].get('advice'), 'ai_advice_pending': False}
+                }
+        elif event_type == 'round_result':
+            self.pending_round_result = event
+            print("[GameManager] Saved pending round_result for reconnection")
+        
+        # 只向特定用户发送事件（如果 user_id 存在）
+        if self.user_id:
+            await manager.send_to_user(event, self.user_id)
+        else:
+            # 向后兼容：如果没有 user_id，广播给所有连接
+            await manager.broadcast(event)
     
     async def send_pending_state(self, websocket):
         """向新连接的客户端发送待处理的状态（用于连接恢复）"""
@@ -530,6 +539,8 @@ class GameManager:
             traceback.print_exc()
         finally:
             self.is_running = False
+            # 唤醒监听任务，使其在发送完剩余事件后退出
+            self.request_queue.wakeup()
             print(f"[GameThread-{thread_id}] Game finished. is_running={self.is_running}")
 
 # 全局单例
@@ -0,0 +1,41 @@
+"""
+JSON 编码
+WebSocket 推送（send_json）和 FastAPI 响应默认使用标准库 json.dumps。
+安装了 orjson 时改用 orjson 编码（action_request / game_update / round_result 等大消息快数倍），
+未安装或遇到 orjson 不支持的值时回退到标准库，输出的 JSON 语义一致。
+"""
+import json
+from typing import Any
+
+from fastapi.responses import JSONResponse
+
+try:
+    import orjson
+except ImportError:  # 可选依赖
+    orjson = None
+
+# 非字符串键（如按座位号索引的字典）转为字符串；numpy 数组/标量直接编码
+_ORJSON_OPTIONS = (orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY) if orjson else 0
+
+
+def dumps_bytes(obj: Any) -> bytes:
+    """编码为 UTF-8 JSON 字节"""
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj, option=_ORJSON_OPTIONS)
+        except TypeError:
+            # orjson 不支持的值（如超过 64 位的整数），交给标准库处理
+            pass
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def dumps(obj: Any) -> str:
+    """编码为 JSON 文本（WebSocket 文本帧）"""
+    return dumps_bytes(obj).decode("utf-8")
+
+
+class FastJSONResponse(JSONResponse):
+    """使用 dumps_bytes 编码的 JSON 响应"""
+
+    def render(self, content: Any) -> bytes:
+        return dumps_bytes(content)
@@ -8,10 +8,17 @@ from fastapi.middleware.cors import CORSMiddleware
 from dotenv import load_dotenv
 
 from backend.connection_manager import manager
+from backend.json_codec import FastJSONResponse
 from backend.user_game_manager import user_game_manager
 from backend.auth.router import router as auth_router
 from backend.game.router import router as game_router
 from backend.database.session import init_db
+from poker_assistant.utils.preflop_table import get_preflop_table
+from poker_assistant.utils.poker_math import get_poker_math
+from poker_assistant.utils.equity_service import get_equity_service
+from poker_assistant.utils.board_texture import get_texture_tables
+from poker_assistant.utils.hand_evaluator import get_hand_tables
+from poker_assistant.llm_service.http_pool import aclose_http_clients
 
 # 加载环境变量
 load_dotenv()
@@ -19,12 +26,24 @@ load_dotenv()
 app = FastAPI(
     title="Poker AI Arena API",
     description="Real-time Texas Hold'em AI Arena Backend",
-    version="2.0.0"
+    version="2.0.0",
+    default_response_class=FastJSONResponse
 )
 
 # 初始化数据库
 init_db()
 
+# 预加载翻牌前胜率表与手牌评估表（mmap，只读共享）
+get_preflop_table()
+get_hand_tables()
+
+# 预先构建共享的 treys Evaluator / PokerMath 与牌面纹理查找表，避免每局开局时重复构建
+get_poker_math()
+get_texture_tables()
+
+# 启动胜率计算进程池（EQUITY_POOL_SIZE > 0 时）
+get_equity_service().start()
+
 # 注册路由
 app.include_router(auth_router)
 app.include_router(game_router)
@@ -47,6 +66,11 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+@app.on_event("shutdown")
+async def close_llm_connections():
+    """关闭共享的异步 LLM 连接池"""
+    await aclose_http_clients()
+
 @app.get("/")
 async def root():
     return {"message": "Welcome to Poker AI Arena API"}
@@ -79,7 +103,9 @@ async def websocket_endpoint(websocket: WebSocket):
     print(f"[WS] User authenticated: {user.username} (ID: {user_id})")
     
     # 连接时传入 user_id，用于连接隔离
-    await manager.connect(websocket, user_id=user_id)
+    # ?protocol=delta: round_state 以增量发送
+    delta = websocket.query_params.get("protocol") == "delta"
+    await manager.connect(websocket, user_id=user_id, delta=delta)
     print("[WS] Connection accepted.")
     
     # 获取用户的游戏管理器
@@ -189,8 +215,16 @@ async def websocket_endpoint(websocket: WebSocket):
             elif msg_type == "review_request":
                 # 处理复盘请求
                 review_data = data.get("data", {})
-                result = await game_manager.handle_review_request(review_data)
+                
+                # 复盘文本边生成边推送，完整结构化结果仍以 review_result 发送
+                async def send_review_delta(text, websocket=websocket):
+                    await manager.send_personal_message({"type": "review_delta", "data": {"delta": text}}, websocket)
+                
+                result = await game_manager.handle_review_request(review_data, on_delta=send_review_delta)
                 await manager.send_personal_message(result, websocket)
+            elif msg_type == "resync":
+                # delta 协议客户端发现 seq 不连续，重新发送完整 round_state
+                await manager.resync(websocket)
             elif msg_type == "ping":
                 await manager.send_personal_message({"type": "pong"}, websocket)
             elif msg_type == "new_game":
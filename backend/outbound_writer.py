@@ -0,0 +1,132 @@
+"""
+WebSocket 连接的出站写入器
+原先每个事件都直接 await websocket.send_json（标准库 json），机器人连续行动时一条街道会在几毫秒内产生多个
+game_update，每个都单独成帧发送。每个连接改为一个后台写入任务:
+
+- 发送方把消息放入有界缓冲区后立即返回；缓冲区满时等待（背压），慢客户端只拖慢自己的牌局
+- 写入任务在合并窗口内收集连续到达的消息，合并成一个 batch 帧: {"type": "batch", "messages": [...]}
+  （只有一条消息时原样发送），消息顺序不变
+- 被后续消息的 round_state 覆盖的 game_update 去掉 round_state 快照，只保留行动本身
+- 相邻的流式文本片段（ai_advice_delta / review_delta）合并为一条
+- 帧由 json_codec.dumps 编码（可用时使用 orjson）
+"""
+import asyncio
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional
+
+from fastapi import WebSocket
+
+from backend.json_codec import dumps
+
+# 携带完整 round_state、且前端只用其覆盖当前牌桌显示的消息类型
+SNAPSHOT_TYPES = ("game_update", "street_start", "action_request")
+# 被后续快照覆盖时可以去掉 round_state 的消息类型
+COMPRESSIBLE_TYPES = ("game_update",)
+# 流式文本片段（相邻的同类消息可以合并）
+TEXT_DELTA_TYPES = ("ai_advice_delta", "review_delta")
+
+
+def _has_snapshot(message: Dict[str, Any]) -> bool:
+    data = message.get("data")
+    return isinstance(data, dict) and data.get("round_state") is not None
+
+
+def compress_snapshots(messages: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    去掉被后续快照覆盖的 game_update 中的 round_state（不修改原消息对象）
+
+    game_update 的行动（action）仍按顺序保留，前端据此记录行动日志；
+    牌桌显示（筹码、底池、公共牌）由最后一个快照决定。
+    """
+    superseded = False
+    result = []
+    for message in reversed(messages):
+        msg_type = message.get("type")
+        # 带 seq 的消息属于 delta 协议，其 round_state 是后续增量的基准，不能去掉
+        if superseded and msg_type in COMPRESSIBLE_TYPES and _has_snapshot(message) and "seq" not in message:
+            data = {k: v for k, v in message["data"].items() if k != "round_state"}
+            message = {**message, "data": data}
+        elif msg_type in SNAPSHOT_TYPES and _has_snapshot(message):
+            superseded = True
+        result.append(message)
+    result.reverse()
+    return result
+
+
+def merge_text_deltas(messages: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """把相邻的同类型流式文本消息（ai_advice_delta / review_delta）合并为一条（ai_advice_delta 需属于同一决策）"""
+    result: List[Dict[str, Any]] = []
+    for message in messages:
+        previous = result[-1] if result else None
+        if (message.get("type") in TEXT_DELTA_TYPES and previous is not None
+                and previous.get("type") == message["type"]
+                and previous["data"].get("decision_id") == message["data"].get("decision_id")):
+            result[-1] = {**previous, "data": {**previous["data"], "delta": previous["data"]["delta"] + message["data"]["delta"]}}
+        else:
+            result.append(message)
+    return result
+
+
+class OutboundWriter:
+    """单个 WebSocket 连接的出站写入任务"""
+
+    def __init__(self, websocket: WebSocket, max_buffer: int = 256, batch_window: float = 0.005):
+        self.websocket = websocket
+        self.max_buffer = max_buffer
+        self.batch_window = batch_window
+        self._buffer: Deque[Dict[str, Any]] = deque()
+        self._has_data = asyncio.Event()
+        self._has_space = asyncio.Event()
+        self._has_space.set()
+        self._closed = False
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self):
+        """启动写入任务（在事件循环中调用）"""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def send(self, message: Dict[str, Any]):
+        """放入待发送消息；缓冲区满时等待写入任务取走（背压）"""
+        while not self._closed and len(self._buffer) >= self.max_buffer:
+            self._has_space.clear()
+            await self._has_space.wait()
+        if self._closed:
+            return
+        self._buffer.append(message)
+        self._has_data.set()
+
+    def close(self):
+        """停止写入任务并丢弃未发送的消息"""
+        self._closed = True
+        self._buffer.clear()
+        self._has_space.set()
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    async def _run(self):
+        try:
+            while not self._closed:
+                await self._has_data.wait()
+                if self.batch_window > 0:
+                    # 合并窗口: 等待同一批连续事件（如多个机器人行动）全部到达
+                    await asyncio.sleep(self.batch_window)
+                messages = list(self._buffer)
+                self._buffer.clear()
+                self._has_data.clear()
+                self._has_space.set()
+                if not messages:
+                    continue
+                messages = merge_text_deltas(messages)
+                if len(messages) == 1:
+                    await self.websocket.send_text(dumps(messages[0]))
+                else:
+                    await self.websocket.send_text(dumps({"type": "batch", "messages": compress_snapshots(messages)}))
+        except asyncio.CancelledError:
+            pass
+        except Exception as e:
+            print(f"[OutboundWriter] Send error: {e}")
+            self._closed = True
+            self._buffer.clear()
+            self._has_space.set()
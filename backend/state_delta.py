@@ -0,0 +1,106 @@
+"""
+round_state 增量编码（WebSocket delta 协议）
+game_update / street_start / action_request 每条都携带完整 round_state（座位、底池、全部行动历史），
+与上一条消息几乎相同。客户端以 ?protocol=delta 连接时，每个连接使用一个 RoundStateDeltaEncoder:
+
+- 每手牌的第一条状态消息（以及 round_result）发送完整 round_state 作为基准
+- 之后只发送 round_state_delta: 变化的标量字段、变化的座位字段、新增公共牌、各街道新增行动
+- 每条携带状态的消息带有递增的 seq；客户端发现 seq 不连续时发送 {"type": "resync"}，
+  服务端回复 state_snapshot（当前完整 round_state）
+"""
+from typing import Any, Dict, List, Optional
+
+# 可以用增量代替完整 round_state 的消息类型
+DELTA_TYPES = ("game_update", "street_start", "action_request")
+# 单独比较的 round_state 字段（其余字段变化时整体替换）
+_LIST_KEYS = ("seats", "community_card", "action_histories")
+
+
+def diff_round_state(prev: Dict[str, Any], cur: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """
+    计算 prev -> cur 的增量
+
+    Returns:
+        {"set": {字段: 新值}, "seats": [[座位, {字段: 新值}], ...],
+         "community_card": [新增公共牌], "actions": {街道: [新增行动]}}（只包含有变化的部分）；
+        两者不属于同一手牌或不是只追加的变化时返回 None（应发送完整快照）
+    """
+    if prev.get("round_count") != cur.get("round_count"):
+        return None
+    if any(key not in cur for key in prev):
+        return None
+    delta: Dict[str, Any] = {}
+
+    changed = {key: value for key, value in cur.items() if key not in _LIST_KEYS and prev.get(key) != value}
+    if changed:
+        delta["set"] = changed
+
+    prev_seats, cur_seats = prev.get("seats", []), cur.get("seats", [])
+    if len(prev_seats) != len(cur_seats):
+        return None
+    seats: List[List[Any]] = []
+    for idx, (old, new) in enumerate(zip(prev_seats, cur_seats)):
+        if old == new:
+            continue
+        if old.get("uuid") != new.get("uuid"):
+            return None
+        seats.append([idx, {key: value for key, value in new.items() if old.get(key) != value}])
+    if seats:
+        delta["seats"] = seats
+
+    prev_board, cur_board = prev.get("community_card", []), cur.get("community_card", [])
+    if cur_board[:len(prev_board)] != prev_board:
+        return None
+    if len(cur_board) > len(prev_board):
+        delta["community_card"] = cur_board[len(prev_board):]
+
+    # 行动历史只追加: 比较长度即可（新出现的街道即使没有行动也要发送，保留街道标题）
+    prev_histories, cur_histories = prev.get("action_histories", {}), cur.get("action_histories", {})
+    actions: Dict[str, List[Any]] = {}
+    for street, entries in cur_histories.items():
+        known = prev_histories.get(street)
+        if known is None:
+            actions[street] = entries
+        elif len(entries) < len(known):
+            return None
+        elif len(entries) > len(known):
+            actions[street] = entries[len(known):]
+    if any(street not in cur_histories for street in prev_histories):
+        return None
+    if actions:
+        delta["actions"] = actions
+    return delta
+
+
+class RoundStateDeltaEncoder:
+    """单个连接的增量编码状态（基准 round_state 与序号）"""
+
+    def __init__(self):
+        self.seq = 0
+        self._baseline: Optional[Dict[str, Any]] = None
+
+    def encode(self, message: Dict[str, Any]) -> Dict[str, Any]:
+        """把消息中的 round_state 替换为相对上一条状态消息的增量（不修改原消息对象）"""
+        data = message.get("data")
+        if not isinstance(data, dict) or data.get("round_state") is None:
+            if message.get("type") == "round_start":
+                # 新的一手牌: 下一条状态消息发送完整快照
+                self._baseline = None
+            return message
+
+        round_state = data["round_state"]
+        self.seq += 1
+        delta = None
+        if self._baseline is not None and message.get("type") in DELTA_TYPES:
+            delta = diff_round_state(self._baseline, round_state)
+        self._baseline = round_state
+        if delta is None:
+            return {**message, "seq": self.seq}
+
+        data = {key: value for key, value in data.items() if key != "round_state"}
+        data["round_state_delta"] = delta
+        return {**message, "seq": self.seq, "data": data}
+
+    def snapshot(self) -> Dict[str, Any]:
+        """当前基准的完整快照（响应客户端 resync）"""
+        return {"type": "state_snapshot", "seq": self.seq, "data": {"round_state": self._baseline}}
@@ -2,10 +2,14 @@ import React, { useEffect, useRef } from 'react';
 import { motion, AnimatePresence } from 'framer-motion';
 import { Brain, Sparkles, Target, ScrollText, TrendingUp, Zap } from 'lucide-react';
 import { useGameStore } from '../store/useGameStore';
+import { parsePartialAdvice } from '../utils/partialAdvice';
 
 const AICopilot: React.FC = () => {
-  const { actionRequest, isConnecting, aiCopilotEnabled, setAiCopilotEnabled, logs } = useGameStore();
+  const { actionRequest, isConnecting, aiCopilotEnabled, setAiCopilotEnabled, logs, aiAdviceStream } = useGameStore();
   const advice = actionRequest?.ai_advice;
+  const streamingAdvice = aiAdviceStream ? parsePartialAdvice(aiAdviceStream) : null;
+  // 建议在后台生成，尚未收到任何片段
+  const adviceLoading = !!actionRequest?.ai_advice_pending && !advice && !streamingAdvice;
   const logsEndRef = useRef<HTMLDivElement>(null);
 
   // 自动滚动到最新日志
@@ -85,7 +89,7 @@ const AICopilot: React.FC = () => {
                 <p className="text-sm mb-1">AI Copilot 已关闭</p>
                 <p className="text-[10px] text-[var(--color-text-dim)]">开启开关以启用 AI 建议</p>
               </motion.div>
-          ) : isConnecting ? (
+          ) : isConnecting || adviceLoading ? (
               <motion.div 
                 key="loading"
                 className="flex flex-col items-center py-8 gap-3"
@@ -177,6 +181,27 @@ const AICopilot: React.FC = () => {
               )}
             </div>
               </motion.div>
+          ) : streamingAdvice ? (
+              <motion.div 
+                key="streaming"
+                className="space-y-4"
+                initial={{ opacity: 0 }}
+                animate={{ opacity: 1 }}
+                exit={{ opacity: 0 }}
+              >
+                {/* 流式生成中：显示已到达的主选行动和分析 */}
+                <div className="flex items-center gap-3">
+                  <div className="p-2 rounded-xl bg-[var(--color-bg-base)] text-[var(--color-gold-400)]">
+                    <Zap className="w-5 h-5" aria-hidden="true" />
+                  </div>
+                  <span className="text-xl font-bold text-[var(--color-text-primary)] capitalize font-display">
+                    {streamingAdvice.action || '思考中…'}
+                  </span>
+                </div>
+                <p className="text-xs text-[var(--color-text-secondary)] leading-relaxed whitespace-pre-wrap border-l-2 border-[var(--color-gold-600)]/40 pl-3">
+                  {streamingAdvice.reasoning || <span className="text-[var(--color-gold-400)] animate-pulse">AI 正在分析中…</span>}
+                </p>
+              </motion.div>
           ) : (
               <motion.div 
                 key="waiting"
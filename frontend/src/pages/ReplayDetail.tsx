@@ -5,6 +5,7 @@ import Card from '../components/Card';
 import { useGameStore } from '../store/useGameStore';
 import type { StreetReviewData, ReviewAnalysis } from '../types';
 import { getSessionDetail, saveRoundReview } from '../services/sessionService';
+import { unpackFrame } from '../utils/wsFrame';
 
 interface ReplayDetailProps {
   sessionId: string;
@@ -32,7 +33,7 @@ const ReplayDetail: React.FC<ReplayDetailProps> = ({ sessionId, onBack }) => {
   const [localReviewAnalysis, setLocalReviewAnalysis] = useState<ReviewAnalysis | null>(null);
   const [isLoading, setIsLoading] = useState(true);
   const [error, setError] = useState<string | null>(null);
-  const { socket, isReviewLoading, connect, isConnected, isConnecting } = useGameStore();
+  const { socket, isReviewLoading, reviewStream, connect, isConnected, isConnecting } = useGameStore();
   
   // Don't auto-connect WebSocket - only connect when user clicks the review button
   // This prevents automatic reconnection when user is viewing replay details
@@ -43,8 +44,8 @@ const ReplayDetail: React.FC<ReplayDetailProps> = ({ sessionId, onBack }) => {
     
     const handleMessage = (event: MessageEvent) => {
       try {
-        const msg = JSON.parse(event.data);
-        if (msg.type === 'review_result' && msg.data) {
+        const msg = unpackFrame(event.data).find((m) => m.type === 'review_result');
+        if (msg?.type === 'review_result' && msg.data) {
           const reviewData = msg.data;
           setLocalReviewAnalysis(reviewData);
           
@@ -760,6 +761,12 @@ const ReplayDetail: React.FC<ReplayDetailProps> = ({ sessionId, onBack }) => {
                         <div className="w-full bg-[var(--color-bg-base)] rounded-full h-2 overflow-hidden">
                           <div className="h-full bg-gradient-to-r from-[var(--color-gold-600)] to-[var(--color-gold-400)] rounded-full animate-pulse" style={{ width: '60%' }}></div>
                         </div>
+                        {/* 流式生成中的复盘内容（review_delta） */}
+                        {reviewStream && (
+                          <pre className="mt-6 text-left text-xs text-[var(--color-text-secondary)] whitespace-pre-wrap break-words max-h-64 overflow-y-auto bg-[var(--color-bg-elevated)] p-4 rounded-xl border border-[var(--color-border)]">
+                            {reviewStream.slice(-2000)}
+                          </pre>
+                        )}
                       </div>
                     </motion.div>
                   ) : (
@@ -820,7 +827,7 @@ const ReplayDetail: React.FC<ReplayDetailProps> = ({ sessionId, onBack }) => {
                             data: reviewData
                           }));
                           
-                          useGameStore.setState({ isReviewLoading: true });
+                          useGameStore.setState({ isReviewLoading: true, reviewStream: '' });
                           setLocalReviewAnalysis(null);
                         }}
                         disabled={isReviewLoading || !selectedRound || (isConnecting && !isConnected)}
@@ -3,6 +3,7 @@ import type { GameState, WebSocketMessage, ActionRequest, Card, RoundResult, Pla
 import { createSession, createRound } from '../services/sessionService';
 import { convertRoundDataToAPI } from '../services/gameDataAdapter';
 import { useAuthStore } from './useAuthStore';
+import { unpackFrame, RoundStateDecoder } from '../utils/wsFrame';
 
 // Helper function to save round result to session history
 function saveRoundToSession(roundResult: RoundResult, streetHistory: StreetData[], reviewAnalysis: ReviewAnalysis | null, currentRoundInitialStacks?: Record<string, number>, heroHoleCardsFromState?: Card[]) {
@@ -326,6 +327,7 @@ interface GameStore {
   
   // AI Copilot
   aiCopilotEnabled: boolean; // Whether AI Copilot is enabled (default: false)
+  aiAdviceStream: string; // Streamed advice text while the full advice is being generated
   
   // Round Result
   roundResult: RoundResult | null;
@@ -341,6 +343,7 @@ interface GameStore {
   // Review Analysis
   reviewAnalysis: ReviewAnalysis | null;
   isReviewLoading: boolean;
+  reviewStream: string; // Streamed review text while the structured review is being generated
   
   // Current Round Initial Stacks (for profit calculation)
   currentRoundInitialStacks: Record<string, number>;
@@ -383,6 +386,7 @@ export const useGameStore = create<GameStore>((set, get) => ({
   heroHoleCards: [],
   actionRequest: null,
   aiCopilotEnabled: false, // 默认关闭，避免影响游戏节奏
+  aiAdviceStream: '',
   roundResult: null,
   waitingForNextRound: false,
   pendingRoundStart: null,
@@ -392,6 +396,7 @@ export const useGameStore = create<GameStore>((set, get) => ({
   currentRoundNumber: 0,
   reviewAnalysis: null,
   isReviewLoading: false,
+  reviewStream: '',
   currentRoundInitialStacks: {},
   logs: [],
   needsApiKey: false,
@@ -433,12 +438,12 @@ export const useGameStore = create<GameStore>((set, get) => ({
     
     if (wsBaseUrl) {
       // 使用环境变量配置的 WebSocket URL（生产环境）
-      wsUrl = `${wsBaseUrl}/ws/game?token=${encodeURIComponent(token)}`;
+      wsUrl = `${wsBaseUrl}/ws/game?token=${encodeURIComponent(token)}&protocol=delta`;
     } else {
       // 开发环境：使用 vite proxy（/ws -> ws://localhost:8000/ws/game）
       // 生产环境：假设前后端同域，使用当前域名
       const protocol = window.location.protocol === 'https:' ? 'wss:' : 'ws:';
-      wsUrl = `${protocol}//${window.location.host}/ws/game?token=${encodeURIComponent(token)}`;
+      wsUrl = `${protocol}//${window.location.host}/ws/game?token=${encodeURIComponent(token)}&protocol=delta`;
     } 
     
     const socket = new WebSocket(wsUrl);
@@ -453,9 +458,15 @@ export const useGameStore = create<GameStore>((set, get) => ({
       set({ isConnected: false, isConnecting: false, socket: null, logs: [...get().logs, '已断开连接'] });
     };
 
+    // delta 协议: round_state 以增量发送，每个连接独立还原
+    const decoder = new RoundStateDecoder();
+    const requestResync = () => socket.send(JSON.stringify({ type: 'resync' }));
+
     socket.onmessage = (event) => {
-      const msg = JSON.parse(event.data) as WebSocketMessage;
-      handleMessage(msg, set, get);
+      for (const frameMsg of unpackFrame(event.data)) {
+        const msg = decoder.decode(frameMsg, requestResync);
+        if (msg) handleMessage(msg, set, get);
+      }
     };
 
     set({ socket });
@@ -491,7 +502,7 @@ export const useGameStore = create<GameStore>((set, get) => ({
         data: { action, amount }
       };
       socket.send(JSON.stringify(payload));
-      set({ actionRequest: null }); // Clear action request immediately after sending
+      set({ actionRequest: null, aiAdviceStream: '' }); // Clear action request immediately after sending
       console.log('Sent Action:', payload);
     }
   },
@@ -524,7 +535,7 @@ export const useGameStore = create<GameStore>((set, get) => ({
       return;
     }
     
-    set({ isReviewLoading: true });
+    set({ isReviewLoading: true, reviewStream: '' });
     
     // 发送复盘请求到后端
     const reviewData = {
@@ -863,7 +874,7 @@ function handleMessage(msg: WebSocketMessage, set: any, get: any) {
         console.warn('[Store] action_request - WARNING: heroHoleCards is empty! This should not happen. Action data:', actionData);
       }
       
-      set({ actionRequest: msg.data });
+      set({ actionRequest: msg.data, aiAdviceStream: '' });
       // Also update state if provided, but preserve position labels and street_bet
       if (msg.data.round_state) {
         const currentPlayers = get().players;
@@ -1049,6 +1060,35 @@ function handleMessage(msg: WebSocketMessage, set: any, get: any) {
         });
       }
       break;
+
+    case 'ai_advice':
+    case 'ai_advice_delta': {
+      // AI 建议在 action_request 之后到达；等待下一局时与 action_request 一起排队
+      if (get().waitingForNextRound) {
+        set({ pendingEvents: [...get().pendingEvents, msg] });
+        return;
+      }
+      // 只接受当前决策的建议（玩家已行动或已进入下一次决策时丢弃）
+      const currentRequest = get().actionRequest;
+      if (!currentRequest || currentRequest.decision_id !== msg.data.decision_id) {
+        break;
+      }
+      if (msg.type === 'ai_advice') {
+        set({
+          actionRequest: { ...currentRequest, ai_advice: msg.data.advice, ai_advice_pending: false },
+          aiAdviceStream: ''
+        });
+      } else {
+        // 流式 AI 建议片段：完整建议到达前先逐段显示
+        set({ aiAdviceStream: get().aiAdviceStream + msg.data.delta });
+      }
+      break;
+    }
+
+    case 'review_delta':
+      // 流式复盘片段：结构化 review_result 到达前先逐段显示
+      set({ reviewStream: get().reviewStream + msg.data.delta });
+      break;
       
     case 'debug_log':
       // Handle debug log from AI bot LLM interaction
@@ -39,6 +39,8 @@ export interface ActionRequest {
   hole_card: Card[];
   round_state: any; // Detailed raw state from engine if needed
   call_amount: number; // Amount needed to call
+  decision_id?: number; // 本次决策编号，与 ai_advice / ai_advice_delta 对应
+  ai_advice_pending?: boolean; // AI 建议正在后台生成，随后以 ai_advice 消息推送
   ai_advice?: {
     primary_strategy?: {
       action: string;
@@ -152,6 +154,22 @@ export type WebSocketMessage =
   | { type: 'round_result'; data: RoundResult }
   | { type: 'review_request'; data: any }
   | { type: 'review_result'; data: ReviewAnalysis }
+  | { type: 'ai_advice'; data: { decision_id: number; advice: ActionRequest['ai_advice'] } }
+  | { type: 'ai_advice_delta'; data: { decision_id?: number; delta: string } }
+  | { type: 'review_delta'; data: { delta: string } }
   | { type: 'debug_log'; data: DebugLog }
   | { type: 'debug_mode_updated'; data: { enabled: boolean; filter_bots: string[] | null } };
 
+// round_state 增量（delta 协议），只包含有变化的部分
+export interface RoundStateDelta {
+  set?: Record<string, any>;                          // 变化的标量字段（pot、street、next_player 等）
+  seats?: [number, Record<string, any>][];            // [座位序号, 变化的字段]
+  community_card?: string[];                          // 新增公共牌
+  actions?: Record<string, any[]>;                    // 各街道新增行动
+}
+
+// 服务端发送的一帧: 单条消息，或按顺序合并的多条消息
+export type WebSocketFrame =
+  | WebSocketMessage
+  | { type: 'batch'; messages: WebSocketMessage[] };
+
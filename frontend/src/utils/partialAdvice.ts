@@ -0,0 +1,29 @@
+/**
+ * 流式 AI 建议解析
+ * 策略建议以 JSON 输出，流式过程中文本是不完整的 JSON，
+ * 这里从已到达的部分中提取主选行动和 reasoning 字段，用于提前显示
+ */
+
+export interface PartialAdvice {
+  action?: string;
+  reasoning?: string;
+}
+
+// 解码 JSON 字符串片段（末尾可能是不完整的转义序列）
+function decodeJsonFragment(fragment: string): string {
+  const safe = fragment.replace(/\\(u[0-9a-fA-F]{0,3})?$/, '');
+  try {
+    return JSON.parse(`"${safe}"`);
+  } catch {
+    return safe.replace(/\\n/g, '\n').replace(/\\"/g, '"');
+  }
+}
+
+export function parsePartialAdvice(text: string): PartialAdvice {
+  const result: PartialAdvice = {};
+  const action = text.match(/"primary_strategy"\s*:\s*\{\s*"action"\s*:\s*"([A-Za-z_]+)"/);
+  if (action) result.action = action[1];
+  const reasoning = text.match(/"reasoning"\s*:\s*"((?:[^"\\]|\\.)*)/);
+  if (reasoning) result.reasoning = decodeJsonFragment(reasoning[1]);
+  return result;
+}
@@ -0,0 +1,75 @@
+/**
+ * WebSocket 帧解析
+ * 服务端会把短时间内连续产生的多条消息合并成一个 batch 帧: { type: 'batch', messages: [...] }
+ * 以 ?protocol=delta 连接时，round_state 以增量 (round_state_delta) 发送，由 RoundStateDecoder 还原
+ */
+import type { RoundStateDelta, WebSocketFrame, WebSocketMessage } from '../types';
+
+// 把一帧数据展开为按顺序处理的消息列表
+export function unpackFrame(data: string): WebSocketMessage[] {
+  const frame = JSON.parse(data) as WebSocketFrame;
+  return frame.type === 'batch' ? frame.messages : [frame];
+}
+
+// 在上一个 round_state 上应用增量，返回新对象（不修改原对象）
+function applyDelta(prev: any, delta: RoundStateDelta): any {
+  const next = { ...prev, ...(delta.set || {}) };
+  if (delta.seats) {
+    next.seats = [...prev.seats];
+    for (const [idx, changes] of delta.seats) {
+      next.seats[idx] = { ...prev.seats[idx], ...changes };
+    }
+  }
+  if (delta.community_card) {
+    next.community_card = [...(prev.community_card || []), ...delta.community_card];
+  }
+  if (delta.actions) {
+    next.action_histories = { ...prev.action_histories };
+    for (const [street, entries] of Object.entries(delta.actions)) {
+      next.action_histories[street] = [...(prev.action_histories?.[street] || []), ...entries];
+    }
+  }
+  return next;
+}
+
+export class RoundStateDecoder {
+  private roundState: any = null;
+  private seq = 0;
+  private resyncPending = false;
+
+  /**
+   * 还原消息中的 round_state
+   * 返回 null 表示消息只用于同步状态（state_snapshot）；
+   * seq 不连续时调用 onGap（应发送 resync），该消息去掉 round_state 后照常处理
+   */
+  decode(msg: any, onGap: () => void): WebSocketMessage | null {
+    if (msg.type === 'state_snapshot') {
+      this.roundState = msg.data.round_state;
+      this.seq = msg.seq;
+      this.resyncPending = false;
+      return null;
+    }
+    if (msg.seq === undefined) return msg;
+
+    if (msg.data.round_state_delta === undefined) {
+      this.roundState = msg.data.round_state;
+      this.seq = msg.seq;
+      return msg;
+    }
+
+    const { round_state_delta: delta, ...data } = msg.data;
+    if (this.roundState === null || msg.seq !== this.seq + 1) {
+      // 等待 state_snapshot 期间不重复请求
+      if (!this.resyncPending) {
+        console.warn(`[WS] round_state seq gap (have ${this.seq}, got ${msg.seq}), requesting resync`);
+        this.resyncPending = true;
+        onGap();
+      }
+      this.roundState = null;
+      return { ...msg, data };
+    }
+    this.roundState = applyDelta(this.roundState, delta);
+    this.seq = msg.seq;
+    return { ...msg, data: { ...data, round_state: this.roundState } };
+  }
+}
@@ -2,7 +2,8 @@
 对话代理
 处理用户的自由提问
 """
-from typing import Dict, Any, List, Optional
+from contextlib import closing
+from typing import Callable, Dict, Any, List, Optional
 
 from poker_assistant.llm_service.client_factory import get_llm_client
 from poker_assistant.llm_service.base_client import BaseLLMClient
@@ -40,13 +41,15 @@ class ChatAgent:
     
     def chat(self, 
              user_question: str,
-             game_context: Optional[Dict[str, Any]] = None) -> str:
+             game_context: Optional[Dict[str, Any]] = None,
+             on_delta: Optional[Callable[[str], None]] = None) -> str:
         """
         与用户对话
         
         Args:
             user_question: 用户问题
             game_context: 游戏上下文（可选）
+            on_delta: 流式回调，LLM 每产出一段文本调用一次（可选）
         
         Returns:
             AI 回复
@@ -78,7 +81,15 @@ class ChatAgent:
             messages.append({"role": "user", "content": user_question})
             
             # 调用 LLM
-            response = self.llm_client.chat(messages, temperature=0.8, max_tokens=800)
+            if on_delta is not None:
+                parts = []
+                with closing(self.llm_client.chat_stream(messages, temperature=0.8, max_tokens=800)) as stream:
+                    for text in stream:
+                        parts.append(text)
+                        on_delta(text)
+                response = "".join(parts)
+            else:
+                response = self.llm_client.chat(messages, temperature=0.8, max_tokens=800)
             
             # 保存到历史
             self.context_manager.add_user_message(user_question)
@@ -5,6 +5,14 @@
 from typing import Dict, List, Any, Optional
 from collections import defaultdict
 
+from poker_assistant.utils import card_codec
+from poker_assistant.utils.hand_range import HandRange
+
+# 样本不足时 VPIP/PFR 的先验（典型常规桌均值）及先验的等效手数
+PRIOR_VPIP = 0.35
+PRIOR_PFR = 0.18
+PRIOR_HANDS = 5
+
 
 class OpponentModeler:
     """对手建模器 - 记录和分析对手行为"""
@@ -51,11 +59,15 @@ class OpponentModeler:
                 "aggression_factor": 0.0,  # (raise + bet) / (call + check)
                 "vpip": 0.0,  # 主动入池率
                 "pfr": 0.0,   # 翻牌前加注率
+                "hands_observed": 0,
+                "vpip_hands": 0,
+                "pfr_hands": 0,
                 "recent_actions": [],
                 "tendencies": []
             }
         
         profile = self.opponent_profiles[player_name]
+        self._update_preflop_stats(profile, player_name, action, street)
         
         # 记录到当前局
         action_record = {
@@ -94,6 +106,23 @@ class OpponentModeler:
         else:
             profile["aggression_factor"] = float(aggressive_actions)
     
+    def _update_preflop_stats(self, profile: Dict[str, Any], player_name: str, action: str, street: str):
+        """更新 VPIP/PFR（每局每人最多计一次，须在本次行动写入当前局记录前调用）"""
+        round_actions = self.current_round_actions.get(player_name, [])
+        if not round_actions:
+            profile["hands_observed"] += 1
+        
+        if street == "preflop" and action in ("call", "raise"):
+            preflop_actions = [a["action"] for a in round_actions if a["street"] == "preflop"]
+            if not any(a in ("call", "raise") for a in preflop_actions):
+                profile["vpip_hands"] += 1
+            if action == "raise" and "raise" not in preflop_actions:
+                profile["pfr_hands"] += 1
+        
+        hands = profile["hands_observed"]
+        profile["vpip"] = profile["vpip_hands"] / hands
+        profile["pfr"] = profile["pfr_hands"] / hands
+    
     def get_opponent_summary(self, player_name: str, detailed: bool = False) -> str:
         """
         获取对手特点总结
@@ -145,6 +174,7 @@ class OpponentModeler:
         
         if detailed:
             summary_parts.append(f"\n  - 侵略性因子: {profile['aggression_factor']:.2f}")
+            summary_parts.append(f"\n  - VPIP/PFR: {profile['vpip']*100:.0f}%/{profile['pfr']*100:.0f}% ({profile['hands_observed']} 手)")
             summary_parts.append(f"\n  - 加注率: {profile['raise_count']/profile['total_actions']*100:.1f}%")
             summary_parts.append(f"\n  - 弃牌率: {fold_rate*100:.1f}%")
             
@@ -238,6 +268,62 @@ class OpponentModeler:
         
         return "；".join(analysis) if analysis else "难以判断"
     
+    def get_opponent_range(self, player_name: str, community_cards: List[str] = None) -> HandRange:
+        """
+        根据对手的 VPIP/PFR 及本局行动估计其当前手牌范围
+        
+        翻牌前: 加注 -> 起手牌前 PFR%；跟注 -> 前 VPIP% 中去掉大部分会加注的牌。
+        翻牌后: 每次下注/加注按侵略性因子保留较强的部分，每次跟注保留中上部分，
+        未保留组合按较低权重保留（听牌/诈唬）。样本较少时 VPIP/PFR 向先验收缩。
+        
+        Args:
+            player_name: 玩家名称
+            community_cards: 当前公共牌（用于牌面收窄与去除死牌）
+        
+        Returns:
+            手牌范围
+        """
+        profile = self.opponent_profiles.get(player_name)
+        hands = profile["hands_observed"] if profile else 0
+        vpip_hands = profile["vpip_hands"] if profile else 0
+        pfr_hands = profile["pfr_hands"] if profile else 0
+        vpip = (vpip_hands + PRIOR_VPIP * PRIOR_HANDS) / (hands + PRIOR_HANDS)
+        pfr = (pfr_hands + PRIOR_PFR * PRIOR_HANDS) / (hands + PRIOR_HANDS)
+        aggression = profile["aggression_factor"] if profile else 1.0
+        
+        round_actions = self.get_current_round_actions(player_name)
+        preflop_actions = [a["action"] for a in round_actions if a["street"] == "preflop"]
+        if "raise" in preflop_actions:
+            hand_range = HandRange.from_top_fraction(pfr)
+        elif "call" in preflop_actions:
+            # 跟注范围: 入池范围中去掉一半的加注范围（强牌有时也会平跟）
+            top_pfr = HandRange.from_top_fraction(pfr)
+            hand_range = HandRange(HandRange.from_top_fraction(vpip).weights - 0.5 * top_pfr.weights)
+        else:
+            hand_range = HandRange.uniform()
+        
+        try:
+            board = card_codec.parse_cards(community_cards or [])
+        except KeyError:
+            board = []
+        
+        for record in round_actions:
+            if record["street"] == "preflop":
+                continue
+            try:
+                street_board = card_codec.parse_cards(record["community_cards"])
+            except KeyError:
+                continue
+            if len(street_board) < 3:
+                continue
+            if record["action"] == "raise":
+                keep = min(max(0.3 + 0.15 * aggression, 0.3), 0.8)
+                hand_range = hand_range.narrow_by_strength(street_board, keep, floor=0.15)
+            elif record["action"] == "call":
+                hand_range = hand_range.narrow_by_strength(street_board, 0.6, floor=0.3)
+        
+        return hand_range.remove_cards(board)
+    
     def clear_all(self):
         """清除所有对手档案（用于新游戏）"""
         self.opponent_profiles.clear()
@@ -4,7 +4,7 @@
 """
 import json
 import os
-from typing import Dict, Any, List, Optional
+from typing import Awaitable, Callable, Dict, Any, List, Optional
 
 from poker_assistant.llm_service.client_factory import get_llm_client
 from poker_assistant.utils.card_utils import format_cards
@@ -37,6 +37,38 @@ class ReviewAnalyzer:
         except Exception as e:
             print(f"[ReviewAnalyzer] Error loading prompt template: {e}")
     
+    def _build_messages(self,
+                        hole_cards: List[str],
+                        community_cards: List[str],
+                        action_history: List[Dict],
+                        winners: List[Dict],
+                        final_pot: int) -> List[Dict[str, str]]:
+        """构建复盘请求消息"""
+        # 格式化数据
+        hole_cards_str = format_cards(hole_cards)
+        community_cards_str = format_cards(community_cards) if community_cards else "无"
+        
+        # 格式化赢家
+        winners_str = ", ".join([w.get("name", "未知") for w in winners])
+        
+        # 判断结果
+        you_won = any("你" in w.get("name", "") for w in winners)
+        result = "胜利" if you_won else "失败"
+        
+        # 格式化行动历史
+        history_str = self._format_action_history(action_history)
+        
+        # 构建 prompt
+        prompt = self.prompt_template.format(
+            hole_cards=hole_cards_str,
+            community_cards=community_cards_str,
+            final_pot=final_pot,
+            result=result,
+            winners=winners_str,
+            action_history=history_str
+        )
+        return [{"role": "user", "content": prompt}]
+
     def generate_review(self,
                        round_count: int,
                        hole_cards: List[str],
@@ -61,32 +93,9 @@ class ReviewAnalyzer:
             结构化的复盘报告 dict
         """
         try:
-            # 格式化数据
-            hole_cards_str = format_cards(hole_cards)
-            community_cards_str = format_cards(community_cards) if community_cards else "无"
-            
-            # 格式化赢家
-            winners_str = ", ".join([w.get("name", "未知") for w in winners])
-            
-            # 判断结果
-            you_won = any("你" in w.get("name", "") for w in winners)
-            result = "胜利" if you_won else "失败"
-            
-            # 格式化行动历史
-            history_str = self._format_action_history(action_history)
-            
-            # 构建 prompt
-            prompt = self.prompt_template.format(
-                hole_cards=hole_cards_str,
-                community_cards=community_cards_str,
-                final_pot=final_pot,
-                result=result,
-                winners=winners_str,
-                action_history=history_str
-            )
+            messages = self._build_messages(hole_cards, community_cards, action_history, winners, final_pot)
             
             # 调用 LLM（详细分析需要足够的 token）
-            messages = [{"role": "user", "content": prompt}]
             response = self.llm_client.chat(
                 messages, 
                 temperature=0.4,  # 适中的温度
@@ -102,6 +111,44 @@ class ReviewAnalyzer:
             traceback.print_exc()
             return {"error": f"复盘分析暂时不可用（{str(e)}）"}
     
+    async def agenerate_review(self,
+                               round_count: int,
+                               hole_cards: List[str],
+                               community_cards: List[str],
+                               action_history: List[Dict],
+                               winners: List[Dict],
+                               hand_info: List[Dict],
+                               final_pot: int,
+                               on_delta: Optional[Callable[[str], Awaitable[None]]] = None) -> Dict[str, Any]:
+        """
+        generate_review 的异步版本（通过 llm_client.achat 在事件循环上等待）
+        
+        Args:
+            on_delta: 异步流式回调，LLM 每产出一段文本 await 一次（不传则一次性请求）
+        """
+        try:
+            messages = self._build_messages(hole_cards, community_cards, action_history, winners, final_pot)
+            if on_delta is not None:
+                parts = []
+                stream = self.llm_client.achat_stream(messages, temperature=0.4, max_tokens=1500)
+                try:
+                    async for text in stream:
+                        parts.append(text)
+                        await on_delta(text)
+                finally:
+                    # 回调失败（如连接断开）时立即关闭流，释放 HTTP 连接
+                    await stream.aclose()
+                response = "".join(parts)
+            else:
+                response = await self.llm_client.achat(messages, temperature=0.4, max_tokens=1500)
+            return self._parse_response(response)
+        
+        except Exception as e:
+            print(f"[ReviewAnalyzer] Error: {e}")
+            import traceback
+            traceback.print_exc()
+            return {"error": f"复盘分析暂时不可用（{str(e)}）"}
+    
     def _parse_response(self, response: str) -> Dict[str, Any]:
         """解析 LLM 响应，提取 JSON"""
         try:
@@ -2,7 +2,8 @@
 策略建议引擎
 为玩家提供实时的行动建议
 """
-from typing import Dict, Any, List, Optional
+from contextlib import closing
+from typing import Callable, Dict, Any, List, Optional
 import json
 import os
 
@@ -12,7 +13,12 @@ from poker_assistant.llm_service.base_client import BaseLLMClient
 from poker_assistant.llm_service.prompt_manager import PromptManager
 from poker_assistant.llm_service.context_manager import ContextManager
 from poker_assistant.utils.card_utils import format_cards, get_street_name, format_chips
-from poker_assistant.utils.poker_math import PokerMath
+from poker_assistant.utils.poker_math import get_poker_math
+
+
+class AdviceCancelled(Exception):
+    """建议已过期（玩家已经行动），由 on_delta 回调抛出以中止流式生成"""
+    pass
 
 
 class StrategyAdvisor:
@@ -33,7 +39,7 @@ class StrategyAdvisor:
         self.llm_client = llm_client or get_llm_client() # 使用工厂获取客户端
         self.prompt_manager = prompt_manager or PromptManager()
         self.context_manager = context_manager or ContextManager()
-        self.poker_math = PokerMath()
+        self.poker_math = get_poker_math()
         
         # 当前局 ID
         self.current_round_id: Optional[str] = None
@@ -65,7 +71,9 @@ class StrategyAdvisor:
                    call_amount: int,
                    valid_actions: List[Dict],
                    opponent_actions: Optional[List[Dict]] = None,
-                   active_opponents: Optional[List[str]] = None) -> Dict[str, Any]:
+                   active_opponents: Optional[List[str]] = None,
+                   on_delta: Optional[Callable[[str], None]] = None,
+                   opponent_snapshot: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """
         获取策略建议
         
@@ -79,6 +87,11 @@ class StrategyAdvisor:
             call_amount: 需要跟注的金额
             valid_actions: 可选行动
             opponent_actions: 对手行动历史（完整局内历史）
+            active_opponents: 仍在牌局中的对手名称列表（同时决定胜率计算的对手数量）
+            on_delta: 流式回调，LLM 每产出一段文本调用一次（不传则一次性请求）；
+                      回调抛出 AdviceCancelled 时中止生成并向上抛出，不写入局内历史
+            opponent_snapshot: snapshot_opponents 的结果（在后台线程调用时必须传入）；
+                               不传则在当前线程读取对手建模器
         
         Returns:
             建议结果字典
@@ -99,26 +112,35 @@ class StrategyAdvisor:
             valid_actions_str = self._format_valid_actions(valid_actions)
             
             # 添加对手建模信息
+            if opponent_snapshot is None:
+                opponent_snapshot = self.snapshot_opponents(community_cards, active_opponents)
             opponent_info = ""
-            if self.opponent_modeler and active_opponents:
-                opponent_summaries = []
-                for opp_name in active_opponents:
-                    summary = self.opponent_modeler.get_opponent_summary(opp_name, detailed=True)
-                    opponent_summaries.append(summary)
-                if opponent_summaries:
-                    opponent_info = "\n\n【对手特点】\n" + "\n".join(opponent_summaries)
+            if opponent_snapshot and opponent_snapshot["summaries"]:
+                opponent_info = "\n\n【对手特点】\n" + "\n".join(opponent_snapshot["summaries"])
             
             # 数学分析 (PokerMath)
             math_analysis = self.poker_math.analyze_hand(
                 hole_cards=hole_cards,
                 community_cards=community_cards,
                 pot_size=pot_size,
-                to_call=call_amount
+                to_call=call_amount,
+                num_opponents=len(active_opponents) if active_opponents else 1
             )
             
+            # 对抗对手估计范围的胜率（基于 VPIP/PFR 与本局行动）
+            range_equity_line = ""
+            if opponent_snapshot is not None:
+                ranges = opponent_snapshot["ranges"]
+                range_equity = self.poker_math.calculate_range_equity(hole_cards, community_cards, ranges)
+                range_desc = "；".join(
+                    f"{opp_name} {opp_range.describe()}" for opp_name, opp_range in zip(active_opponents, ranges)
+                )
+                range_equity_line = f"- 对抗对手估计范围的胜率: {range_equity * 100:.1f}% ({range_desc})\n"
+            
             math_context = (
                 f"\n\n【数学参考数据】\n"
-                f"- 胜率 (Equity): {math_analysis['equity_percent']}\n"
+                f"- 胜率 (Equity): {math_analysis['equity_interval']}\n"
+                f"{range_equity_line}"
                 f"- 赔率需求 (Pot Odds): {math_analysis['pot_odds_percent']}\n"
                 f"- 期望值 (EV): {math_analysis['ev_call']} ({'正期望 +EV' if math_analysis['is_ev_positive'] else '负期望 -EV'})\n"
                 f"- 建议: 仅供参考，请结合对手风格和牌面纹理综合判断。"
@@ -163,12 +185,22 @@ class StrategyAdvisor:
             
             # 调用 LLM (提升 max_tokens 到 3000)
             debug_mode = os.getenv('DEBUG', 'false').lower() == 'true'
-            response = self.llm_client.chat(
-                messages, 
-                temperature=0.7, 
-                max_tokens=3000,  # 提升到 3000
-                debug=debug_mode
-            )
+            if on_delta is not None:
+                # 流式: 边生成边推送，首个 token 到达即可显示
+                # on_delta 抛出 AdviceCancelled 时 closing 立即关闭流，释放 HTTP 连接
+                parts = []
+                with closing(self.llm_client.chat_stream(messages, temperature=0.7, max_tokens=3000, debug=debug_mode)) as stream:
+                    for text in stream:
+                        parts.append(text)
+                        on_delta(text)
+                response = "".join(parts)
+            else:
+                response = self.llm_client.chat(
+                    messages, 
+                    temperature=0.7, 
+                    max_tokens=3000,  # 提升到 3000
+                    debug=debug_mode
+                )
             
             # 保存到历史
             self.context_manager.add_user_message(current_prompt)
@@ -185,10 +217,66 @@ class StrategyAdvisor:
             
             return advice
         
+        except AdviceCancelled:
+            raise
         except Exception as e:
             # 错误处理：返回降级建议
             return self._fallback_advice(e, valid_actions)
     
+    def snapshot_opponents(self, community_cards: List[str],
+                           active_opponents: Optional[List[str]]) -> Optional[Dict[str, Any]]:
+        """
+        读取各活跃对手的特点摘要与估计手牌范围
+        
+        对手建模器只在游戏线程中更新且没有加锁，需在游戏线程中调用，
+        结果可以交给后台线程中的 get_advice / 预计算使用。
+        
+        Returns:
+            {"summaries": [摘要], "ranges": [HandRange]}；未设置对手建模器或没有对手时返回 None
+        """
+        if not (self.opponent_modeler and active_opponents):
+            return None
+        return {
+            "summaries": [
+                self.opponent_modeler.get_opponent_summary(opp_name, detailed=True)
+                for opp_name in active_opponents
+            ],
+            "ranges": [
+                self.opponent_modeler.get_opponent_range(opp_name, community_cards)
+                for opp_name in active_opponents
+            ],
+        }
+    
+    def prepare_analysis(self,
+                         hole_cards: List[str],
+                         community_cards: List[str],
+                         active_opponents: Optional[List[str]] = None) -> Callable[[], None]:
+        """
+        预计算 get_advice 的数学分析（胜率、对抗对手范围的胜率），结果写入 equity_cache
+        
+        对手范围在调用线程中读取（对手建模器只在游戏线程中更新）；
+        返回的函数执行耗时的胜率计算，可以放到后台线程运行。
+        之后以相同手牌、公共牌和对手调用 get_advice 时直接命中缓存。
+        
+        Args:
+            hole_cards: 手牌
+            community_cards: 公共牌
+            active_opponents: 仍在牌局中的对手名称列表
+        
+        Returns:
+            执行预计算的函数
+        """
+        num_opponents = len(active_opponents) if active_opponents else 1
+        snapshot = self.snapshot_opponents(community_cards, active_opponents)
+        ranges = snapshot["ranges"] if snapshot is not None else None
+        
+        def compute():
+            self.poker_math.calculate_equity_estimate(hole_cards, community_cards, num_opponents=num_opponents)
+            if ranges is not None:
+                self.poker_math.calculate_range_equity(hole_cards, community_cards, ranges)
+        
+        return compute
+    
     def get_simple_advice(self,
                          hole_cards: List[str],
                          community_cards: List[str],
@@ -6,15 +6,46 @@ AI 对手玩家模块
 import random
 import json
 import os
-from typing import Dict, Tuple, List, Optional
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError as FuturesTimeout
+from datetime import datetime
+from typing import Any, Dict, Tuple, List, Optional
 from pypokerengine.players import BasePokerPlayer
 
 from poker_assistant.llm_service.client_factory import get_llm_client
 from poker_assistant.llm_service.base_client import BaseLLMClient
 from poker_assistant.engine.bot_persona import BotPersona, get_random_persona, get_default_persona
+from poker_assistant.engine.bot_latency import get_bot_latency_stats
+from poker_assistant.engine.table_state import table_state_for
 from poker_assistant.utils.card_utils import format_cards
 from poker_assistant.utils.config import Config
-from poker_assistant.utils.poker_math import PokerMath
+from poker_assistant.utils.poker_math import get_poker_math
+
+# 设置决策时间预算时，LLM 调用在共享线程池中执行（超时的调用会继续占用线程直到 SDK 超时）
+LLM_WORKERS = 32
+
+_llm_executor: Optional[ThreadPoolExecutor] = None
+_llm_executor_lock = threading.Lock()
+
+
+def _get_llm_executor() -> ThreadPoolExecutor:
+    """获取进程内共享的机器人 LLM 调用线程池（首次使用时创建）"""
+    global _llm_executor
+    if _llm_executor is None:
+        with _llm_executor_lock:
+            if _llm_executor is None:
+                _llm_executor = ThreadPoolExecutor(max_workers=LLM_WORKERS, thread_name_prefix="bot-llm")
+    return _llm_executor
+
+
+class LLMBudgetExceeded(Exception):
+    """LLM 未在决策时间预算内返回"""
+
+    def __init__(self, future: Optional[Future], record: Dict[str, Any]):
+        super().__init__("LLM decision budget exceeded")
+        self.future = future    # 仍在进行中的调用（尚未开始即被取消时为 None）
+        self.record = record    # 超时回答记录的上下文
 
 
 class AIOpponentPlayer(BasePokerPlayer):
@@ -32,7 +63,10 @@ class AIOpponentPlayer(BasePokerPlayer):
         llm_client: Optional[BaseLLMClient] = None,
         big_blind: int = 10,
         use_harrington_default: bool = True,
-        debug_callback: Optional[callable] = None
+        debug_callback: Optional[callable] = None,
+        use_llm: bool = True,
+        quiet: bool = False,
+        decision_budget_ms: Optional[float] = None
     ):
         """
         Args:
@@ -43,6 +77,10 @@ class AIOpponentPlayer(BasePokerPlayer):
             big_blind: 大盲注金额（用于计算有效筹码深度）
             use_harrington_default: 是否默认使用 Harrington 性格
             debug_callback: 调试回调函数，用于输出 LLM 交互日志
+            use_llm: 是否启用 LLM 决策（False 时只使用规则策略，不创建 LLM 客户端）
+            quiet: 静默模式，不打印决策日志（用于自博弈模拟）
+            decision_budget_ms: 单次决策的 LLM 时间预算（毫秒），超时改用规则策略；
+                                None 时读取 Config.BOT_DECISION_BUDGET_MS，0 表示不限制
         """
         super().__init__()
         self.difficulty = difficulty
@@ -52,6 +90,10 @@ class AIOpponentPlayer(BasePokerPlayer):
         self.shared_hole_cards = shared_hole_cards  # 共享底牌字典
         self.big_blind = big_blind  # 大盲注（用于 Harrington 分析）
         self.debug_callback = debug_callback  # Debug 回调
+        self.quiet = quiet
+        if decision_budget_ms is None:
+            decision_budget_ms = Config().BOT_DECISION_BUDGET_MS
+        self.decision_budget_ms = decision_budget_ms
         
         # AI 核心组件
         if persona is not None:
@@ -63,14 +105,14 @@ class AIOpponentPlayer(BasePokerPlayer):
             
         self.client = None
         self.use_ai = False
-        self.poker_math = PokerMath()  # 初始化数学工具
+        self.poker_math = get_poker_math()  # 进程内共享的数学工具
         
-        # 初始化 API 客户端
+        # 初始化 API 客户端（use_llm=False 时跳过，只使用规则策略）
         # 优先使用外部注入的 llm_client（用于按 session/user 的 key 运行）
-        if llm_client is not None:
+        if use_llm and llm_client is not None:
             self.client = llm_client
             self.use_ai = True
-        else:
+        elif use_llm:
             # 兼容旧逻辑：从环境变量读取 key
             config = Config()
             # 只要配置了任意一个 Provider 的 Key，就可以启用 AI
@@ -114,11 +156,19 @@ class AIOpponentPlayer(BasePokerPlayer):
                 return self.prompt_templates.get('harrington', self.prompt_templates.get('standard', ''))
         return self.prompt_templates.get('standard', '')
 
+    def _log(self, message: str):
+        """打印决策日志（静默模式下跳过）"""
+        if not self.quiet:
+            print(message)
+
     def declare_action(self, valid_actions, hole_card, round_state):
         """
         决定下一步行动
-        优先尝试使用 AI 决策，失败则回退到规则策略
+        优先尝试使用 AI 决策，失败或超出时间预算则回退到规则策略
         """
+        # 决策截止时间（从收到行动请求开始计算，包括数学分析）
+        deadline = time.monotonic() + self.decision_budget_ms / 1000 if self.decision_budget_ms > 0 else None
+        
         # 打印 Persona 信息（帮助调试）
         street = round_state.get('street', 'preflop')
         position = self._get_position_name(round_state)
@@ -127,47 +177,59 @@ class AIOpponentPlayer(BasePokerPlayer):
         call_info = next((a for a in valid_actions if a['action'] == 'call'), None)
         can_check = call_info is not None and call_info['amount'] == 0
         
-        print(f"\n[AI Bot] ========== ACTION REQUEST ==========")
-        print(f"[AI Bot] Player: {self.uuid[-6:]} | {self.persona.style_code.upper()}")
-        print(f"[AI Bot] Position: {position} | Street: {street}")
-        print(f"[AI Bot] Hole cards: {hole_card}")
-        print(f"[AI Bot] Valid actions: {valid_actions}")
+        self._log(f"\n[AI Bot] ========== ACTION REQUEST ==========")
+        self._log(f"[AI Bot] Player: {self.uuid[-6:]} | {self.persona.style_code.upper()}")
+        self._log(f"[AI Bot] Position: {position} | Street: {street}")
+        self._log(f"[AI Bot] Hole cards: {hole_card}")
+        self._log(f"[AI Bot] Valid actions: {valid_actions}")
         if call_info:
-            print(f"[AI Bot] Call amount: ${call_info['amount']} | Can check (free): {can_check}")
+            self._log(f"[AI Bot] Call amount: ${call_info['amount']} | Can check (free): {can_check}")
         else:
-            print(f"[AI Bot] No call action available")
-        print(f"[AI Bot] ========================================")
+            self._log(f"[AI Bot] No call action available")
+        self._log(f"[AI Bot] ========================================")
         
         # 1. 尝试 AI 决策
+        late = None
         if self.use_ai:
             try:
-                action, amount = self._get_ai_action(valid_actions, hole_card, round_state)
+                action, amount = self._get_ai_action(valid_actions, hole_card, round_state, deadline)
                 if action:
                     # 最终安全检查：免费看牌时绝不弃牌
                     if action == 'fold' and can_check:
-                        print(f"[AI Bot] SAFETY: Prevented FOLD when CHECK is free!")
+                        self._log(f"[AI Bot] SAFETY: Prevented FOLD when CHECK is free!")
                         action, amount = 'call', 0
-                    print(f"[AI Bot] Decision: {action.upper()} {amount if amount else ''}")
+                    self._log(f"[AI Bot] Decision: {action.upper()} {amount if amount else ''}")
                     return action, amount
+            except LLMBudgetExceeded as e:
+                late = e
+                self._log(f"[AI Bot] LLM exceeded {self.decision_budget_ms:.0f}ms budget, using fallback strategy")
             except Exception as e:
                 # 仅在调试模式下打印错误，避免刷屏
                 if os.environ.get('DEBUG'):
-                    print(f"[{self.uuid}] AI Decision Failed: {e}")
-                print(f"[AI Bot] LLM failed, using fallback strategy")
+                    self._log(f"[{self.uuid}] AI Decision Failed: {e}")
+                self._log(f"[AI Bot] LLM failed, using fallback strategy")
         
         # 2. Fallback: 使用规则策略
         action, amount = self._rule_based_strategy(valid_actions, hole_card, round_state)
         
         # Fallback 安全检查
         if action == 'fold' and can_check:
-            print(f"[AI Bot] SAFETY: Prevented FOLD in fallback when CHECK is free!")
+            self._log(f"[AI Bot] SAFETY: Prevented FOLD in fallback when CHECK is free!")
             action, amount = 'call', 0
             
-        print(f"[AI Bot] Fallback Decision: {action.upper()} {amount if amount else ''}")
+        self._log(f"[AI Bot] Fallback Decision: {action.upper()} {amount if amount else ''}")
+        
+        if late is not None and late.future is not None:
+            # LLM 回答到达后与实际采用的规则策略一起记录
+            late.record["fallback_action"] = action
+            late.record["fallback_amount"] = amount
+            record = late.record
+            late.future.add_done_callback(lambda future: self._record_late_answer(record, future))
         return action, amount
 
-    def _get_ai_action(self, valid_actions, hole_card, round_state) -> Tuple[Optional[str], Optional[int]]:
-        """使用 LLM 获取决策"""
+    def _get_ai_action(self, valid_actions, hole_card, round_state,
+                       deadline: Optional[float] = None) -> Tuple[Optional[str], Optional[int]]:
+        """使用 LLM 获取决策（deadline 为 time.monotonic() 截止时间，超时抛出 LLMBudgetExceeded）"""
         # 准备数据
         community_cards = round_state.get('community_card', [])
         pot_size = round_state.get('pot', {}).get('main', {}).get('amount', 0)
@@ -192,6 +254,9 @@ class AIOpponentPlayer(BasePokerPlayer):
         my_stack = self._get_my_stack(round_state)
         opponent_stacks = self._get_opponent_stacks(round_state)
         
+        # 仍在牌局中的对手数量（多人底池胜率需对抗所有对手）
+        num_opponents = max(1, self._count_active_players(round_state) - 1)
+        
         # 生成 RNG 随机数 (0-100) 用于混合策略
         rng_value = random.randint(0, 100)
         
@@ -205,7 +270,8 @@ class AIOpponentPlayer(BasePokerPlayer):
                 to_call=amount_to_call,
                 my_stack=my_stack,
                 opponent_stacks=opponent_stacks,
-                big_blind=self.big_blind
+                big_blind=self.big_blind,
+                num_opponents=num_opponents
             )
             
             prompt = self._build_harrington_prompt(
@@ -223,7 +289,8 @@ class AIOpponentPlayer(BasePokerPlayer):
                 hole_cards=hole_card,
                 community_cards=community_cards,
                 pot_size=pot_size,
-                to_call=amount_to_call
+                to_call=amount_to_call,
+                num_opponents=num_opponents
             )
             
             prompt = self._build_standard_prompt(
@@ -235,11 +302,16 @@ class AIOpponentPlayer(BasePokerPlayer):
 
         # 调用 API
         messages = [{"role": "user", "content": prompt}]
-        response = self.client.chat(
-            messages=messages,
-            max_tokens=max_tokens,
-            temperature=0.8 
-        )
+        response = self._chat_within_deadline(messages, max_tokens, deadline, {
+            "bot_id": self.uuid,
+            "persona": self.persona.name,
+            "street": street,
+            "hole_cards": hole_card,
+            "community_cards": community_cards,
+            "pot_size": pot_size,
+            "to_call": amount_to_call,
+            "prompt": prompt,
+        })
         
         # 发送调试日志（如果有回调）
         if self.debug_callback:
@@ -259,18 +331,18 @@ class AIOpponentPlayer(BasePokerPlayer):
                     "prompt": prompt[:3500] + "..." if len(prompt) > 3500 else prompt,  # 截断以节省带宽
                     "response": response if response else "N/A",
                     "analysis": {
-                        "equity": analysis.get('equity_percent', 'N/A'),
+                        "equity": analysis.get('equity_interval', 'N/A'),
                         "spr": analysis.get('spr', 'N/A'),
                         "board_texture": analysis.get('board_texture_cn', 'N/A')
                     } if isinstance(analysis, dict) else {}
                 }
                 self.debug_callback(debug_log)
             except Exception as e:
-                print(f"[AI Bot] Debug callback error: {e}")
+                self._log(f"[AI Bot] Debug callback error: {e}")
         
         # 打印 LLM 响应到终端（便于调试）
         if response:
-            print(f"[AI Bot] LLM Response: {response}")
+            self._log(f"[AI Bot] LLM Response: {response}")
         
         # 解析 JSON
         if not response:
@@ -289,14 +361,68 @@ class AIOpponentPlayer(BasePokerPlayer):
         action_type = decision_data.get('action', '').lower()
         amount = decision_data.get('amount', 0)
         
-        print(f"[AI Bot] Parsed LLM output: action={action_type}, amount={amount}")
+        self._log(f"[AI Bot] Parsed LLM output: action={action_type}, amount={amount}")
         
         # 校验合法性
         validated_action, validated_amount = self._validate_action(action_type, amount, valid_actions)
-        print(f"[AI Bot] After validation: action={validated_action}, amount={validated_amount}")
+        self._log(f"[AI Bot] After validation: action={validated_action}, amount={validated_amount}")
         
         return validated_action, validated_amount
 
+    def _chat_within_deadline(self, messages, max_tokens, deadline: Optional[float],
+                              record: Dict[str, Any]) -> str:
+        """
+        在决策截止时间前获取 LLM 回答
+        
+        没有截止时间时在当前线程直接调用；否则在共享线程池中调用并最多等待到截止时间，
+        超时抛出 LLMBudgetExceeded（调用在后台继续完成，回答作为超时回答记录）。
+        """
+        if deadline is None:
+            return self._timed_chat(messages, max_tokens)
+        
+        record["budget_ms"] = self.decision_budget_ms
+        record["submitted_at"] = time.monotonic()
+        future = _get_llm_executor().submit(self._timed_chat, messages, max_tokens)
+        try:
+            return future.result(timeout=max(0.0, deadline - time.monotonic()))
+        except FuturesTimeout:
+            if future.done():
+                # 调用本身抛出的 TimeoutError，按普通失败处理
+                raise
+            get_bot_latency_stats().record_timeout(self.persona.name)
+            if future.cancel():
+                # 线程池繁忙、调用尚未开始：直接取消，不产生超时回答
+                raise LLMBudgetExceeded(None, record)
+            raise LLMBudgetExceeded(future, record)
+    
+    def _timed_chat(self, messages, max_tokens) -> str:
+        """调用 LLM，耗时计入所属性格的直方图"""
+        start = time.perf_counter()
+        error = False
+        try:
+            return self.client.chat(
+                messages=messages,
+                max_tokens=max_tokens,
+                temperature=0.8
+            )
+        except Exception:
+            error = True
+            raise
+        finally:
+            get_bot_latency_stats().observe(self.persona.name, (time.perf_counter() - start) * 1000, error=error)
+    
+    def _record_late_answer(self, record: Dict[str, Any], future: Future):
+        """记录超出时间预算后才返回的 LLM 回答（future 完成时调用）"""
+        entry = {key: value for key, value in record.items() if key != "submitted_at"}
+        entry["time"] = datetime.now().isoformat()
+        entry["elapsed_ms"] = round((time.monotonic() - record["submitted_at"]) * 1000, 1)
+        error = future.exception()
+        if error is not None:
+            entry["error"] = str(error)
+        else:
+            entry["response"] = future.result()
+        get_bot_latency_stats().record_late_answer(entry)
+    
     def _build_harrington_prompt(
         self, hole_card, community_cards, street, pot_size,
         amount_to_call, min_raise, my_stack, action_history_str,
@@ -330,7 +456,8 @@ class AIOpponentPlayer(BasePokerPlayer):
             board_texture=analysis['board_texture'],
             board_texture_cn=analysis['board_texture_cn'],
             board_description=analysis['board_description'],
-            equity_percent=analysis['equity_percent'],
+            outs_description=analysis.get('outs_description', 'N/A'),
+            equity_percent=analysis['equity_interval'],
             pot_odds_percent=analysis['pot_odds_percent'],
             ev_call=analysis['ev_call'],
             ev_status='Positive +EV' if analysis['is_ev_positive'] else 'Negative -EV',
@@ -350,7 +477,7 @@ class AIOpponentPlayer(BasePokerPlayer):
         template = self._get_prompt_template()
         
         math_context = (
-            f"Win Probability (Equity): {analysis['equity_percent']}\n"
+            f"Win Probability (Equity): {analysis['equity_interval']}\n"
             f"Pot Odds needed to Call: {analysis['pot_odds_percent']}\n"
             f"EV if Call: {analysis['ev_call']} ({'Positive' if analysis['is_ev_positive'] else 'Negative'})\n"
         )
@@ -374,12 +501,7 @@ class AIOpponentPlayer(BasePokerPlayer):
 
     def _get_opponent_stacks(self, round_state) -> List[int]:
         """获取所有对手的筹码"""
-        seats = round_state.get('seats', [])
-        opponent_stacks = []
-        for seat in seats:
-            if seat['uuid'] != self.uuid and seat['state'] != 'folded':
-                opponent_stacks.append(seat['stack'])
-        return opponent_stacks
+        return table_state_for(round_state).opponent_stacks(self.uuid)
 
     def _validate_action(self, action_type, amount, valid_actions):
         """
@@ -398,15 +520,15 @@ class AIOpponentPlayer(BasePokerPlayer):
         # 获取 raise 信息
         raise_info = next((a for a in valid_actions if a['action'] == 'raise'), None)
         
-        print(f"[AI Bot] _validate_action input: action={action_type}, amount={amount}")
-        print(f"[AI Bot] Valid types: {valid_types}")
+        self._log(f"[AI Bot] _validate_action input: action={action_type}, amount={amount}")
+        self._log(f"[AI Bot] Valid types: {valid_types}")
         if raise_info:
-            print(f"[AI Bot] Raise info: min={raise_info['amount']['min']}, max={raise_info['amount']['max']}")
+            self._log(f"[AI Bot] Raise info: min={raise_info['amount']['min']}, max={raise_info['amount']['max']}")
         
         # ===== 关键修复：防止免费看牌时弃牌 =====
         # 如果 AI 选择 FOLD，但实际上可以 CHECK（免费看牌），强制改为 CHECK
         if action_type == 'fold' and can_check:
-            print(f"[AI Bot] WARNING: Prevented fold when check is free! Forcing CHECK.")
+            self._log(f"[AI Bot] WARNING: Prevented fold when check is free! Forcing CHECK.")
             return 'call', 0
         
         # 1. 修正 Check/Call 混淆
@@ -426,20 +548,20 @@ class AIOpponentPlayer(BasePokerPlayer):
             if can_raise:
                 action_type = 'raise'
                 amount = raise_info['amount']['max']
-                print(f"[AI Bot] ALL_IN converted to RAISE {amount} (max)")
+                self._log(f"[AI Bot] ALL_IN converted to RAISE {amount} (max)")
             else:
                 # 不能加注，降级为 Call（全下式跟注）
                 call_info_local = next((a for a in valid_actions if a['action'] == 'call'), None)
                 if call_info_local:
                     action_type = 'call'
                     amount = call_info_local['amount']
-                    print(f"[AI Bot] ALL_IN converted to CALL {amount} (no raise available, max={raise_info['amount']['max'] if raise_info else 'N/A'})")
+                    self._log(f"[AI Bot] ALL_IN converted to CALL {amount} (no raise available, max={raise_info['amount']['max'] if raise_info else 'N/A'})")
                 else:
                     # 极端情况：既不能 raise 也不能 call，只能 fold
                     # 但这种情况理论上不应该发生
                     action_type = 'fold'
                     amount = 0
-                    print(f"[AI Bot] WARNING: ALL_IN but no raise or call available! Forced FOLD.")
+                    self._log(f"[AI Bot] WARNING: ALL_IN but no raise or call available! Forced FOLD.")
         
         # 3. 修正 Raise 金额
         if action_type == 'raise':
@@ -451,17 +573,17 @@ class AIOpponentPlayer(BasePokerPlayer):
                 # 检查 raise 是否真的可用 (max > 0)
                 if max_amt <= 0:
                     # raise 不可用，降级为 call
-                    print(f"[AI Bot] Raise not available (max={max_amt}), downgrading to CALL")
+                    self._log(f"[AI Bot] Raise not available (max={max_amt}), downgrading to CALL")
                     action_type = 'call'
                 elif amount == -1 or amount == 0:  # All-in (amount=-1 or amount=0 means max)
                     amount = max_amt
-                    print(f"[AI Bot] Raise amount set to max: {amount}")
+                    self._log(f"[AI Bot] Raise amount set to max: {amount}")
                 else:
                     amount = max(min_amt, min(amount, max_amt))
-                    print(f"[AI Bot] Raise amount adjusted: {amount} (min={min_amt}, max={max_amt})")
+                    self._log(f"[AI Bot] Raise amount adjusted: {amount} (min={min_amt}, max={max_amt})")
             else:
                 # 如果不能加注，降级为 Call
-                print(f"[AI Bot] No raise action available, downgrading to CALL")
+                self._log(f"[AI Bot] No raise action available, downgrading to CALL")
                 action_type = 'call'
         
         # 4. 获取最终合法的动作对象
@@ -471,11 +593,11 @@ class AIOpponentPlayer(BasePokerPlayer):
         if not chosen_action:
             # 可以 Check（call amount = 0）时，绝不 Fold
             if can_check:
-                print(f"[AI Bot] Invalid action '{action_type}', falling back to CHECK (free).")
+                self._log(f"[AI Bot] Invalid action '{action_type}', falling back to CHECK (free).")
                 return 'call', 0
             # 否则尝试 Call
             if 'call' in valid_types:
-                print(f"[AI Bot] Invalid action '{action_type}', falling back to CALL.")
+                self._log(f"[AI Bot] Invalid action '{action_type}', falling back to CALL.")
                 return 'call', call_info['amount'] if call_info else 0
             # 最后才 Fold
             return 'fold', 0
@@ -488,37 +610,25 @@ class AIOpponentPlayer(BasePokerPlayer):
 
     def _count_active_players(self, round_state):
         """计算当前活跃玩家数量（未弃牌）"""
-        seats = round_state.get('seats', [])
-        return sum(1 for seat in seats if seat['state'] != 'folded')
+        return table_state_for(round_state).active_count
 
     def _get_position_name(self, round_state):
         """获取语义化位置名称 (BTN, SB, BB, etc.)"""
         try:
-            dealer_btn = round_state.get('dealer_btn')
-            seats = round_state.get('seats', [])
-            
-            # 找到自己在 seats 中的索引
-            my_seat_idx = -1
-            for i, seat in enumerate(seats):
-                if seat['uuid'] == self.uuid:
-                    my_seat_idx = i
-                    break
-            
-            if my_seat_idx == -1:
+            state = table_state_for(round_state)
+            my_seat_idx = state.seat_of(self.uuid)
+            if my_seat_idx is None or state.dealer_btn is None:
                 return "Unknown"
             
-            num_seats = len(seats)
-            
             # 计算相对于 Dealer 的位置
             # BTN = dealer_btn
             # SB = (dealer_btn + 1) % num_seats
             # BB = (dealer_btn + 2) % num_seats
             
-            if my_seat_idx == dealer_btn:
+            steps_from_btn = state.steps_from_button(my_seat_idx)
+            if steps_from_btn == 0:
                 return "Button (BTN)"
             
-            steps_from_btn = (my_seat_idx - dealer_btn) % num_seats
-            
             # 6人桌标准位置
             if steps_from_btn == 1:
                 return "Small Blind (SB)"
@@ -538,26 +648,18 @@ class AIOpponentPlayer(BasePokerPlayer):
 
     def _get_my_stack(self, round_state):
         """获取自己的剩余筹码"""
-        seats = round_state.get('seats', [])
-        for seat in seats:
-            if seat['uuid'] == self.uuid:
-                return seat['stack']
-        return 0
+        return table_state_for(round_state).stack_of(self.uuid)
 
     def _format_action_history(self, round_state):
         """格式化本局行动历史"""
-        histories = round_state.get('action_histories', {})
+        state = table_state_for(round_state)
         lines = []
-        for street in ['preflop', 'flop', 'turn', 'river']:
-            if street in histories:
-                lines.append(f"--- {street.upper()} ---")
-                for action in histories[street]:
-                    player_uuid = action.get('uuid')
-                    # 简单区分是自己还是对手
-                    player_name = "You" if player_uuid == self.uuid else f"Player_{player_uuid[-4:]}"
-                    act = action.get('action')
-                    amt = action.get('amount', 0)
-                    lines.append(f"{player_name}: {act} {amt if amt > 0 else ''}")
+        for street in state.streets:
+            lines.append(f"--- {street.upper()} ---")
+            for record in state.street_actions(street):
+                # 简单区分是自己还是对手
+                player_name = "You" if record.uuid == self.uuid else f"Player_{record.uuid[-4:]}"
+                lines.append(f"{player_name}: {record.action} {record.amount if record.amount > 0 else ''}")
         return "\n".join(lines)
 
     def _rule_based_strategy(self, valid_actions, hole_card, round_state):
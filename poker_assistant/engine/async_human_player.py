@@ -1,18 +1,21 @@
 """
 异步人类玩家模块 (Queue Based)
-使用 queue.Queue 实现线程间通信，阻塞等待前端输入
+事件通过 request_queue.put 发往 Web 端（任何带 put 方法的通道，如 backend 的 EventBridge），
+响应通过 queue.Queue 阻塞等待前端输入
 """
 import time
 import threading
 from queue import Queue
 from pypokerengine.players import BasePokerPlayer
 
+from poker_assistant.ai_analysis.strategy_advisor import AdviceCancelled
+
 class AsyncHumanPlayer(BasePokerPlayer):
     """
     Web 端人类玩家
     """
     
-    def __init__(self, uuid: str, name: str, request_queue: Queue, response_queue: Queue, game_controller=None):
+    def __init__(self, uuid: str, name: str, request_queue, response_queue: Queue, game_controller=None):
         super().__init__()
         self.uuid = uuid
         self.name = name
@@ -21,23 +24,20 @@ class AsyncHumanPlayer(BasePokerPlayer):
         self.game_controller = game_controller # GameController Reference
         self.next_round_event = threading.Event()  # Event to wait for next round signal
         self.ai_copilot_enabled = False  # AI Copilot 开关状态（默认关闭）
+        self._decision_seq = 0  # 每次 declare_action 递增，用于关联 ai_advice 与 action_request
+        self._advice_lock = threading.Lock()
+        self._hole_card = None  # 本局手牌（用于 Copilot 预计算）
         
     def declare_action(self, valid_actions, hole_card, round_state):
         """
         声明行动 - 阻塞方法
+        
+        action_request 立即发送；开启 Copilot 时 AI 建议在后台线程生成，
+        完成后以 ai_advice 消息（带 decision_id）单独推送。玩家先行动时取消该建议任务。
         """
-        # 0. 获取 AI 建议 (Copilot) - 仅在启用时生成
-        ai_advice = None
-        if self.ai_copilot_enabled and self.game_controller:
-            try:
-                print("[AsyncHumanPlayer] AI Copilot 已启用，正在生成 AI 建议...")
-                # 修正参数顺序: valid_actions, hole_card, round_state
-                ai_advice = self.game_controller._get_ai_advice(valid_actions, hole_card, round_state)
-            except Exception as e:
-                print(f"[AsyncHumanPlayer] 生成 AI 建议失败: {e}")
-        else:
-            if not self.ai_copilot_enabled:
-                print("[AsyncHumanPlayer] AI Copilot 已关闭，跳过 AI 建议生成")
+        self._decision_seq += 1
+        decision_id = self._decision_seq
+        advice_pending = bool(self.ai_copilot_enabled and self.game_controller)
 
         # 提取 call_amount
         call_amount = 0
@@ -55,17 +55,38 @@ class AsyncHumanPlayer(BasePokerPlayer):
                 "round_state": round_state,
                 "player_uuid": self.uuid,
                 "call_amount": call_amount,  # 显式传递
-                "ai_advice": ai_advice  # 注入 AI 建议
+                "decision_id": decision_id,
+                "ai_advice": None,  # AI 建议随后以 ai_advice 消息推送
+                "ai_advice_pending": advice_pending
             }
         }
         
-        # 2. 发送请求到队列
-        print(f"[AsyncHumanPlayer] Requesting action for {self.name}...")
+        # 2. 发送请求到队列（不等待 AI 建议）
+        print(f"[AsyncHumanPlayer] Requesting action for {self.name} (decision {decision_id})...")
         self.request_queue.put(action_request)
         
+        # 2.1 后台生成 AI 建议 (Copilot) - 仅在启用时生成
+        cancel_event = None
+        if advice_pending:
+            print("[AsyncHumanPlayer] AI Copilot 已启用，后台生成 AI 建议...")
+            cancel_event = threading.Event()
+            # 对手建模器没有加锁：在游戏线程中读取对手数据，后台线程只使用快照
+            opponent_snapshot = self.game_controller.snapshot_opponents(round_state)
+            threading.Thread(
+                target=self._advice_job,
+                args=(decision_id, cancel_event, valid_actions, hole_card, dict(round_state), opponent_snapshot),
+                name=f"copilot-advice-{decision_id}",
+                daemon=True
+            ).start()
+        elif not self.ai_copilot_enabled:
+            print("[AsyncHumanPlayer] AI Copilot 已关闭，跳过 AI 建议生成")
+        
         # 3. 阻塞等待响应
         # 这是一个在独立线程中运行的方法，所以阻塞是安全的
         action_response = self.response_queue.get(block=True)
+        if cancel_event is not None:
+            # 玩家已行动：尚未完成的建议作废
+            cancel_event.set()
         
         print(f"[AsyncHumanPlayer] Received action: {action_response}")
         
@@ -151,6 +172,42 @@ class AsyncHumanPlayer(BasePokerPlayer):
         # 默认返回原值
         return action_type, amount
 
+    def _advice_job(self, decision_id, cancel_event, valid_actions, hole_card, round_state, opponent_snapshot):
+        """
+        后台生成一次决策的 AI 建议
+        
+        生成过程中逐段推送 ai_advice_delta；完成后推送 ai_advice。
+        cancel_event 被设置（玩家已行动）时在下一段文本到达时中止生成；已过期的结果不再推送。
+        """
+        def on_delta(text):
+            if cancel_event.is_set():
+                raise AdviceCancelled()
+            self.request_queue.put({
+                "type": "ai_advice_delta",
+                "data": {"decision_id": decision_id, "delta": text}
+            })
+        
+        # 同一时间只运行一个建议任务（StrategyAdvisor 的局内历史不是线程安全的）
+        with self._advice_lock:
+            if cancel_event.is_set():
+                return
+            try:
+                advice = self.game_controller._get_ai_advice(
+                    valid_actions, hole_card, round_state, on_delta=on_delta, opponent_snapshot=opponent_snapshot)
+            except AdviceCancelled:
+                print(f"[AsyncHumanPlayer] 玩家已行动，取消 AI 建议 (decision {decision_id})")
+                return
+            except Exception as e:
+                print(f"[AsyncHumanPlayer] 生成 AI 建议失败: {e}")
+                return
+        
+        if cancel_event.is_set():
+            return
+        self.request_queue.put({
+            "type": "ai_advice",
+            "data": {"decision_id": decision_id, "advice": advice}
+        })
+
     def receive_game_start_message(self, game_info):
         self.request_queue.put({
             "type": "game_start",
@@ -162,6 +219,11 @@ class AsyncHumanPlayer(BasePokerPlayer):
         if dealer_btn is None and self.game_controller:
             dealer_btn = getattr(self.game_controller, 'current_dealer_btn', None)
         
+        # 对手建模器开始新局（Web 模式下不经过 GameController 的事件循环）
+        if self.game_controller:
+            self.game_controller.opponent_modeler.start_new_round()
+        self._hole_card = hole_card
+        
         self.request_queue.put({
             "type": "round_start",
             "data": {
@@ -180,8 +242,13 @@ class AsyncHumanPlayer(BasePokerPlayer):
                 "round_state": round_state
             }
         })
+        self._precompute_advice(round_state)
 
     def receive_game_update_message(self, action, round_state):
+        # 实时记录对手行动（供 VPIP/PFR 统计与范围估计）
+        if self.game_controller:
+            self.game_controller._record_opponent_action(action, round_state)
+        
         self.request_queue.put({
             "type": "game_update",
             "data": {
@@ -189,6 +256,12 @@ class AsyncHumanPlayer(BasePokerPlayer):
                 "round_state": round_state
             }
         })
+        self._precompute_advice(round_state)
+    
+    def _precompute_advice(self, round_state):
+        """Copilot 开启时，在其他玩家行动期间预计算下一次决策的分析"""
+        if self.ai_copilot_enabled and self.game_controller and self._hole_card:
+            self.game_controller.precompute_advice(self._hole_card, round_state)
 
     def receive_round_result_message(self, winners, hand_info, round_state, initial_stacks=None, player_hole_cards=None):
         # Get initial_stacks and player_hole_cards from GameController if available
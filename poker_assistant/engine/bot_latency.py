@@ -0,0 +1,132 @@
+"""
+机器人 LLM 决策耗时统计
+AIOpponentPlayer 的每次 LLM 调用都计入所属性格 (persona) 的耗时直方图；
+超出决策时间预算的回答（机器人已改用规则策略行动）追加写入 JSONL 文件，供离线分析。
+"""
+import json
+import os
+import threading
+from typing import Any, Dict, List, Optional
+
+from poker_assistant.utils.config import Config
+
+# 直方图桶上界（毫秒），最后一个桶收集超过 30s 的调用
+BUCKETS_MS = (100, 250, 500, 1000, 1500, 2500, 5000, 10000, 30000)
+
+
+class LatencyHistogram:
+    """固定桶的耗时直方图"""
+
+    def __init__(self):
+        self.counts: List[int] = [0] * (len(BUCKETS_MS) + 1)
+        self.total = 0
+        self.sum_ms = 0.0
+        self.max_ms = 0.0
+        self.errors = 0      # LLM 调用失败次数
+        self.timeouts = 0    # 超出决策时间预算、改用规则策略的次数
+
+    def observe(self, elapsed_ms: float):
+        idx = 0
+        while idx < len(BUCKETS_MS) and elapsed_ms > BUCKETS_MS[idx]:
+            idx += 1
+        self.counts[idx] += 1
+        self.total += 1
+        self.sum_ms += elapsed_ms
+        self.max_ms = max(self.max_ms, elapsed_ms)
+
+    def percentile(self, q: float) -> Optional[float]:
+        """q 分位数所在桶的上界（毫秒）；超过最大桶时返回实际最大值，无数据时返回 None"""
+        if self.total == 0:
+            return None
+        target = q * self.total
+        seen = 0
+        for idx, count in enumerate(self.counts):
+            seen += count
+            if seen >= target and count > 0:
+                return float(BUCKETS_MS[idx]) if idx < len(BUCKETS_MS) else self.max_ms
+        return self.max_ms
+
+    def to_dict(self) -> Dict[str, Any]:
+        labels = [f"<={bound}ms" for bound in BUCKETS_MS] + [f">{BUCKETS_MS[-1]}ms"]
+        return {
+            "count": self.total,
+            "mean_ms": round(self.sum_ms / self.total, 1) if self.total else None,
+            "max_ms": round(self.max_ms, 1),
+            "p50_ms": self.percentile(0.5),
+            "p90_ms": self.percentile(0.9),
+            "p99_ms": self.percentile(0.99),
+            "errors": self.errors,
+            "timeouts": self.timeouts,
+            "buckets": dict(zip(labels, self.counts)),
+        }
+
+
+class BotLatencyStats:
+    """按性格汇总的 LLM 耗时统计（线程安全）"""
+
+    def __init__(self, late_answer_log: str = ""):
+        """
+        Args:
+            late_answer_log: 超时回答的 JSONL 文件路径，为空时不写入
+        """
+        self.late_answer_log = late_answer_log
+        self._histograms: Dict[str, LatencyHistogram] = {}
+        self._lock = threading.Lock()
+        self._log_lock = threading.Lock()
+
+    def _histogram(self, persona: str) -> LatencyHistogram:
+        histogram = self._histograms.get(persona)
+        if histogram is None:
+            histogram = self._histograms[persona] = LatencyHistogram()
+        return histogram
+
+    def observe(self, persona: str, elapsed_ms: float, error: bool = False):
+        """记录一次 LLM 调用的耗时（包括超出预算后才返回的调用）"""
+        with self._lock:
+            histogram = self._histogram(persona)
+            histogram.observe(elapsed_ms)
+            if error:
+                histogram.errors += 1
+
+    def record_timeout(self, persona: str):
+        """记录一次超出决策时间预算"""
+        with self._lock:
+            self._histogram(persona).timeouts += 1
+
+    def record_late_answer(self, entry: Dict[str, Any]):
+        """追加一条超时回答记录"""
+        if not self.late_answer_log:
+            return
+        line = json.dumps(entry, ensure_ascii=False)
+        try:
+            with self._log_lock:
+                directory = os.path.dirname(self.late_answer_log)
+                if directory:
+                    os.makedirs(directory, exist_ok=True)
+                with open(self.late_answer_log, "a", encoding="utf-8") as f:
+                    f.write(line + "\n")
+        except OSError as e:
+            print(f"[BotLatency] 写入超时回答失败: {e}")
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """各性格的直方图摘要"""
+        with self._lock:
+            return {persona: histogram.to_dict() for persona, histogram in sorted(self._histograms.items())}
+
+    def reset(self):
+        with self._lock:
+            self._histograms.clear()
+
+
+_stats: Optional[BotLatencyStats] = None
+_stats_lock = threading.Lock()
+
+
+def get_bot_latency_stats() -> BotLatencyStats:
+    """获取进程内共享的耗时统计（超时回答文件读取 Config.BOT_LATE_ANSWER_LOG）"""
+    global _stats
+    if _stats is None:
+        with _stats_lock:
+            if _stats is None:
+                _stats = BotLatencyStats(Config().BOT_LATE_ANSWER_LOG)
+    return _stats
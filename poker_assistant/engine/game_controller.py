@@ -3,15 +3,19 @@
 控制整个游戏流程
 """
 from typing import Optional, Callable, Dict, Any, List
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+import threading
+
 from pypokerengine.api.game import setup_config, start_poker
 
 from poker_assistant.engine.ai_opponent import AIOpponentPlayer
 from poker_assistant.engine.bot_persona import get_random_persona
 from poker_assistant.engine.game_state import GameState
+from poker_assistant.engine.table_state import table_state_for
 from poker_assistant.utils.config import Config
 
 # AI 分析模块
-from poker_assistant.ai_analysis.strategy_advisor import StrategyAdvisor
+from poker_assistant.ai_analysis.strategy_advisor import StrategyAdvisor, AdviceCancelled
 from poker_assistant.ai_analysis.opponent_analyzer import OpponentAnalyzer
 from poker_assistant.ai_analysis.board_analyzer import BoardAnalyzer
 from poker_assistant.ai_analysis.review_analyzer import ReviewAnalyzer
@@ -20,6 +24,9 @@ from poker_assistant.ai_analysis.opponent_modeler import OpponentModeler
 from poker_assistant.engine.game_logger import GameLogger
 from poker_assistant.llm_service.client_factory import get_llm_client
 
+# 生成建议前等待进行中的预计算的最长时间（秒）；超时则直接计算
+PRECOMPUTE_WAIT_SECONDS = 2.0
+
 
 class GameController:
     """游戏控制器 - 管理整个游戏流程"""
@@ -71,6 +78,12 @@ class GameController:
         # 共享字典，供AI玩家记录底牌
         self.shared_hole_cards = {}  # {uuid: [card1, card2]}
         
+        # Copilot 预计算（机器人行动期间在后台线程提前计算胜率，只保留最新一次）
+        self._precompute_executor: Optional[ThreadPoolExecutor] = None
+        self._precompute_future: Optional[Future] = None
+        self._precompute_seq = 0
+        self._precompute_lock = threading.Lock()
+        
         # 初始化 AI 分析引擎（如果 API Key 已配置）
         # 规则：如果传入 llm_api_key，则优先认为 AI 可用；否则按环境变量判断
         has_user_key = bool(llm_api_key)
@@ -394,7 +407,8 @@ class GameController:
             return f"抱歉，AI 暂时无法回答（{str(e)}）"
     
     def _get_ai_advice(self, valid_actions: list, hole_card: list,
-                      round_state: dict) -> Dict[str, Any]:
+                      round_state: dict, on_delta: Optional[Callable[[str], None]] = None,
+                      opponent_snapshot: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """
         获取 AI 建议
         
@@ -402,10 +416,15 @@ class GameController:
             valid_actions: 可选行动
             hole_card: 手牌
             round_state: 回合状态
+            on_delta: 流式回调（LLM 每产出一段文本调用一次；抛出 AdviceCancelled 可中止生成）
+            opponent_snapshot: 在游戏线程中由 snapshot_opponents 读取的对手数据（后台线程调用时必须传入）
         
         Returns:
             AI 建议字典
         """
+        # 最近一次预计算通常就是本次决策的局面，等待其完成后直接命中缓存
+        self._wait_for_precompute(PRECOMPUTE_WAIT_SECONDS)
+        
         try:
             # 确保 round_state 包含正确的 dealer_btn（PyPokerEngine 可能不会传递）
             # 使用我们管理的 current_dealer_btn
@@ -464,7 +483,9 @@ class GameController:
                 call_amount=call_amount,
                 valid_actions=ai_valid_actions, # 传入处理后的行动列表
                 opponent_actions=opponent_actions,
-                active_opponents=active_opponents
+                active_opponents=active_opponents,
+                on_delta=on_delta,
+                opponent_snapshot=opponent_snapshot
             )
             
             # 记录日志：AI 建议
@@ -472,12 +493,70 @@ class GameController:
             
             return advice
         
+        except AdviceCancelled:
+            raise
         except Exception as e:
             return {
                 "reasoning": f"AI 建议暂时不可用（{str(e)}）",
                 "recommended_action": "call"
             }
     
+    def snapshot_opponents(self, round_state: dict) -> Optional[Dict[str, Any]]:
+        """在游戏线程中读取活跃对手的特点摘要与估计范围（供后台线程生成建议）"""
+        if not self.ai_enabled:
+            return None
+        return self.strategy_advisor.snapshot_opponents(
+            round_state.get('community_card', []), self._get_active_opponents(round_state))
+    
+    def precompute_advice(self, hole_card: list, round_state: dict):
+        """
+        预计算下一次 AI 建议的数学分析（街道开始和每次行动后调用，运行在游戏线程）
+        
+        机器人行动期间，玩家下一次决策时的手牌、公共牌和对手基本已知：
+        胜率与对抗对手范围的胜率提前在后台线程计算并写入 equity_cache。
+        每次新的行动都会提交一次新的预计算，尚未开始的旧任务直接跳过。
+        
+        Args:
+            hole_card: 玩家手牌
+            round_state: 回合状态
+        """
+        if not self.ai_enabled or not self.config.AI_COPILOT_PRECOMPUTE or not hole_card:
+            return
+        
+        state = table_state_for(round_state)
+        my_idx = state.seat_by_name("你")
+        if my_idx is None or state.folded[my_idx]:
+            return
+        
+        try:
+            compute = self.strategy_advisor.prepare_analysis(
+                list(hole_card), list(state.community_cards), state.active_opponent_names("你"))
+        except Exception as e:
+            print(f"[GameController] 预计算准备失败: {e}")
+            return
+        
+        with self._precompute_lock:
+            if self._precompute_executor is None:
+                self._precompute_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="copilot-precompute")
+            self._precompute_seq += 1
+            self._precompute_future = self._precompute_executor.submit(
+                self._run_precompute, self._precompute_seq, compute)
+    
+    def _run_precompute(self, seq: int, compute: Callable[[], None]):
+        if seq != self._precompute_seq:
+            # 已有更新的牌桌状态，跳过过期的预计算
+            return
+        try:
+            compute()
+        except Exception as e:
+            print(f"[GameController] 预计算失败: {e}")
+    
+    def _wait_for_precompute(self, timeout: float):
+        """等待最近一次预计算完成（单线程执行，等最新任务即等待全部）"""
+        future = self._precompute_future
+        if future is not None and not future.done():
+            wait([future], timeout=timeout)
+    
     def _get_my_position(self, round_state: dict) -> str:
         """
         获取玩家位置名称
@@ -489,25 +568,13 @@ class GameController:
             位置名称（BTN, SB, BB, UTG, MP, CO, HJ等）
         """
         try:
+            state = table_state_for(round_state)
             # 找到玩家的座位索引（Web 模式下使用 async_player）
             if not self.human_player:
                 # Web 模式下，human_player 可能为 None，尝试从 seats 中找到 "你"
-                seats = round_state.get('seats', [])
-                for idx, seat in enumerate(seats):
-                    if seat.get('name') == "你":
-                        my_idx = idx
-                        break
-                else:
-                    return "Unknown"
+                my_idx = state.seat_by_name("你")
             else:
-                my_uuid = self.human_player.uuid
-                my_idx = None
-                seats = round_state.get('seats', [])
-                
-                for idx, seat in enumerate(seats):
-                    if seat.get('uuid') == my_uuid:
-                        my_idx = idx
-                        break
+                my_idx = state.seat_of(self.human_player.uuid)
             
             if my_idx is None:
                 return "Unknown"
@@ -525,8 +592,7 @@ class GameController:
                 if self.config.DEBUG:
                     print(f"[_get_my_position] round_state 中没有 dealer_btn，使用 self.current_dealer_btn: {dealer_btn}")
             
-            active_seats = [idx for idx, s in enumerate(seats) if s['stack'] > 0]
-            active_count = len(active_seats)
+            active_count = len(state.funded_seats)
             
             # 两人对决
             if active_count == 2:
@@ -536,28 +602,24 @@ class GameController:
             if my_idx == dealer_btn:
                 return "BTN"
             
-            # 在活跃玩家中找到相对位置
-            try:
-                dealer_idx_in_active = active_seats.index(dealer_btn)
-                my_idx_in_active = active_seats.index(my_idx)
-                
-                # 计算相对位置（顺时针距离）
-                relative_pos = (my_idx_in_active - dealer_idx_in_active) % active_count
-                
-                if relative_pos == 1:
-                    return "SB"
-                elif relative_pos == 2:
-                    return "BB"
-                elif relative_pos == active_count - 1:
-                    return "CO"  # Cut-off
-                elif relative_pos == active_count - 2:
-                    return "HJ"  # Hijack
-                elif relative_pos == 3:
-                    return "UTG"  # Under the gun
-                else:
-                    return "MP"  # Middle position
-            except ValueError:
+            # 在活跃玩家中找到相对位置（顺时针距离）
+            position = state.funded_position(my_idx, dealer_btn)
+            if position is None:
                 return "Unknown"
+            relative_pos = position[0]
+            
+            if relative_pos == 1:
+                return "SB"
+            elif relative_pos == 2:
+                return "BB"
+            elif relative_pos == active_count - 1:
+                return "CO"  # Cut-off
+            elif relative_pos == active_count - 2:
+                return "HJ"  # Hijack
+            elif relative_pos == 3:
+                return "UTG"  # Under the gun
+            else:
+                return "MP"  # Middle position
         
         except Exception as e:
             if self.config.DEBUG:
@@ -566,19 +628,13 @@ class GameController:
     
     def _get_my_stack(self, round_state: dict) -> int:
         """获取自己的筹码数"""
-        for seat in round_state.get('seats', []):
-            if seat.get('name') == "你":
-                return seat.get('stack', 1000)
-        return 1000
+        state = table_state_for(round_state)
+        my_idx = state.seat_by_name("你")
+        return state.stacks[my_idx] if my_idx is not None else 1000
     
     def _get_active_opponents(self, round_state: dict) -> List[str]:
         """获取当前活跃的对手"""
-        opponents = []
-        for seat in round_state.get('seats', []):
-            player_name = seat.get('name', '')
-            if player_name != "你" and seat.get('state') != 'folded':
-                opponents.append(player_name)
-        return opponents
+        return table_state_for(round_state).active_opponent_names("你")
     
     def _record_opponent_action(self, action: Dict, round_state: dict):
         """记录对手行动到建模器"""
@@ -586,17 +642,24 @@ class GameController:
             return
         
         try:
-            # 从action中提取信息
-            player_uuid = action.get('uuid', '')
-            action_type = action.get('action', '')
+            # 从action中提取信息（兼容 action_histories 条目与 game_update 的 new_action）
+            player_uuid = action.get('uuid') or action.get('player_uuid', '')
+            action_type = action.get('action', '').lower()
             amount = action.get('amount', 0)
+            street = round_state.get('street', '')
+            
+            # 规范化：跟注 0（如大盲位过牌）记为 check
+            if action_type == 'call':
+                paid = action.get('paid')
+                if paid is None:
+                    history = round_state.get('action_histories', {}).get(street, [])
+                    if history and history[-1].get('uuid') == player_uuid:
+                        paid = history[-1].get('paid')
+                if amount == 0 or paid == 0:
+                    action_type = 'check'
             
             # 找到对应的玩家名称
-            player_name = None
-            for seat in round_state.get('seats', []):
-                if seat.get('uuid') == player_uuid:
-                    player_name = seat.get('name', '')
-                    break
+            player_name = table_state_for(round_state).name_of(player_uuid)
             
             if player_name and player_name != "你":
                 # 记录到对手建模器
@@ -604,7 +667,7 @@ class GameController:
                     player_name=player_name,
                     action=action_type,
                     amount=amount,
-                    street=round_state.get('street', ''),
+                    street=street,
                     pot_size=round_state.get('pot', {}).get('main', {}).get('amount', 0),
                     community_cards=round_state.get('community_card', [])
                 )
@@ -616,65 +679,53 @@ class GameController:
         """获取最近的对手行动（规范化Check/Call）- 仅当前街道"""
         # 保持兼容性，某些逻辑可能只关心当前街道
         actions = []
-        action_histories = round_state.get('action_histories', {})
         
         # 获取当前街道的行动
-        street = round_state.get('street', 'preflop')
-        if street in action_histories:
-            for action in action_histories[street]:
-                # 记录到对手建模器 (仍然在实时流中记录)
-                self._record_opponent_action(action, round_state)
-                
-                action_type = action.get('action', '').lower()
-                amount = action.get('amount', 0)
-                
-                # 规范化：将 call 0 转换为 check
-                if action_type == 'call' and amount == 0:
-                    action_type = 'check'
-                
-                actions.append({
-                    "player": action.get('uuid', ''),
-                    "action": action_type,
-                    "amount": amount
-                })
+        state = table_state_for(round_state)
+        for record in state.street_actions():
+            # 记录到对手建模器 (仍然在实时流中记录)
+            self._record_opponent_action(record._asdict(), round_state)
+            
+            action_type = record.action.lower()
+            
+            # 规范化：将 call 0 转换为 check
+            if action_type == 'call' and record.amount == 0:
+                action_type = 'check'
+            
+            actions.append({
+                "player": record.uuid,
+                "action": action_type,
+                "amount": record.amount
+            })
         
         return actions
 
     def _get_full_hand_history(self, round_state: dict) -> List[Dict]:
         """获取完整的局内行动历史（所有街道）"""
         full_history = []
-        action_histories = round_state.get('action_histories', {})
+        state = table_state_for(round_state)
         
         # 按顺序遍历所有街道
-        for street in ['preflop', 'flop', 'turn', 'river']:
-            if street in action_histories:
-                for action in action_histories[street]:
-                    action_type = action.get('action', '').lower()
-                    amount = action.get('amount', 0)
-                    
-                    # 规范化：将 call 0 转换为 check
-                    if action_type == 'call' and amount == 0:
-                        action_type = 'check'
-                    
-                    # 转换玩家 ID 为友好名称
-                    player_uuid = action.get('uuid', '')
-                    player_name = "未知"
-                    
-                    # 查找座位信息
-                    for seat in round_state.get('seats', []):
-                        if seat['uuid'] == player_uuid:
-                            if seat['name'] == "你":
-                                player_name = "我"
-                            else:
-                                player_name = seat['name'] # AI_1, AI_2 等
-                            break
-                            
-                    full_history.append({
-                        "street": street,
-                        "player": player_name, # 使用名称而非 UUID
-                        "action": action_type,
-                        "amount": amount
-                    })
+        for record in state.actions:
+            action_type = record.action.lower()
+            
+            # 规范化：将 call 0 转换为 check
+            if action_type == 'call' and record.amount == 0:
+                action_type = 'check'
+            
+            # 转换玩家 ID 为友好名称
+            player_name = state.name_of(record.uuid)
+            if player_name is None:
+                player_name = "未知"
+            elif player_name == "你":
+                player_name = "我"
+            
+            full_history.append({
+                "street": record.street,
+                "player": player_name, # 使用名称而非 UUID
+                "action": action_type,
+                "amount": record.amount
+            })
         
         return full_history
 
@@ -1,51 +1,37 @@
 """
 修复版 GameEvaluator
-使用 treys 库进行更准确的手牌评估，解决 PyPokerEngine 的 kicker 比较问题
+使用与 treys 一致的评分进行更准确的手牌评估，解决 PyPokerEngine 的 kicker 比较问题
+评估走 hand_evaluator 的完美哈希查找表（每名玩家一次查表）
 """
-from functools import reduce
-from treys import Card as TreysCard, Evaluator as TreysEvaluator
-
 from pypokerengine.engine.hand_evaluator import HandEvaluator
 from pypokerengine.engine.pay_info import PayInfo
 
-# 全局 treys evaluator 实例
-_treys_evaluator = TreysEvaluator()
+from poker_assistant.utils import card_codec, hand_evaluator
 
 
 def convert_card_to_treys(card):
     """
-    将 PyPokerEngine 的 Card 对象转换为 treys 格式字符串
-    PyPokerEngine: Card(suit=2, rank=14) -> 'As'
-    treys 格式: 'As' (Ace of spades)
+    将 PyPokerEngine 的 Card 对象转换为 treys 整数（查表，无字符串解析）
+    PyPokerEngine: Card(suit=2, rank=14) -> treys Ace of spades
     """
-    # PyPokerEngine suit: 2=Spade, 4=Heart, 8=Diamond, 16=Club
-    # treys suit: 's', 'h', 'd', 'c'
-    suit_map = {2: 's', 4: 'h', 8: 'd', 16: 'c'}
-    # PyPokerEngine rank: 2-14 (14=Ace)
-    # treys rank: '2'-'9', 'T', 'J', 'Q', 'K', 'A'
-    rank_map = {
-        2: '2', 3: '3', 4: '4', 5: '5', 6: '6', 7: '7', 8: '8', 9: '9',
-        10: 'T', 11: 'J', 12: 'Q', 13: 'K', 14: 'A'
-    }
-    
-    suit = suit_map.get(card.suit, 's')
-    rank = rank_map.get(card.rank, '2')
-    return f"{rank}{suit}"
+    return card_codec.to_treys(card_codec.from_ppe_card(card))
 
 
-def eval_hand_with_treys(hole_cards, community_cards):
+def eval_hand_with_treys(hole_cards, community_cards, board=None):
     """
-    使用 treys 库评估手牌
+    评估手牌（hand_evaluator 完美哈希查表，结果与 treys 一致）
     返回分数（越小越好，treys 的评分系统）
+
+    Args:
+        board: 可选，已转换好的公共牌整数编码（多名玩家比较时只转换一次）
     """
     try:
-        # 转换为 treys 格式
-        hole = [TreysCard.new(convert_card_to_treys(c)) for c in hole_cards]
-        board = [TreysCard.new(convert_card_to_treys(c)) for c in community_cards]
-        
-        # treys 返回的分数越小越好（1 是皇家同花顺）
-        score = _treys_evaluator.evaluate(board, hole)
-        return score
+        hole = [card_codec.from_ppe_card(c) for c in hole_cards]
+        if board is None:
+            board = [card_codec.from_ppe_card(c) for c in community_cards]
+
+        # 分数越小越好（1 是皇家同花顺）
+        return hand_evaluator.evaluate(hole + board)
     except Exception as e:
         print(f"[PatchedEvaluator] Error evaluating hand: {e}")
         # 回退到 PyPokerEngine 的评估
@@ -59,9 +45,13 @@ class PatchedGameEvaluator:
 
     @classmethod
     def judge(cls, table):
-        winners = cls._find_winners_from(table.get_community_card(), table.seats.players)
-        hand_info = cls._gen_hand_info_if_needed(table.seats.players, table.get_community_card())
-        prize_map = cls._calc_prize_distribution(table.get_community_card(), table.seats.players)
+        community_card = table.get_community_card()
+        players = table.seats.players
+        # 每次摊牌每名玩家只评估一次，主池和所有边池共用同一份分数
+        scores = cls._eval_scores(community_card, players)
+        winners = cls._find_winners_from(community_card, players, scores)
+        hand_info = cls._gen_hand_info_if_needed(players, community_card)
+        prize_map = cls._calc_prize_distribution(community_card, players, scores)
         return winners, hand_info, prize_map
 
     @classmethod
@@ -71,27 +61,46 @@ class PatchedGameEvaluator:
         return side_pots + [main_pot]
 
     @classmethod
-    def _calc_prize_distribution(cls, community_card, players):
+    def _calc_prize_distribution(cls, community_card, players, scores=None):
+        if scores is None:
+            scores = cls._eval_scores(community_card, players)
         prize_map = cls._create_prize_map(len(players))
-        pots = cls.create_pot(players)
-        for pot in pots:
-            winners = cls._find_winners_from(community_card, pot["eligibles"])
+        seat_index = {id(player): i for i, player in enumerate(players)}
+        for pot in cls.create_pot(players):
+            winners = cls._find_winners_from(community_card, pot["eligibles"], scores)
             prize = int(pot["amount"] / len(winners))
             for winner in winners:
-                prize_map[players.index(winner)] += prize
+                prize_map[seat_index[id(winner)]] += prize
         return prize_map
 
     @classmethod
     def _create_prize_map(cls, player_num):
-        def update(d, other):
-            d.update(other)
-            return d
-        return reduce(update, [{i: 0} for i in range(player_num)], {})
+        return {i: 0 for i in range(player_num)}
 
     @classmethod
-    def _find_winners_from(cls, community_card, players):
+    def _eval_scores(cls, community_card, players):
         """
-        使用 treys 库找到赢家 - 更准确的手牌比较
+        评估所有未弃牌玩家的手牌（公共牌只转换一次）
+
+        Returns:
+            {id(player): 分数}（分数越小越好）
+        """
+        active_players = [player for player in players if player.is_active()]
+        if len(active_players) <= 1:
+            return {}
+        board = [card_codec.from_ppe_card(c) for c in community_card]
+        return {
+            id(player): eval_hand_with_treys(player.hole_card, community_card, board)
+            for player in active_players
+        }
+
+    @classmethod
+    def _find_winners_from(cls, community_card, players, scores=None):
+        """
+        找到赢家 - 按与 treys 一致的分数比较（分数越小越好）
+
+        Args:
+            scores: 可选，_eval_scores 的结果；提供时不再重复评估
         """
         active_players = [player for player in players if player.is_active()]
         
@@ -101,18 +110,16 @@ class PatchedGameEvaluator:
         if len(active_players) == 1:
             return active_players
         
-        # 使用 treys 评估每个玩家的手牌（分数越小越好）
-        scores = []
-        for player in active_players:
-            score = eval_hand_with_treys(player.hole_card, community_card)
-            scores.append(score)
+        if scores is None:
+            scores = cls._eval_scores(community_card, active_players)
+        player_scores = [scores[id(player)] for player in active_players]
         
-        # treys 分数越小越好，所以找最小值
-        best_score = min(scores)
+        # 分数越小越好，所以找最小值
+        best_score = min(player_scores)
         
         # 找出所有拥有最佳分数的玩家
         winners = [
-            player for score, player in zip(scores, active_players)
+            player for score, player in zip(player_scores, active_players)
             if score == best_score
         ]
         
@@ -145,26 +152,28 @@ class PatchedGameEvaluator:
 
     @classmethod
     def _get_side_pots(cls, players):
-        pay_amounts = [payinfo.amount for payinfo in cls._fetch_allin_payinfo(players)]
-        gen_sidepots = lambda sidepots, allin_amount: sidepots + [cls._create_sidepot(players, sidepots, allin_amount)]
-        return reduce(gen_sidepots, pay_amounts, [])
-
-    @classmethod
-    def _create_sidepot(cls, players, smaller_side_pots, allin_amount):
-        return {
-            "amount": cls._calc_sidepot_size(players, smaller_side_pots, allin_amount),
-            "eligibles": cls._select_eligibles(players, allin_amount)
-        }
+        """
+        按全下金额从小到大一次性生成所有边池
 
-    @classmethod
-    def _calc_sidepot_size(cls, players, smaller_side_pots, allin_amount):
-        add_chip_for_pot = lambda pot, player: pot + min(allin_amount, player.pay_info.amount)
-        target_pot_size = reduce(add_chip_for_pot, players, 0)
-        return target_pot_size - cls._get_sidepots_sum(smaller_side_pots)
+        第 k 个边池 = sum(min(全下额_k, 投入)) - sum(min(全下额_{k-1}, 投入))，
+        与 PyPokerEngine 逐个累加已有边池的结果一致（含同额全下产生的 0 边池）。
+        """
+        pay_amounts = [pay.amount for pay in cls._get_payinfo(players)]
+        side_pots = []
+        previous_level = 0
+        for payinfo in cls._fetch_allin_payinfo(players):
+            allin_amount = payinfo.amount
+            level = sum(min(allin_amount, amount) for amount in pay_amounts)
+            side_pots.append({
+                "amount": level - previous_level,
+                "eligibles": cls._select_eligibles(players, allin_amount)
+            })
+            previous_level = level
+        return side_pots
 
     @classmethod
     def _get_sidepots_sum(cls, sidepots):
-        return reduce(lambda sum_, sidepot: sum_ + sidepot["amount"], sidepots, 0)
+        return sum(sidepot["amount"] for sidepot in sidepots)
 
     @classmethod
     def _select_eligibles(cls, players, allin_amount):
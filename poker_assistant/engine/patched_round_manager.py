@@ -0,0 +1,100 @@
+"""
+PyPokerEngine 回合状态热点路径补丁
+PyPokerEngine 在每个动作上都会:
+
+- 把整张牌桌 serialize/deserialize 一遍作为深拷贝（RoundManager.__deep_copy_state），
+  而 Dealer 拿到新状态后立即丢弃旧状态，深拷贝没有任何作用
+- 用 reduce 逐个拼接列表的方式编码 action_histories（O(n²)），
+  并且 game_update / ask 消息中 round_state 内外各编码一次
+
+补丁后状态在原对象上推进，行动历史一次线性编码、同一消息内复用。
+消息内容与原实现完全一致。
+"""
+from pypokerengine.engine.data_encoder import DataEncoder
+from pypokerengine.engine.message_builder import MessageBuilder
+from pypokerengine.engine.action_checker import ActionChecker
+from pypokerengine.engine.round_manager import RoundManager
+
+STREET_NAMES = ("preflop", "flop", "turn", "river")
+
+
+def _shallow_copy_state(cls, state):
+    """替代 __deep_copy_state: 复用同一张牌桌（旧状态不再被使用）"""
+    return {
+        "round_count": state["round_count"],
+        "small_blind_amount": state["small_blind_amount"],
+        "street": state["street"],
+        "next_player": state["next_player"],
+        "table": state["table"]
+    }
+
+
+def _interleave(histories):
+    """按座位轮流取行动（从小盲开始），等价于原实现的补齐 None + zip + 过滤"""
+    max_len = max(len(h) for h in histories) if histories else 0
+    return [h[i] for i in range(max_len) for h in histories if i < len(h)]
+
+
+def _encode_action_histories(cls, table):
+    """线性编码各街道行动历史（结果与 DataEncoder.encode_action_histories 一致）"""
+    players = table.seats.players
+    num_players = len(players)
+    start = table.sb_pos()
+    ordered = [players[(start + i) % num_players] for i in range(num_players)]
+
+    street_histories = []
+    for street in range(4):
+        histories = [player.round_action_histories[street] for player in ordered]
+        if any(h is not None for h in histories):
+            street_histories.append(histories)
+    street_histories.append([player.action_histories for player in ordered])
+
+    return {
+        "action_histories": {
+            name: _interleave(histories)
+            for name, histories in zip(STREET_NAMES, street_histories)
+        }
+    }
+
+
+def _build_ask_message(cls, player_pos, state):
+    players = state["table"].seats.players
+    player = players[player_pos]
+    hole_card = DataEncoder.encode_player(player, holecard=True)["hole_card"]
+    valid_actions = ActionChecker.legal_actions(players, player_pos, state["small_blind_amount"])
+    round_state = DataEncoder.encode_round_state(state)
+    message = {
+        "message_type": cls.ASK_MESSAGE,
+        "hole_card": hole_card,
+        "valid_actions": valid_actions,
+        "round_state": round_state,
+        "action_histories": {"action_histories": round_state["action_histories"]}
+    }
+    return {"type": "ask", "message": message}
+
+
+def _build_game_update_message(cls, player_pos, action, amount, state):
+    player = state["table"].seats.players[player_pos]
+    round_state = DataEncoder.encode_round_state(state)
+    message = {
+        "message_type": cls.GAME_UPDATE_MESSAGE,
+        "action": DataEncoder.encode_action(player, action, amount),
+        "round_state": round_state,
+        "action_histories": {"action_histories": round_state["action_histories"]}
+    }
+    return {"type": "notification", "message": message}
+
+
+def patch_round_manager():
+    """
+    在运行时替换 PyPokerEngine 回合推进的热点方法
+    应该在游戏启动前调用一次
+    """
+    RoundManager._RoundManager__deep_copy_state = classmethod(_shallow_copy_state)
+    DataEncoder.encode_action_histories = classmethod(_encode_action_histories)
+    MessageBuilder.build_ask_message = classmethod(_build_ask_message)
+    MessageBuilder.build_game_update_message = classmethod(_build_game_update_message)
+
+
+# 自动应用补丁
+patch_round_manager()
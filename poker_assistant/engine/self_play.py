@@ -0,0 +1,231 @@
+"""
+无界面自博弈模拟器
+在 AIOpponentPlayer 之间直接运行 PyPokerEngine 牌局，用于大规模评估 Bot 性格调参:
+
+- 不经过 GameManager / AsyncHumanPlayer，没有队列、磁盘日志和终端输出
+- 决策方式: 'rule'（规则策略）或 'stub'（StubLLMClient 代替真实 LLM，
+  完整走 Harrington 分析与 Prompt 构建路径，但不产生网络请求）
+- 多进程并行，每个进程独立跑若干局，最后合并统计
+- 报告 hands/sec 以及每个座位/性格的胜率和 bb/100
+
+命令行入口: python scripts/run_selfplay.py
+"""
+import json
+import multiprocessing
+import random
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+from pypokerengine.api.game import setup_config, start_poker
+
+from poker_assistant.engine import patched_game_evaluator  # noqa: F401  应用 treys 评估补丁
+from poker_assistant.engine import patched_round_manager  # noqa: F401  去掉每步深拷贝
+from poker_assistant.engine.ai_opponent import AIOpponentPlayer
+from poker_assistant.engine.bot_persona import get_persona_by_name
+from poker_assistant.llm_service.base_client import BaseLLMClient
+
+DECISION_MODES = ("rule", "stub")
+
+# StubLLMClient 的行动频率 (fold, call, raise)，按性格风格区分
+STUB_ACTION_WEIGHTS = {
+    "tag": (0.35, 0.40, 0.25),
+    "lag": (0.20, 0.35, 0.45),
+}
+
+
+class StubLLMClient(BaseLLMClient):
+    """
+    模拟用的 LLM 客户端：按性格风格的固定频率随机返回 JSON 决策
+
+    加注金额固定为 1，由 AIOpponentPlayer._validate_action 修正为最小加注。
+    """
+
+    def __init__(self, style_code: str = "tag", rng: Optional[random.Random] = None):
+        super().__init__(api_key="", model="stub")
+        self.weights = STUB_ACTION_WEIGHTS.get(style_code, STUB_ACTION_WEIGHTS["tag"])
+        self.rng = rng or random.Random()
+
+    def chat(self, messages, temperature=None, max_tokens=None, stream=False, debug=False) -> str:
+        self.total_requests += 1
+        action = self.rng.choices(("fold", "call", "raise"), weights=self.weights)[0]
+        return json.dumps({"action": action, "amount": 1 if action == "raise" else 0})
+
+
+@dataclass
+class SeatSpec:
+    """座位配置"""
+    persona: str = "tag"        # 性格名称（见 bot_persona.get_persona_by_name）
+    difficulty: str = "medium"  # 规则策略难度
+    mode: str = "rule"          # 决策方式: rule / stub
+
+    @classmethod
+    def parse(cls, text: str) -> "SeatSpec":
+        """解析 'persona[:difficulty[:mode]]'，例如 'lag:hard:stub'"""
+        parts = text.split(":")
+        spec = cls(*parts[:3])
+        if get_persona_by_name(spec.persona) is None:
+            raise ValueError(f"未知性格: {spec.persona}")
+        if spec.mode not in DECISION_MODES:
+            raise ValueError(f"未知决策方式: {spec.mode}（可选 {', '.join(DECISION_MODES)}）")
+        return spec
+
+    @property
+    def label(self) -> str:
+        return f"{self.persona}:{self.difficulty}:{self.mode}"
+
+
+@dataclass
+class SeatStats:
+    """单个座位的累计统计"""
+    label: str
+    hands: int = 0
+    hands_won: int = 0
+    chips_won: int = 0
+    games_won: int = 0
+
+    def merge(self, other: "SeatStats"):
+        self.hands += other.hands
+        self.hands_won += other.hands_won
+        self.chips_won += other.chips_won
+        self.games_won += other.games_won
+
+
+@dataclass
+class SimulationResult:
+    """模拟结果（多个进程的结果可合并）"""
+    seats: List[SeatStats]
+    hands: int = 0
+    games: int = 0
+    elapsed: float = 0.0
+    big_blind: int = 10
+
+    @property
+    def hands_per_second(self) -> float:
+        return self.hands / self.elapsed if self.elapsed > 0 else 0.0
+
+    def merge(self, other: "SimulationResult"):
+        for mine, theirs in zip(self.seats, other.seats):
+            mine.merge(theirs)
+        self.hands += other.hands
+        self.games += other.games
+
+    def by_persona(self) -> Dict[str, SeatStats]:
+        """按座位配置 (persona:difficulty:mode) 汇总（同配置的多个座位合并）"""
+        summary: Dict[str, SeatStats] = {}
+        for seat in self.seats:
+            summary.setdefault(seat.label, SeatStats(seat.label)).merge(seat)
+        return summary
+
+    def format_report(self) -> str:
+        """生成文本报告"""
+        lines = [
+            f"总手数: {self.hands} | 局数: {self.games} | 用时: {self.elapsed:.1f}s "
+            f"| 速度: {self.hands_per_second:.0f} hands/sec",
+            f"{'配置':<20}{'手数':>10}{'赢牌率':>10}{'bb/100':>10}{'赢局':>8}",
+        ]
+        for label, stats in self.by_persona().items():
+            win_rate = stats.hands_won / stats.hands if stats.hands else 0.0
+            bb_per_100 = stats.chips_won / self.big_blind / stats.hands * 100 if stats.hands else 0.0
+            lines.append(f"{label:<20}{stats.hands:>10}{win_rate:>10.1%}{bb_per_100:>10.2f}{stats.games_won:>8}")
+        return "\n".join(lines)
+
+
+class _SimPlayer(AIOpponentPlayer):
+    """记录赢牌次数的静默 AI 玩家"""
+
+    def __init__(self, spec: SeatSpec, big_blind: int, rng: random.Random):
+        persona = get_persona_by_name(spec.persona)
+        llm_client = StubLLMClient(persona.style_code, rng) if spec.mode == "stub" else None
+        super().__init__(
+            difficulty=spec.difficulty,
+            persona=persona,
+            llm_client=llm_client,
+            big_blind=big_blind,
+            use_llm=llm_client is not None,
+            quiet=True,
+            # 不限制决策时间：桩客户端在当前线程同步调用，结果只由种子决定，也不写入超时回答
+            decision_budget_ms=0,
+        )
+        self.hands_won = 0
+
+    def receive_game_update_message(self, action, round_state):
+        # 模拟中不需要保留行动历史（避免内存随手数增长）
+        pass
+
+    def receive_round_result_message(self, winners, hand_info, round_state):
+        if any(winner["uuid"] == self.uuid for winner in winners):
+            self.hands_won += 1
+
+
+def simulate(seats: List[SeatSpec], num_hands: int, hands_per_game: int = 100,
+             initial_stack: int = 1000, small_blind: int = 5, seed: Optional[int] = None) -> SimulationResult:
+    """
+    在当前进程中运行自博弈
+
+    Args:
+        seats: 座位配置（2-10 个）
+        num_hands: 目标手数（以整局为单位，可能略多）
+        hands_per_game: 每局最多手数（局内筹码不重置；只剩一人有筹码时提前结束，即锦标赛）
+        initial_stack: 初始筹码
+        small_blind: 小盲注（大盲为 2 倍）
+        seed: 随机种子
+    """
+    rng = random.Random(seed)
+    random.seed(seed)
+    big_blind = small_blind * 2
+    players = [_SimPlayer(spec, big_blind, rng) for spec in seats]
+    result = SimulationResult([SeatStats(spec.label) for spec in seats], big_blind=big_blind)
+
+    start = time.perf_counter()
+    while result.hands < num_hands:
+        config = setup_config(max_round=hands_per_game, initial_stack=initial_stack,
+                              small_blind_amount=small_blind)
+        names = [f"seat{i}" for i in range(len(players))]
+        for name, player in zip(names, players):
+            player.hands_won = 0
+            config.register_player(name=name, algorithm=player)
+        game_result = start_poker(config, verbose=0)
+
+        hands_played = max(player.round_count for player in players)
+        final_stacks = {p["name"]: p["stack"] for p in game_result["players"]}
+        best_stack = max(final_stacks.values())
+        for name, player, stats in zip(names, players, result.seats):
+            stats.hands += hands_played
+            stats.hands_won += player.hands_won
+            stats.chips_won += final_stacks[name] - initial_stack
+            stats.games_won += final_stacks[name] == best_stack
+        result.hands += hands_played
+        result.games += 1
+    result.elapsed = time.perf_counter() - start
+    return result
+
+
+def _simulate_worker(args) -> SimulationResult:
+    return simulate(*args)
+
+
+def run_simulation(seats: List[SeatSpec], num_hands: int, workers: int = 1, hands_per_game: int = 100,
+                   initial_stack: int = 1000, small_blind: int = 5, seed: Optional[int] = None) -> SimulationResult:
+    """
+    多进程自博弈（workers <= 1 时在当前进程运行）
+
+    手数平均分给各进程，每个进程使用不同的随机种子。
+    """
+    if workers <= 1:
+        return simulate(seats, num_hands, hands_per_game, initial_stack, small_blind, seed)
+
+    base_seed = seed if seed is not None else random.randrange(1 << 30)
+    per_worker = -(-num_hands // workers)
+    tasks = [
+        (seats, per_worker, hands_per_game, initial_stack, small_blind, base_seed + i)
+        for i in range(workers)
+    ]
+    start = time.perf_counter()
+    with multiprocessing.get_context("spawn").Pool(workers) as pool:
+        results = pool.map(_simulate_worker, tasks)
+    merged = results[0]
+    for other in results[1:]:
+        merged.merge(other)
+    merged.elapsed = time.perf_counter() - start
+    return merged
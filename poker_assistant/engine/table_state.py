@@ -0,0 +1,179 @@
+"""
+紧凑牌桌状态模块
+PyPokerEngine 每次回调都会传入新编码的 round_state 字典，AIOpponentPlayer 和 GameController
+原本在每个辅助方法里各自遍历 seats / action_histories 来找位置、筹码和历史。
+
+TableState 对一个 round_state 只遍历一次，得到数组形式的座位信息、
+按街道展开的只追加行动日志和 uuid/名称索引，之后的派生查询（位置、筹码、
+有效筹码、活跃人数、按名称查找）均为 O(1)。
+
+PyPokerEngine 把同一个 round_state 对象广播给所有玩家，table_state_for 按对象身份记忆最近一次的结果，
+同一条消息只构建一次。
+"""
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+STREETS = ("preflop", "flop", "turn", "river")
+
+
+class ActionRecord(NamedTuple):
+    """一条行动记录"""
+    street: str
+    uuid: str
+    action: str      # 大写，与 PyPokerEngine 一致 (SMALLBLIND / CALL / RAISE / FOLD ...)
+    amount: int
+    paid: int
+
+
+class TableState:
+    """由 round_state 一次遍历构建的紧凑牌桌状态"""
+
+    __slots__ = (
+        "round_state", "street", "dealer_btn", "pot", "community_cards",
+        "uuids", "names", "stacks", "folded",
+        "active_count", "funded_seats", "actions", "_street_ranges",
+        "_index_by_uuid", "_index_by_name", "_funded_rank", "_top_active_stacks",
+    )
+
+    def __init__(self, round_state: Dict[str, Any]):
+        self.round_state = round_state
+        self.street = round_state.get("street", "preflop")
+        self.dealer_btn = round_state.get("dealer_btn")
+        self.pot = round_state.get("pot", {}).get("main", {}).get("amount", 0)
+        self.community_cards = round_state.get("community_card", [])
+
+        seats = round_state.get("seats", [])
+        self.uuids: List[str] = []
+        self.names: List[str] = []
+        self.stacks: List[int] = []
+        self.folded: List[bool] = []
+        self._index_by_uuid: Dict[str, int] = {}
+        self._index_by_name: Dict[str, int] = {}
+        self.funded_seats: List[int] = []
+        self._funded_rank: Dict[int, int] = {}
+        active_stacks: List[Tuple[int, int]] = []
+        for idx, seat in enumerate(seats):
+            uuid, name, stack = seat.get("uuid", ""), seat.get("name", ""), seat.get("stack", 0)
+            folded = seat.get("state") == "folded"
+            self.uuids.append(uuid)
+            self.names.append(name)
+            self.stacks.append(stack)
+            self.folded.append(folded)
+            self._index_by_uuid[uuid] = idx
+            self._index_by_name.setdefault(name, idx)
+            if stack > 0:
+                self._funded_rank[idx] = len(self.funded_seats)
+                self.funded_seats.append(idx)
+            if not folded:
+                active_stacks.append((stack, idx))
+        self.active_count = len(active_stacks)
+        # 最大的两个活跃筹码，用于 O(1) 计算有效筹码
+        self._top_active_stacks = sorted(active_stacks, reverse=True)[:2]
+
+        # 按街道顺序展开的行动日志，每条街道对应一段区间
+        self.actions: List[ActionRecord] = []
+        self._street_ranges: Dict[str, Tuple[int, int]] = {}
+        histories = round_state.get("action_histories", {})
+        for street in STREETS:
+            if street not in histories:
+                continue
+            start = len(self.actions)
+            for entry in histories[street]:
+                self.actions.append(ActionRecord(
+                    street, entry.get("uuid", ""), entry.get("action", ""),
+                    entry.get("amount", 0), entry.get("paid", 0)))
+            self._street_ranges[street] = (start, len(self.actions))
+
+    # ---------- 座位 ----------
+
+    def seat_of(self, uuid: str) -> Optional[int]:
+        return self._index_by_uuid.get(uuid)
+
+    def seat_by_name(self, name: str) -> Optional[int]:
+        return self._index_by_name.get(name)
+
+    def name_of(self, uuid: str) -> Optional[str]:
+        idx = self._index_by_uuid.get(uuid)
+        return self.names[idx] if idx is not None else None
+
+    def stack_of(self, uuid: str, default: int = 0) -> int:
+        idx = self._index_by_uuid.get(uuid)
+        return self.stacks[idx] if idx is not None else default
+
+    def opponent_stacks(self, uuid: str) -> List[int]:
+        """未弃牌对手的筹码（按座位顺序）"""
+        return [
+            stack for idx, stack in enumerate(self.stacks)
+            if not self.folded[idx] and self.uuids[idx] != uuid
+        ]
+
+    def active_opponent_names(self, name: str) -> List[str]:
+        """未弃牌对手的名称（按座位顺序）"""
+        return [n for idx, n in enumerate(self.names) if not self.folded[idx] and n != name]
+
+    def effective_stack(self, uuid: str) -> int:
+        """有效筹码: min(自己的筹码, 最大的未弃牌对手筹码)"""
+        idx = self._index_by_uuid.get(uuid)
+        if idx is None:
+            return 0
+        for stack, other in self._top_active_stacks:
+            if other != idx:
+                return min(self.stacks[idx], stack)
+        return 0
+
+    # ---------- 位置 ----------
+
+    def steps_from_button(self, seat: int) -> Optional[int]:
+        """座位相对庄位的顺时针距离（按全部座位计算）"""
+        if self.dealer_btn is None or not self.uuids:
+            return None
+        return (seat - self.dealer_btn) % len(self.uuids)
+
+    def funded_position(self, seat: int, dealer_btn: Optional[int] = None) -> Optional[Tuple[int, int]]:
+        """
+        座位在有筹码玩家中相对庄位的顺时针距离
+
+        Args:
+            dealer_btn: 庄位，默认使用 round_state 中的 dealer_btn
+
+        Returns:
+            (相对距离, 有筹码人数)；座位或庄位没有筹码时返回 None
+        """
+        dealer_btn = self.dealer_btn if dealer_btn is None else dealer_btn
+        my_rank = self._funded_rank.get(seat)
+        dealer_rank = self._funded_rank.get(dealer_btn)
+        if my_rank is None or dealer_rank is None:
+            return None
+        count = len(self.funded_seats)
+        return (my_rank - dealer_rank) % count, count
+
+    # ---------- 行动日志 ----------
+
+    @property
+    def streets(self) -> List[str]:
+        """round_state 中出现过的街道（按顺序，含尚无行动的当前街道）"""
+        return list(self._street_ranges)
+
+    def street_actions(self, street: Optional[str] = None) -> List[ActionRecord]:
+        """某条街道（默认当前街道）的行动记录"""
+        start, end = self._street_ranges.get(street or self.street, (0, 0))
+        return self.actions[start:end]
+
+
+# 最近一次构建的 (round_state, TableState)；保留 round_state 引用避免 id 被复用
+_last: Tuple[Optional[Dict[str, Any]], Optional[TableState]] = (None, None)
+
+
+def table_state_for(round_state: Dict[str, Any]) -> TableState:
+    """
+    获取 round_state 对应的 TableState（同一对象只构建一次）
+
+    PyPokerEngine 对每条消息只编码一次 round_state 并广播给所有玩家，
+    因此按对象身份记忆最近一次结果即可覆盖同一消息的所有消费者。
+    """
+    global _last
+    cached_source, cached_state = _last
+    if cached_source is round_state:
+        return cached_state
+    state = TableState(round_state)
+    _last = (round_state, state)
+    return state
@@ -2,8 +2,9 @@
 LLM 客户端基类模块
 定义所有 LLM 客户端必须实现的接口
 """
+import asyncio
 from abc import ABC, abstractmethod
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Iterator, AsyncIterator
 
 class BaseLLMClient(ABC):
     """LLM 客户端抽象基类"""
@@ -37,6 +38,40 @@ class BaseLLMClient(ABC):
         """
         pass
 
+    async def achat(self,
+                    messages: List[Dict[str, str]],
+                    temperature: Optional[float] = None,
+                    max_tokens: Optional[int] = None,
+                    stream: bool = False,
+                    debug: bool = False) -> str:
+        """
+        异步发送聊天请求（参数与 chat 相同）
+        
+        默认实现在线程池中运行 chat；子类可覆盖为原生异步实现，
+        在事件循环上并发大量请求而不占用线程。
+        """
+        return await asyncio.to_thread(self.chat, messages, temperature, max_tokens, stream, debug)
+
+    def chat_stream(self,
+                    messages: List[Dict[str, str]],
+                    temperature: Optional[float] = None,
+                    max_tokens: Optional[int] = None,
+                    debug: bool = False) -> Iterator[str]:
+        """
+        流式聊天请求：逐段产出回复文本（拼接后与 chat 的返回值一致）
+        
+        默认实现一次性产出 chat 的完整结果；支持流式的子类应覆盖。
+        """
+        yield self.chat(messages, temperature, max_tokens, debug=debug)
+
+    async def achat_stream(self,
+                           messages: List[Dict[str, str]],
+                           temperature: Optional[float] = None,
+                           max_tokens: Optional[int] = None,
+                           debug: bool = False) -> AsyncIterator[str]:
+        """chat_stream 的异步版本（默认一次性产出 achat 的完整结果）"""
+        yield await self.achat(messages, temperature, max_tokens, debug=debug)
+
     def chat_simple(self, 
                    user_message: str, 
                    system_message: Optional[str] = None) -> str:
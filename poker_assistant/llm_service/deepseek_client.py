@@ -4,8 +4,12 @@ Deepseek API 客户端模块
 """
 import os
 import time
-from typing import List, Dict, Any, Optional
-from openai import OpenAI
+from typing import List, Dict, Any, Optional, Iterator, AsyncIterator
+from openai import OpenAI, AsyncOpenAI
+
+from poker_assistant.llm_service.http_pool import get_http_client, get_async_http_client
+
+POOL_PROVIDER = "deepseek"
 
 
 class DeepseekClient:
@@ -40,12 +44,16 @@ class DeepseekClient:
         if not self.api_key:
             raise ValueError("DEEPSEEK_API_KEY 未配置，请在 .env 文件中设置")
         
-        # 初始化 OpenAI 客户端（Deepseek 兼容 OpenAI API）
+        # 初始化 OpenAI 客户端（Deepseek 兼容 OpenAI API），共用按 base_url 共享的连接池
         self.client = OpenAI(
             api_key=self.api_key,
             base_url=self.base_url,
-            timeout=self.timeout
+            timeout=self.timeout,
+            http_client=get_http_client(POOL_PROVIDER, self.base_url)
         )
+        # 异步客户端在首次 achat() 时按事件循环创建
+        self._async_client: Optional[AsyncOpenAI] = None
+        self._async_http = None
         
         # 统计信息
         self.total_requests = 0
@@ -83,27 +91,7 @@ class DeepseekClient:
             
             # 打印调试信息
             if debug:
-                print("\n" + "="*70)
-                print("🔍 Deepseek API 调试信息")
-                print("="*70)
-                print(f"📋 请求参数:")
-                print(f"  Model: {self.model}")
-                print(f"  Temperature: {temp}")
-                print(f"  Max Tokens: {tokens}")
-                print(f"  Messages 数量: {len(messages)}")
-                print("\n📝 请求内容:")
-                for i, msg in enumerate(messages):
-                    role = msg.get('role', 'unknown')
-                    content = msg.get('content', '')
-                    print(f"\n  Message {i+1} [{role}]:")
-                    print(f"  {'-'*60}")
-                    # 截取显示（如果太长）
-                    if len(content) > 500:
-                        print(f"  {content[:500]}...")
-                        print(f"  ... (总长度: {len(content)} 字符)")
-                    else:
-                        print(f"  {content}")
-                print("\n" + "="*70)
+                self._print_request(messages, temp, tokens)
             
             # 调用 API
             # 添加 stop 参数为 None 确保不会提前停止
@@ -120,60 +108,201 @@ class DeepseekClient:
             
             # 处理响应
             if stream:
-                # 流式输出（暂不支持，后续可扩展）
-                content = ""
-                for chunk in response:
-                    if chunk.choices[0].delta.content:
-                        content += chunk.choices[0].delta.content
-                return content
+                # 流式输出：拼接全部片段（逐段消费请使用 chat_stream）
+                return "".join(self._iter_chunks(response))
+            else:
+                return self._finish(response, start_time, debug)
+        
+        except Exception as e:
+            if debug:
+                print(f"\n❌ API 调用失败: {str(e)}\n")
+            raise Exception(f"Deepseek API 调用失败: {str(e)}")
+    
+    def _print_request(self, messages: List[Dict[str, str]], temp: float, tokens: int):
+        """打印请求调试信息"""
+        print("\n" + "="*70)
+        print("🔍 Deepseek API 调试信息")
+        print("="*70)
+        print(f"📋 请求参数:")
+        print(f"  Model: {self.model}")
+        print(f"  Temperature: {temp}")
+        print(f"  Max Tokens: {tokens}")
+        print(f"  Messages 数量: {len(messages)}")
+        print("\n📝 请求内容:")
+        for i, msg in enumerate(messages):
+            role = msg.get('role', 'unknown')
+            content = msg.get('content', '')
+            print(f"\n  Message {i+1} [{role}]:")
+            print(f"  {'-'*60}")
+            # 截取显示（如果太长）
+            if len(content) > 500:
+                print(f"  {content[:500]}...")
+                print(f"  ... (总长度: {len(content)} 字符)")
+            else:
+                print(f"  {content}")
+        print("\n" + "="*70)
+    
+    def _finish(self, response, start_time: float, debug: bool) -> str:
+        """处理非流式响应: 取出内容、更新统计并打印调试信息"""
+        content = response.choices[0].message.content
+
+        # 统计信息
+        self.total_requests += 1
+        prompt_tokens = 0
+        completion_tokens = 0
+        total_tokens = 0
+        finish_reason = "unknown"
+
+        if hasattr(response, 'usage'):
+            prompt_tokens = response.usage.prompt_tokens
+            completion_tokens = response.usage.completion_tokens
+            total_tokens = response.usage.total_tokens
+            self.total_tokens += total_tokens
+
+            # Deepseek 价格（假设：$0.001/1K tokens）
+            cost = (total_tokens / 1000) * 0.001
+            self.total_cost += cost
+
+        # 获取结束原因
+        if hasattr(response.choices[0], 'finish_reason'):
+            finish_reason = response.choices[0].finish_reason
+
+        # 计算耗时
+        elapsed_time = time.time() - start_time
+
+        # 打印响应调试信息
+        if debug:
+            print("📤 API 响应:")
+            print(f"  耗时: {elapsed_time:.2f} 秒")
+            print(f"  Tokens 使用: {prompt_tokens} (输入) + {completion_tokens} (输出) = {total_tokens}")
+            print(f"  结束原因: {finish_reason}")
+            if finish_reason == "length":
+                print("  ⚠️  警告: 输出因达到 max_tokens 限制而截断！")
+            print(f"\n📝 响应内容 (长度: {len(content)} 字符):")
+            print(f"  {'-'*60}")
+            print(f"  {content}")
+            print("="*70 + "\n")
+
+        return content
+
+    def _get_async_client(self) -> AsyncOpenAI:
+        """当前事件循环上的 AsyncOpenAI 客户端（共享连接池变化时重建）"""
+        http_client = get_async_http_client(POOL_PROVIDER, self.base_url)
+        if self._async_client is None or self._async_http is not http_client:
+            self._async_http = http_client
+            self._async_client = AsyncOpenAI(
+                api_key=self.api_key,
+                base_url=self.base_url,
+                timeout=self.timeout,
+                http_client=http_client
+            )
+        return self._async_client
+    
+    async def achat(self, 
+                    messages: List[Dict[str, str]],
+                    temperature: Optional[float] = None,
+                    max_tokens: Optional[int] = None,
+                    stream: bool = False,
+                    debug: bool = False) -> str:
+        """
+        异步发送聊天请求（参数与 chat 相同，在事件循环上等待，不占用线程）
+        """
+        try:
+            start_time = time.time()
+            temp = temperature if temperature is not None else self.temperature
+            tokens = max_tokens if max_tokens is not None else self.max_tokens
+            
+            if debug:
+                self._print_request(messages, temp, tokens)
+            
+            response = await self._get_async_client().chat.completions.create(
+                model=self.model,
+                messages=messages,
+                temperature=temp,
+                max_tokens=tokens,
+                stream=stream,
+                top_p=0.95,
+                frequency_penalty=0.0,
+                presence_penalty=0.0
+            )
+            
+            if stream:
+                return "".join([text async for text in self._aiter_chunks(response)])
             else:
-                # 普通输出
-                content = response.choices[0].message.content
-                
-                # 统计信息
-                self.total_requests += 1
-                prompt_tokens = 0
-                completion_tokens = 0
-                total_tokens = 0
-                finish_reason = "unknown"
-                
-                if hasattr(response, 'usage'):
-                    prompt_tokens = response.usage.prompt_tokens
-                    completion_tokens = response.usage.completion_tokens
-                    total_tokens = response.usage.total_tokens
-                    self.total_tokens += total_tokens
-                    
-                    # Deepseek 价格（假设：$0.001/1K tokens）
-                    cost = (total_tokens / 1000) * 0.001
-                    self.total_cost += cost
-                
-                # 获取结束原因
-                if hasattr(response.choices[0], 'finish_reason'):
-                    finish_reason = response.choices[0].finish_reason
-                
-                # 计算耗时
-                elapsed_time = time.time() - start_time
-                
-                # 打印响应调试信息
-                if debug:
-                    print("📤 API 响应:")
-                    print(f"  耗时: {elapsed_time:.2f} 秒")
-                    print(f"  Tokens 使用: {prompt_tokens} (输入) + {completion_tokens} (输出) = {total_tokens}")
-                    print(f"  结束原因: {finish_reason}")
-                    if finish_reason == "length":
-                        print("  ⚠️  警告: 输出因达到 max_tokens 限制而截断！")
-                    print(f"\n📝 响应内容 (长度: {len(content)} 字符):")
-                    print(f"  {'-'*60}")
-                    print(f"  {content}")
-                    print("="*70 + "\n")
-                
-                return content
+                return self._finish(response, start_time, debug)
         
         except Exception as e:
             if debug:
                 print(f"\n❌ API 调用失败: {str(e)}\n")
             raise Exception(f"Deepseek API 调用失败: {str(e)}")
     
+    def _stream_params(self, messages, temperature, max_tokens) -> Dict[str, Any]:
+        return dict(
+            model=self.model,
+            messages=messages,
+            temperature=temperature if temperature is not None else self.temperature,
+            max_tokens=max_tokens if max_tokens is not None else self.max_tokens,
+            stream=True,
+            top_p=0.95,
+            frequency_penalty=0.0,
+            presence_penalty=0.0
+        )
+    
+    def _iter_chunks(self, response) -> Iterator[str]:
+        self.total_requests += 1
+        try:
+            for chunk in response:
+                if chunk.choices and chunk.choices[0].delta.content:
+                    yield chunk.choices[0].delta.content
+        finally:
+            # 消费方中途放弃（如建议已过期）时立即释放连接池中的连接
+            response.close()
+    
+    async def _aiter_chunks(self, response) -> AsyncIterator[str]:
+        self.total_requests += 1
+        try:
+            async for chunk in response:
+                if chunk.choices and chunk.choices[0].delta.content:
+                    yield chunk.choices[0].delta.content
+        finally:
+            await response.close()
+    
+    def chat_stream(self, 
+                    messages: List[Dict[str, str]],
+                    temperature: Optional[float] = None,
+                    max_tokens: Optional[int] = None,
+                    debug: bool = False) -> Iterator[str]:
+        """
+        流式聊天请求：逐段产出回复文本
+        
+        Raises:
+            Exception: API 调用失败
+        """
+        params = self._stream_params(messages, temperature, max_tokens)
+        if debug:
+            self._print_request(messages, params["temperature"], params["max_tokens"])
+        try:
+            response = self.client.chat.completions.create(**params)
+            yield from self._iter_chunks(response)
+        except Exception as e:
+            raise Exception(f"Deepseek API 调用失败: {str(e)}")
+    
+    async def achat_stream(self, 
+                           messages: List[Dict[str, str]],
+                           temperature: Optional[float] = None,
+                           max_tokens: Optional[int] = None,
+                           debug: bool = False) -> AsyncIterator[str]:
+        """chat_stream 的异步版本"""
+        params = self._stream_params(messages, temperature, max_tokens)
+        if debug:
+            self._print_request(messages, params["temperature"], params["max_tokens"])
+        try:
+            response = await self._get_async_client().chat.completions.create(**params)
+            async for text in self._aiter_chunks(response):
+                yield text
+        except Exception as e:
+            raise Exception(f"Deepseek API 调用失败: {str(e)}")
+    
     def chat_simple(self, 
                    user_message: str, 
                    system_message: Optional[str] = None) -> str:
@@ -0,0 +1,69 @@
+"""
+LLM HTTP 连接池
+每个 GameController / ReviewAnalyzer 都会创建自己的 SDK 客户端，而 SDK 客户端默认各自持有一个
+httpx 连接池，同一个 API 地址的 TLS 连接无法在用户之间复用。
+
+这里按 (provider, base_url) 维护进程内共享的 httpx 客户端:
+- 同步客户端（游戏线程中的 chat()）: 线程安全，整个进程共用
+- 异步客户端（事件循环中的 achat()）: httpx.AsyncClient 的连接绑定在创建它的事件循环上，
+  因此按事件循环分别维护；同一事件循环上的所有 achat() 共用一个连接池
+"""
+import asyncio
+import threading
+from typing import Dict, Tuple
+
+import httpx
+
+# 单个 API 地址的连接上限（并发中的 LLM 请求数）与保持空闲的连接数
+MAX_CONNECTIONS = 200
+MAX_KEEPALIVE_CONNECTIONS = 50
+KEEPALIVE_EXPIRY = 60.0
+# 默认超时（SDK 会按请求覆盖）
+DEFAULT_TIMEOUT = httpx.Timeout(120.0, connect=10.0)
+
+_lock = threading.Lock()
+_sync_clients: Dict[Tuple[str, str], httpx.Client] = {}
+_async_clients: Dict[Tuple[str, str], Tuple[asyncio.AbstractEventLoop, httpx.AsyncClient]] = {}
+
+
+def _limits() -> httpx.Limits:
+    return httpx.Limits(
+        max_connections=MAX_CONNECTIONS,
+        max_keepalive_connections=MAX_KEEPALIVE_CONNECTIONS,
+        keepalive_expiry=KEEPALIVE_EXPIRY,
+    )
+
+
+def get_http_client(provider: str, base_url: str) -> httpx.Client:
+    """获取 (provider, base_url) 共享的同步 httpx 客户端"""
+    key = (provider, base_url)
+    with _lock:
+        client = _sync_clients.get(key)
+        if client is None or client.is_closed:
+            client = httpx.Client(limits=_limits(), timeout=DEFAULT_TIMEOUT, follow_redirects=True)
+            _sync_clients[key] = client
+        return client
+
+
+def get_async_http_client(provider: str, base_url: str) -> httpx.AsyncClient:
+    """获取当前事件循环上 (provider, base_url) 共享的异步 httpx 客户端（需在事件循环中调用）"""
+    loop = asyncio.get_running_loop()
+    key = (provider, base_url)
+    with _lock:
+        entry = _async_clients.get(key)
+        if entry is not None and entry[0] is loop and not entry[1].is_closed:
+            return entry[1]
+        # 首次使用，或之前的事件循环已结束（如 asyncio.run 多次调用）
+        client = httpx.AsyncClient(limits=_limits(), timeout=DEFAULT_TIMEOUT, follow_redirects=True)
+        _async_clients[key] = (loop, client)
+        return client
+
+
+async def aclose_http_clients():
+    """关闭当前事件循环上的异步客户端（应用关闭时调用）"""
+    loop = asyncio.get_running_loop()
+    with _lock:
+        keys = [key for key, (owner, _) in _async_clients.items() if owner is loop]
+        clients = [_async_clients.pop(key)[1] for key in keys]
+    for client in clients:
+        await client.aclose()
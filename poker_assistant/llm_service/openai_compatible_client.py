@@ -1,12 +1,15 @@
 """
 OpenAI 兼容客户端基类
 Deepseek 和 OpenAI 都可以继承此类
+同步 / 异步 SDK 客户端共用 http_pool 中按 base_url 共享的 httpx 连接池
 """
-import time
 import os
-from typing import List, Dict, Any, Optional
-from openai import OpenAI
+from typing import List, Dict, Any, Optional, Iterator, AsyncIterator
+from openai import OpenAI, AsyncOpenAI
 from poker_assistant.llm_service.base_client import BaseLLMClient
+from poker_assistant.llm_service.http_pool import get_http_client, get_async_http_client
+
+POOL_PROVIDER = "openai"
 
 class OpenAICompatibleClient(BaseLLMClient):
     """基于 OpenAI SDK 的兼容客户端"""
@@ -22,13 +25,61 @@ class OpenAICompatibleClient(BaseLLMClient):
         self.base_url = base_url
         self.default_temperature = default_temperature
         self.default_max_tokens = default_max_tokens
+        self.timeout = timeout
         
         self.client = OpenAI(
             api_key=self.api_key,
             base_url=self.base_url,
-            timeout=timeout
+            timeout=timeout,
+            http_client=get_http_client(POOL_PROVIDER, self.base_url)
+        )
+        # 异步客户端在首次 achat() 时按事件循环创建
+        self._async_client: Optional[AsyncOpenAI] = None
+        self._async_http = None
+
+    def _request_params(self, messages, temperature, max_tokens, stream) -> Dict[str, Any]:
+        return dict(
+            model=self.model,
+            messages=messages,
+            temperature=temperature if temperature is not None else self.default_temperature,
+            max_tokens=max_tokens if max_tokens is not None else self.default_max_tokens,
+            stream=stream,
+            top_p=0.95,
+            frequency_penalty=0.0,
+            presence_penalty=0.0
         )
 
+    def _print_request(self, messages):
+        print("\n" + "="*60)
+        print(f"🔍 LLM Request (Model: {self.model})")
+        print("-" * 60)
+        for msg in messages:
+            role = msg.get('role', 'unknown').upper()
+            content = msg.get('content', '')
+            print(f"[{role}]:")
+            print(content)
+            print("-" * 40)
+        print("="*60 + "\n")
+
+    def _print_response(self, content, streamed=False):
+        print("\n" + "="*60)
+        print("📤 LLM Response (Streamed):" if streamed else "📤 LLM Response:")
+        print("-" * 60)
+        print(content)
+        print("="*60 + "\n")
+
+    def _finish(self, response, debug) -> str:
+        """非流式响应: 取出内容并更新统计"""
+        content = response.choices[0].message.content
+        if debug:
+            self._print_response(content)
+        
+        # Stats
+        self.total_requests += 1
+        if hasattr(response, 'usage'):
+            self.total_tokens += response.usage.total_tokens
+        return content
+
     def chat(self, 
              messages: List[Dict[str, str]],
              temperature: Optional[float] = None,
@@ -36,66 +87,113 @@ class OpenAICompatibleClient(BaseLLMClient):
              stream: bool = False,
              debug: bool = False) -> str:
         try:
-            start_time = time.time()
-            temp = temperature if temperature is not None else self.default_temperature
-            tokens = max_tokens if max_tokens is not None else self.default_max_tokens
-            
             if debug:
-                print("\n" + "="*60)
-                print(f"🔍 LLM Request (Model: {self.model})")
-                print("-" * 60)
-                for msg in messages:
-                    role = msg.get('role', 'unknown').upper()
-                    content = msg.get('content', '')
-                    print(f"[{role}]:")
-                    print(content)
-                    print("-" * 40)
-                print("="*60 + "\n")
+                self._print_request(messages)
             
             response = self.client.chat.completions.create(
-                model=self.model,
-                messages=messages,
-                temperature=temp,
-                max_tokens=tokens,
-                stream=stream,
-                top_p=0.95,
-                frequency_penalty=0.0,
-                presence_penalty=0.0
+                **self._request_params(messages, temperature, max_tokens, stream)
             )
             
             if stream:
-                content = ""
-                for chunk in response:
-                    if chunk.choices[0].delta.content:
-                        content += chunk.choices[0].delta.content
+                content = "".join(self._iter_chunks(response))
                 
                 if debug:
-                    print("\n" + "="*60)
-                    print("📤 LLM Response (Streamed):")
-                    print("-" * 60)
-                    print(content)
-                    print("="*60 + "\n")
+                    self._print_response(content, streamed=True)
                     
                 return content
             else:
-                content = response.choices[0].message.content
+                return self._finish(response, debug)
                 
-                if debug:
-                    print("\n" + "="*60)
-                    print("📤 LLM Response:")
-                    print("-" * 60)
-                    print(content)
-                    print("="*60 + "\n")
+        except Exception as e:
+            if debug:
+                print(f"API Error: {e}")
+            raise e
+
+    def _iter_chunks(self, response) -> Iterator[str]:
+        self.total_requests += 1
+        try:
+            for chunk in response:
+                if chunk.choices and chunk.choices[0].delta.content:
+                    yield chunk.choices[0].delta.content
+        finally:
+            # 消费方中途放弃（如建议已过期）时立即释放连接池中的连接
+            response.close()
+
+    def chat_stream(self,
+                    messages: List[Dict[str, str]],
+                    temperature: Optional[float] = None,
+                    max_tokens: Optional[int] = None,
+                    debug: bool = False) -> Iterator[str]:
+        """逐段产出回复文本"""
+        if debug:
+            self._print_request(messages)
+        response = self.client.chat.completions.create(
+            **self._request_params(messages, temperature, max_tokens, True)
+        )
+        yield from self._iter_chunks(response)
+
+    def _get_async_client(self) -> AsyncOpenAI:
+        """当前事件循环上的 AsyncOpenAI 客户端（共享连接池变化时重建）"""
+        http_client = get_async_http_client(POOL_PROVIDER, self.base_url)
+        if self._async_client is None or self._async_http is not http_client:
+            self._async_http = http_client
+            self._async_client = AsyncOpenAI(
+                api_key=self.api_key,
+                base_url=self.base_url,
+                timeout=self.timeout,
+                http_client=http_client
+            )
+        return self._async_client
+
+    async def achat(self, 
+                    messages: List[Dict[str, str]],
+                    temperature: Optional[float] = None,
+                    max_tokens: Optional[int] = None,
+                    stream: bool = False,
+                    debug: bool = False) -> str:
+        """原生异步请求（在事件循环上等待，不占用线程）"""
+        try:
+            if debug:
+                self._print_request(messages)
+            
+            response = await self._get_async_client().chat.completions.create(
+                **self._request_params(messages, temperature, max_tokens, stream)
+            )
+            
+            if stream:
+                content = "".join([text async for text in self._aiter_chunks(response)])
                 
-                # Stats
-                self.total_requests += 1
-                if hasattr(response, 'usage'):
-                    self.total_tokens += response.usage.total_tokens
+                if debug:
+                    self._print_response(content, streamed=True)
                     
                 return content
+            else:
+                return self._finish(response, debug)
                 
         except Exception as e:
             if debug:
                 print(f"API Error: {e}")
             raise e
 
+    async def _aiter_chunks(self, response) -> AsyncIterator[str]:
+        self.total_requests += 1
+        try:
+            async for chunk in response:
+                if chunk.choices and chunk.choices[0].delta.content:
+                    yield chunk.choices[0].delta.content
+        finally:
+            await response.close()
+
+    async def achat_stream(self,
+                           messages: List[Dict[str, str]],
+                           temperature: Optional[float] = None,
+                           max_tokens: Optional[int] = None,
+                           debug: bool = False) -> AsyncIterator[str]:
+        """异步逐段产出回复文本"""
+        if debug:
+            self._print_request(messages)
+        response = await self._get_async_client().chat.completions.create(
+            **self._request_params(messages, temperature, max_tokens, True)
+        )
+        async for text in self._aiter_chunks(response):
+            yield text
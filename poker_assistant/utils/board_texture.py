@@ -0,0 +1,217 @@
+"""
+牌面纹理查找表模块
+牌面纹理只取决于公共牌的点数多重集合与最多同花色张数，因此:
+
+- 顺子相关特征按 13 bit 点数位图预计算 (8192 项)
+- 全部 22,100 种翻牌按规范化键 (点数多重集合, 最多同花色张数) 预计算完整纹理
+- 转牌/河牌在翻牌状态上增量加入一张牌，结果按同样的规范化键记忆
+
+分析纹理从逐次解析字符串、统计 Counter、滑动窗口变为查表。
+"""
+import threading
+from itertools import combinations
+from typing import Any, Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+from poker_assistant.utils.card_codec import RANK_CHARS
+
+# 无公共牌时的纹理
+PREFLOP_TEXTURE: Dict[str, Any] = {
+    "texture": "unknown",
+    "texture_cn": "未知",
+    "paired": False,
+    "flush_possible": False,
+    "flush_draw": False,
+    "straight_possible": False,
+    "straight_draw": False,
+    "high_card": "None",
+    "connectedness": 0,
+    "description": "翻牌前，无公共牌"
+}
+
+
+class TextureState(NamedTuple):
+    """牌面的增量状态（每加入一张牌 O(1) 更新）"""
+    rank_counts: Tuple[int, ...]   # 13 个点数各自的张数
+    suit_counts: Tuple[int, ...]   # 4 个花色各自的张数
+
+    @classmethod
+    def empty(cls) -> "TextureState":
+        return cls((0,) * 13, (0,) * 4)
+
+    def add(self, card: int) -> "TextureState":
+        """加入一张牌（整数编码）"""
+        rank, suit = card >> 2, card & 3
+        rank_counts = self.rank_counts[:rank] + (self.rank_counts[rank] + 1,) + self.rank_counts[rank + 1:]
+        suit_counts = self.suit_counts[:suit] + (self.suit_counts[suit] + 1,) + self.suit_counts[suit + 1:]
+        return TextureState(rank_counts, suit_counts)
+
+    @property
+    def key(self) -> Tuple[Tuple[int, ...], int]:
+        """规范化键: (点数张数, 最多同花色张数)，花色同构的牌面共享同一个键"""
+        return self.rank_counts, max(self.suit_counts)
+
+    @property
+    def rank_mask(self) -> int:
+        return sum(1 << r for r, count in enumerate(self.rank_counts) if count)
+
+
+def _straight_features(rank_mask: int) -> Tuple[bool, bool, int]:
+    """点数位图 -> (顺子可能, 顺子听牌可能, 连接度)"""
+    unique_values = [r + 2 for r in range(13) if rank_mask >> r & 1]
+    straight_possible = False
+    straight_draw = False
+    connectedness = 0
+
+    if len(unique_values) >= 3:
+        # 3 张牌跨度 <= 4，可能有顺子
+        for i in range(len(unique_values) - 2):
+            gap = unique_values[i + 2] - unique_values[i]
+            if gap <= 4:
+                straight_possible = True
+                connectedness = max(connectedness, 5 - gap)
+
+    if len(unique_values) >= 2 and not straight_possible:
+        # 2 张牌跨度 <= 3，有顺子听牌
+        for i in range(len(unique_values) - 1):
+            gap = unique_values[i + 1] - unique_values[i]
+            if gap <= 3:
+                straight_draw = True
+                connectedness = max(connectedness, 4 - gap)
+
+    return straight_possible, straight_draw, connectedness
+
+
+def _build_texture(state: TextureState, straight_table: List[Tuple[bool, bool, int]]) -> Dict[str, Any]:
+    """由牌面状态生成纹理字典"""
+    paired = max(state.rank_counts) >= 2
+    max_suit_count = max(state.suit_counts)
+    flush_possible = max_suit_count >= 3
+    flush_draw = max_suit_count == 2
+    rank_mask = state.rank_mask
+    straight_possible, straight_draw, connectedness = straight_table[rank_mask]
+    high_card = RANK_CHARS[rank_mask.bit_length() - 1]
+
+    # 综合判断纹理
+    wetness_score = 0
+    if flush_possible:
+        wetness_score += 3
+    elif flush_draw:
+        wetness_score += 1
+    if straight_possible:
+        wetness_score += 3
+    elif straight_draw:
+        wetness_score += 1
+    if paired:
+        wetness_score -= 1  # 对子牌面稍微干燥
+
+    if wetness_score >= 4:
+        texture, texture_cn = "wet", "湿润"
+    elif wetness_score >= 2:
+        texture, texture_cn = "semi_wet", "半湿润"
+    else:
+        texture, texture_cn = "dry", "干燥"
+
+    desc_parts = [f"最高牌 {high_card}"]
+    if paired:
+        desc_parts.append("有对子")
+    if flush_possible:
+        desc_parts.append("同花已成或听牌危险")
+    elif flush_draw:
+        desc_parts.append("两张同色")
+    if straight_possible:
+        desc_parts.append("顺子可能")
+    elif straight_draw:
+        desc_parts.append("顺子听牌可能")
+
+    return {
+        "texture": texture,
+        "texture_cn": texture_cn,
+        "paired": paired,
+        "flush_possible": flush_possible,
+        "flush_draw": flush_draw,
+        "straight_possible": straight_possible,
+        "straight_draw": straight_draw,
+        "high_card": high_card,
+        "connectedness": connectedness,
+        "description": f"{texture_cn}牌面 - " + ", ".join(desc_parts)
+    }
+
+
+class _TextureTables:
+    """预计算的顺子特征表与翻牌纹理索引"""
+
+    def __init__(self):
+        self.straight_table = [_straight_features(mask) for mask in range(1 << 13)]
+
+        # 全部 22,100 种翻牌 -> 规范化键 -> 纹理
+        self.flop_states: Dict[Tuple[int, int, int], TextureState] = {}
+        self.textures: Dict[Tuple[Tuple[int, ...], int], Dict[str, Any]] = {}
+        empty = TextureState.empty()
+        for flop in combinations(range(52), 3):
+            state = empty.add(flop[0]).add(flop[1]).add(flop[2])
+            self.flop_states[flop] = state
+            if state.key not in self.textures:
+                self.textures[state.key] = _build_texture(state, self.straight_table)
+        self.num_flop_entries = len(self.textures)
+        self._lock = threading.Lock()
+
+    def texture_for(self, state: TextureState) -> Dict[str, Any]:
+        """按规范化键查表，转牌/河牌首次出现时计算并记忆"""
+        texture = self.textures.get(state.key)
+        if texture is None:
+            texture = _build_texture(state, self.straight_table)
+            with self._lock:
+                self.textures[state.key] = texture
+        return texture
+
+
+_tables: Optional[_TextureTables] = None
+_tables_lock = threading.Lock()
+
+
+def get_texture_tables() -> _TextureTables:
+    """获取纹理查找表（首次调用时构建）"""
+    global _tables
+    if _tables is None:
+        with _tables_lock:
+            if _tables is None:
+                _tables = _TextureTables()
+    return _tables
+
+
+def board_state(cards: Sequence[int]) -> TextureState:
+    """
+    公共牌 -> 牌面状态
+
+    翻牌直接取预计算状态，转牌/河牌在翻牌状态上增量加入。
+    """
+    tables = get_texture_tables()
+    if len(cards) < 3:
+        state = TextureState.empty()
+        for card in cards:
+            state = state.add(card)
+        return state
+    state = tables.flop_states[tuple(sorted(cards[:3]))]
+    for card in cards[3:]:
+        state = state.add(card)
+    return state
+
+
+def board_texture(cards: Sequence[int]) -> Dict[str, Any]:
+    """
+    公共牌（整数编码）-> 纹理字典（返回副本，调用方可自由修改）
+    """
+    if not cards:
+        return dict(PREFLOP_TEXTURE)
+    return dict(get_texture_tables().texture_for(board_state(cards)))
+
+
+def extend_texture(state: TextureState, card: int) -> Tuple[TextureState, Dict[str, Any]]:
+    """
+    在已有牌面状态上加入一张转牌/河牌
+
+    Returns:
+        (新状态, 新纹理字典)
+    """
+    new_state = state.add(card)
+    return new_state, dict(get_texture_tables().texture_for(new_state))
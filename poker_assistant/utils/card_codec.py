@@ -0,0 +1,102 @@
+"""
+扑克牌编解码模块
+整个引擎统一使用 0-51 的小整数表示扑克牌，字符串只在边界（PyPokerEngine 消息、显示）上转换一次。
+
+牌的整数编码: card = rank_index * 4 + suit_index
+    rank_index: 0-12 对应 2, 3, ..., K, A
+    suit_index: 0-3  对应 S(黑桃), H(红心), D(方片), C(梅花)
+
+所有转换均通过预计算的 52 项查找表完成:
+    整数 <-> PyPokerEngine 字符串 ('SA') <-> treys 整数 <-> 显示字符串 ('A♠')
+"""
+from typing import Dict, List, Sequence
+
+from treys import Card as TreysCard
+
+# 点数与花色字符（与 PyPokerEngine / treys 的字符一致）
+RANK_CHARS = "23456789TJQKA"
+SUIT_CHARS = "SHDC"
+
+# 显示用花色符号与点数名称
+SUIT_SYMBOLS = "♠♥♦♣"
+RANK_DISPLAY = ["2", "3", "4", "5", "6", "7", "8", "9", "10", "J", "Q", "K", "A"]
+
+# PyPokerEngine Card 对象的花色编号: 2=Spade, 4=Heart, 8=Diamond, 16=Club
+_PPE_SUIT_INDEX = {2: 0, 4: 1, 8: 2, 16: 3}
+
+# 52 项查找表（下标为整数编码）
+CARD_STRINGS: List[str] = [SUIT_CHARS[c & 3] + RANK_CHARS[c >> 2] for c in range(52)]
+TREYS_INTS: List[int] = [TreysCard.new(RANK_CHARS[c >> 2] + SUIT_CHARS[c & 3].lower()) for c in range(52)]
+DISPLAY_STRINGS: List[str] = [RANK_DISPLAY[c >> 2] + SUIT_SYMBOLS[c & 3] for c in range(52)]
+
+# 字符串 -> 整数（同时收录 PyPokerEngine 格式 'SA' 与 treys 格式 'As'，大小写均可）
+_STRING_TO_INT: Dict[str, int] = {}
+for _card in range(52):
+    _rank, _suit = RANK_CHARS[_card >> 2], SUIT_CHARS[_card & 3]
+    for _text in (_suit + _rank, _rank + _suit, _rank + _suit.lower(), _suit.lower() + _rank):
+        _STRING_TO_INT[_text] = _card
+
+# 显示字符串 -> 整数 ('A♠', '10♥')
+_DISPLAY_TO_INT: Dict[str, int] = {text: card for card, text in enumerate(DISPLAY_STRINGS)}
+
+
+def parse_card(card: str) -> int:
+    """
+    将字符串格式的牌解析为整数编码
+
+    同时支持 PyPokerEngine 格式 ('SA', 'H8') 和 treys 格式 ('As', '8h')。
+
+    Raises:
+        KeyError: 无法识别的牌
+    """
+    return _STRING_TO_INT[card]
+
+
+def parse_cards(cards: Sequence[str]) -> List[int]:
+    """将多张牌解析为整数编码"""
+    return [_STRING_TO_INT[c] for c in cards]
+
+
+def to_str(card: int) -> str:
+    """整数编码 -> PyPokerEngine 字符串 ('SA')"""
+    return CARD_STRINGS[card]
+
+
+def to_treys(card: int) -> int:
+    """整数编码 -> treys 整数"""
+    return TREYS_INTS[card]
+
+
+def to_treys_list(cards: Sequence[int]) -> List[int]:
+    """多张牌: 整数编码 -> treys 整数"""
+    return [TREYS_INTS[c] for c in cards]
+
+
+def from_ppe_card(card) -> int:
+    """PyPokerEngine Card 对象 (suit=2/4/8/16, rank=2-14) -> 整数编码"""
+    return (card.rank - 2) * 4 + _PPE_SUIT_INDEX[card.suit]
+
+
+def display(card: int) -> str:
+    """整数编码 -> 显示字符串 ('A♠')"""
+    return DISPLAY_STRINGS[card]
+
+
+def parse_display(text: str) -> int:
+    """
+    显示字符串 -> 整数编码 ('A♠', '10♥')
+
+    Raises:
+        KeyError: 无法识别的牌
+    """
+    return _DISPLAY_TO_INT[text]
+
+
+def rank_of(card: int) -> int:
+    """点数下标 (0-12 对应 2-A)"""
+    return card >> 2
+
+
+def suit_of(card: int) -> int:
+    """花色下标 (0-3 对应 S/H/D/C)"""
+    return card & 3
@@ -4,20 +4,7 @@
 """
 from typing import List, Tuple
 
-
-# 花色映射
-SUIT_SYMBOLS = {
-    'S': '♠',  # Spades
-    'H': '♥',  # Hearts
-    'D': '♦',  # Diamonds
-    'C': '♣',  # Clubs
-}
-
-# 牌面映射
-RANK_NAMES = {
-    '2': '2', '3': '3', '4': '4', '5': '5', '6': '6', '7': '7', '8': '8', '9': '9',
-    'T': '10', 'J': 'J', 'Q': 'Q', 'K': 'K', 'A': 'A'
-}
+from poker_assistant.utils import card_codec
 
 
 def format_card(card: str) -> str:
@@ -30,16 +17,10 @@ def format_card(card: str) -> str:
     Returns:
         格式化后的字符串，如 'A♠', '2♥'
     """
-    if not card or len(card) != 2:
+    try:
+        return card_codec.display(card_codec.parse_card(card))
+    except (KeyError, TypeError):
         return card
-    
-    suit = card[0]  # 花色
-    rank = card[1]  # 点数
-    
-    suit_symbol = SUIT_SYMBOLS.get(suit, suit)
-    rank_name = RANK_NAMES.get(rank, rank)
-    
-    return f"{rank_name}{suit_symbol}"
 
 
 def format_cards(cards: List[str]) -> str:
@@ -67,25 +48,10 @@ def parse_card(formatted_card: str) -> str:
     Returns:
         原始格式，如 'SA'
     """
-    # 反向映射
-    reverse_suits = {v: k for k, v in SUIT_SYMBOLS.items()}
-    reverse_ranks = {v: k for k, v in RANK_NAMES.items()}
-    
-    # 提取点数和花色
-    if len(formatted_card) >= 2:
-        if len(formatted_card) == 3:  # 如 '10♠'
-            rank = formatted_card[:2]
-            suit = formatted_card[2]
-        else:  # 如 'A♠'
-            rank = formatted_card[0]
-            suit = formatted_card[1]
-        
-        original_rank = reverse_ranks.get(rank, rank[0] if rank == '10' else rank)
-        original_suit = reverse_suits.get(suit, suit)
-        
-        return f"{original_suit}{original_rank}"
-    
-    return formatted_card
+    try:
+        return card_codec.to_str(card_codec.parse_display(formatted_card))
+    except KeyError:
+        return formatted_card
 
 
 def get_card_color(card: str) -> str:
@@ -117,14 +83,11 @@ def sort_cards(cards: List[str]) -> List[str]:
     Returns:
         排序后的牌列表（按点数从大到小）
     """
-    rank_order = {'A': 14, 'K': 13, 'Q': 12, 'J': 11, 'T': 10, 
-                  '9': 9, '8': 8, '7': 7, '6': 6, '5': 5, '4': 4, '3': 3, '2': 2}
-    
     def card_key(card: str) -> int:
-        if len(card) >= 2:
-            rank = card[1]
-            return rank_order.get(rank, 0)
-        return 0
+        try:
+            return card_codec.parse_card(card) >> 2
+        except KeyError:
+            return -1
     
     return sorted(cards, key=card_key, reverse=True)
 
@@ -64,6 +64,14 @@ class Config:
         self.AI_ENABLE_BOARD_ANALYSIS = os.getenv("AI_ENABLE_BOARD_ANALYSIS", "true").lower() == "true"
         self.AI_ENABLE_REVIEW = os.getenv("AI_ENABLE_REVIEW", "true").lower() == "true"
         self.AI_ENABLE_CHAT = os.getenv("AI_ENABLE_CHAT", "true").lower() == "true"
+        self.AI_COPILOT_PRECOMPUTE = os.getenv("AI_COPILOT_PRECOMPUTE", "true").lower() == "true"
+        
+        # 胜率计算配置: 进程池大小，0 表示在游戏线程中同步计算
+        self.EQUITY_POOL_SIZE = int(os.getenv("EQUITY_POOL_SIZE", "0"))
+        
+        # WebSocket 出站配置: 每个连接的发送缓冲区上限（条）和消息合并窗口（毫秒，0 表示不等待）
+        self.WS_SEND_BUFFER_SIZE = int(os.getenv("WS_SEND_BUFFER_SIZE", "256"))
+        self.WS_BATCH_WINDOW_MS = float(os.getenv("WS_BATCH_WINDOW_MS", "5"))
         
         # LLM 配置
         self.LLM_MODEL = os.getenv("LLM_MODEL", "deepseek-chat")
@@ -71,6 +79,10 @@ class Config:
         self.LLM_MAX_TOKENS = int(os.getenv("LLM_MAX_TOKENS", "2000"))
         self.LLM_TIMEOUT = int(os.getenv("LLM_TIMEOUT", "30"))
         
+        # 机器人决策配置: 单次决策的 LLM 时间预算（毫秒，0 表示不限制）和超时回答记录文件
+        self.BOT_DECISION_BUDGET_MS = float(os.getenv("BOT_DECISION_BUDGET_MS", "1500"))
+        self.BOT_LATE_ANSWER_LOG = os.getenv("BOT_LATE_ANSWER_LOG", "logs/bot_late_answers.jsonl")
+        
         # 调试配置
         self.DEBUG = os.getenv("DEBUG", "false").lower() == "true"
         self.LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
@@ -0,0 +1,117 @@
+"""
+胜率缓存模块
+进程内共享、线程安全、容量有限的 LRU 缓存，位于 PokerMath.calculate_equity 之前。
+
+相同的局面（手牌、公共牌、对手数）在不同机器人、不同街道和不同用户之间反复出现。
+花色互换不改变胜率，因此缓存键先做花色规范化：
+例如 AhKh / Qs7s2d 与 AsKs / Qh7h2d 共享同一个缓存条目。
+"""
+import threading
+from collections import OrderedDict
+from itertools import permutations
+from typing import Any, Callable, Dict, Hashable, Sequence, Tuple
+
+DEFAULT_MAX_SIZE = 50000
+
+# 全部 24 种花色置换（整数编码中花色为 card & 3）
+_SUIT_PERMUTATIONS = list(permutations(range(4)))
+
+
+def canonical_key(hole: Sequence[int], board: Sequence[int], num_opponents: int = 1) -> Tuple:
+    """
+    计算局面的花色规范化键
+
+    对 24 种花色置换分别映射手牌和公共牌（各自排序），取字典序最小者。
+    手牌与公共牌分开排序，因为两者在胜率计算中不可互换。
+
+    Args:
+        hole: 手牌（整数编码）
+        board: 公共牌（整数编码）
+        num_opponents: 对手数量
+
+    Returns:
+        可哈希的规范化键
+    """
+    best = None
+    for perm in _SUIT_PERMUTATIONS:
+        mapped = (
+            tuple(sorted((c & ~3) | perm[c & 3] for c in hole)),
+            tuple(sorted((c & ~3) | perm[c & 3] for c in board)),
+        )
+        if best is None or mapped < best:
+            best = mapped
+    return best + (num_opponents,)
+
+
+class EquityCache:
+    """线程安全的 LRU 缓存，带命中/未命中计数"""
+
+    def __init__(self, max_size: int = DEFAULT_MAX_SIZE):
+        self.max_size = max_size
+        self._entries: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get_or_compute(self, key: Hashable, compute: Callable[[], Any]) -> Any:
+        """
+        命中则返回缓存值，否则调用 compute() 计算并写入
+
+        compute 在锁外执行，并发的相同未命中可能重复计算，但不会阻塞其他查询。
+        """
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key]
+            self.misses += 1
+
+        value = compute()
+
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+        return value
+
+    def peek(self, key: Hashable) -> Any:
+        """查询缓存（命中时计入命中数），未命中返回 None 且不计数"""
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key]
+        return None
+
+    def put(self, key: Hashable, value: Any):
+        """写入缓存（计为一次未命中后的计算结果）"""
+        with self._lock:
+            self.misses += 1
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        """清空缓存与计数"""
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def get_stats(self) -> Dict[str, Any]:
+        """获取统计信息"""
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / total if total else 0.0,
+            }
+
+
+# 进程内共享实例
+equity_cache = EquityCache()
@@ -0,0 +1,565 @@
+"""
+向量化胜率引擎 (NumPy)
+将扑克牌编码为 0-51 的小整数，批量抽取公共牌和对手手牌，
+并通过预计算的查找表一次性评估成千上万手牌。
+
+牌的整数编码见 card_codec: card = rank_index * 4 + suit_index
+
+评估使用 hand_evaluator 的完美哈希表，结果与 treys 完全一致（1 为皇家同花顺，7462 为最弱高牌，数值越小越强）。
+"""
+import threading
+import time
+from typing import NamedTuple, Optional, Sequence
+
+import numpy as np
+
+from poker_assistant.utils import hand_evaluator
+
+# 单批次最大模拟次数（控制内存占用）
+BATCH_SIZE = 4096
+
+# 95% 置信区间的 z 值
+Z_95 = 1.96
+
+# 每个点数在 key 中的权重 (5 进制，每个点数最多 4 张)
+_RANK_WEIGHTS = 5 ** np.arange(13, dtype=np.int64)
+
+
+class _EvalTables:
+    """
+    批量枚举使用的查找表（由 hand_evaluator 的完美哈希表导出）
+
+    - rank_keys / rank_values: 按点数多重集合 (5-7 张，不含同花) 的最佳牌力，
+      key 为各点数张数的 5 进制编码（可相加），已排序以便 searchsorted
+    - flush_values: 按同花花色内的点数位图 (13 bit) 的最佳同花牌力
+    """
+
+    def __init__(self):
+        hand_tables = hand_evaluator.get_hand_tables()
+        self.rank_keys, self.rank_values = hand_tables.additive_rank_table()
+        self.flush_values = hand_tables.flush_table.astype(np.int32)
+
+
+_tables: Optional[_EvalTables] = None
+_tables_lock = threading.Lock()
+
+
+def get_tables() -> _EvalTables:
+    """获取查找表（首次调用时构建，进程内共享）"""
+    global _tables
+    if _tables is None:
+        with _tables_lock:
+            if _tables is None:
+                _tables = _EvalTables()
+    return _tables
+
+
+def evaluate_batch(cards: np.ndarray) -> np.ndarray:
+    """
+    批量评估手牌（见 hand_evaluator.evaluate_batch）
+
+    Args:
+        cards: 形状为 (N, k) 的整数牌数组，k 为 5-7
+
+    Returns:
+        形状为 (N,) 的牌力数组（与 treys 一致，数值越小越强）
+    """
+    return hand_evaluator.evaluate_batch(cards)
+
+
+def _draw(rng: np.random.Generator, deck: np.ndarray, rows: int, count: int) -> np.ndarray:
+    """
+    从同一副剩余牌中为每行不放回地抽取 count 张（顺序随机）
+
+    Returns:
+        形状为 (rows, count) 的整数牌数组
+    """
+    keys = rng.random((rows, deck.size))
+    picked = np.argpartition(keys, count - 1, axis=1)[:, :count]
+    # argpartition 的输出顺序不保证随机，按随机 key 排序以得到均匀的有序样本
+    order = np.take_along_axis(keys, picked, axis=1).argsort(axis=1)
+    return deck[np.take_along_axis(picked, order, axis=1)]
+
+
+def _hand_scores(boards: np.ndarray, hands: np.ndarray) -> np.ndarray:
+    """
+    逐行计算同一牌面上多手底牌的牌力
+
+    每行的 5 张公共牌 key 只算一次，各手底牌只需加上自身两张牌的 key，
+    因此增加对手时的边际成本远低于完整评估一手 7 张牌。
+
+    Args:
+        boards: 形状为 (R, 5) 的公共牌数组
+        hands: 形状为 (R, H, 2) 的底牌数组
+
+    Returns:
+        形状为 (R, H) 的牌力数组
+    """
+    tables = get_tables()
+    board_ranks, board_suits = boards >> 2, boards & 3
+    hand_ranks, hand_suits = hands >> 2, hands & 3
+
+    keys = _RANK_WEIGHTS[board_ranks].sum(axis=1)[:, None] + _RANK_WEIGHTS[hand_ranks].sum(axis=2)
+    scores = tables.rank_values[np.searchsorted(tables.rank_keys, keys)]
+
+    for suit in range(4):
+        board_in_suit = board_suits == suit
+        board_count = board_in_suit.sum(axis=1)
+        # 公共牌至少 3 张同花色才可能成同花
+        candidate_rows = np.nonzero(board_count >= 3)[0]
+        if not candidate_rows.size:
+            continue
+        hand_in_suit = hand_suits[candidate_rows] == suit
+        flush = (board_count[candidate_rows, None] + hand_in_suit.sum(axis=2)) >= 5
+        if not flush.any():
+            continue
+        board_mask = np.where(board_in_suit[candidate_rows], 1 << board_ranks[candidate_rows], 0).sum(axis=1)
+        hand_mask = np.where(hand_in_suit, 1 << hand_ranks[candidate_rows], 0).sum(axis=2)
+        rows, cols = np.nonzero(flush)
+        target_rows = candidate_rows[rows]
+        scores[target_rows, cols] = np.minimum(
+            scores[target_rows, cols], tables.flush_values[board_mask[rows] | hand_mask[rows, cols]])
+
+    return scores
+
+
+def monte_carlo_equity(
+    hero: Sequence[int],
+    board: Sequence[int],
+    iterations: int,
+    num_opponents: int = 1,
+    seed: Optional[int] = None
+) -> float:
+    """
+    向量化 Monte Carlo 胜率计算（对抗 num_opponents 名随机手牌对手）
+
+    每批次一次性抽出所有试验的补牌和全部对手手牌，Hero 与所有对手在同一次
+    向量化计算中完成评估。
+
+    Args:
+        hero: Hero 手牌（整数编码）
+        board: 已知公共牌（整数编码，0-5 张）
+        iterations: 模拟次数
+        num_opponents: 对手数量
+        seed: 随机种子（用于复现）
+
+    Returns:
+        胜率 (0.0 - 1.0)，与 k 名对手平分底池时计为 1/(k+1)
+    """
+    if iterations <= 0 or num_opponents <= 0:
+        return 0.0
+
+    rng = np.random.default_rng(seed)
+    hero = np.asarray(hero, dtype=np.int64)
+    board = np.asarray(board, dtype=np.int64)
+    deck = _remaining_deck(hero.tolist() + board.tolist())
+    if 5 - board.size + 2 * num_opponents > deck.size:
+        raise ValueError(f"剩余牌不足以发给 {num_opponents} 名对手")
+
+    wins = 0.0
+    done = 0
+    while done < iterations:
+        rows = min(BATCH_SIZE, iterations - done)
+        wins += float(_simulate_shares(rng, hero, board, deck, rows, num_opponents).sum())
+        done += rows
+
+    return float(wins / iterations)
+
+
+def _simulate_shares(rng: np.random.Generator, hero: np.ndarray, board: np.ndarray,
+                     deck: np.ndarray, rows: int, num_opponents: int) -> np.ndarray:
+    """
+    模拟一批试验，返回每次试验中 Hero 赢得的底池份额 (rows,)
+
+    赢为 1，输为 0，与 k 名对手平分为 1/(k+1)。
+    """
+    cards_to_draw_board = 5 - board.size
+    drawn = _draw(rng, deck, rows, cards_to_draw_board + 2 * num_opponents)
+    sim_board = np.concatenate([np.broadcast_to(board, (rows, board.size)),
+                                drawn[:, :cards_to_draw_board]], axis=1)
+
+    # 第 0 列为 Hero，其余为各对手: (rows, 1 + num_opponents, 2)
+    hands = np.concatenate([
+        np.broadcast_to(hero, (rows, 1, 2)),
+        drawn[:, cards_to_draw_board:].reshape(rows, num_opponents, 2)
+    ], axis=1)
+    scores = _hand_scores(sim_board, hands)
+    hero_scores, villain_scores = scores[:, 0], scores[:, 1:]
+
+    best_villain = villain_scores.min(axis=1)
+    shares = (hero_scores < best_villain).astype(np.float64)
+    tied = hero_scores == best_villain
+    if tied.any():
+        tie_counts = (villain_scores[tied] == hero_scores[tied, None]).sum(axis=1)
+        shares[tied] = 1.0 / (tie_counts + 1)
+    return shares
+
+
+class EquityEstimate(NamedTuple):
+    """带置信区间的胜率估计"""
+    equity: float
+    std_error: float
+    trials: int
+    exact: bool = False
+
+    @property
+    def margin(self) -> float:
+        """95% 置信区间半宽"""
+        return Z_95 * self.std_error
+
+    @property
+    def ci_low(self) -> float:
+        return max(0.0, self.equity - self.margin)
+
+    @property
+    def ci_high(self) -> float:
+        return min(1.0, self.equity + self.margin)
+
+
+def adaptive_equity(
+    hero: Sequence[int],
+    board: Sequence[int],
+    num_opponents: int = 1,
+    target_std_error: float = 0.01,
+    time_budget_ms: float = 50.0,
+    min_trials: int = 50,
+    max_trials: int = 50000,
+    seed: Optional[int] = None
+) -> EquityEstimate:
+    """
+    自适应精度的 Monte Carlo 胜率计算
+
+    按逐步增大的批次模拟，直到标准误低于 target_std_error、用完时间预算或达到
+    max_trials。胜负悬殊的局面方差小，几十次试验即可停止；接近五五开的局面
+    会继续模拟到数千次。
+
+    标准误按加入一次虚拟输、一次虚拟赢的样本计算，避免前几批全赢/全输时
+    方差为 0 而过早停止。
+
+    Args:
+        hero: Hero 手牌（整数编码）
+        board: 已知公共牌（整数编码，0-5 张）
+        num_opponents: 对手数量
+        target_std_error: 目标标准误（0.01 约对应 95% 置信区间 ±2%）
+        time_budget_ms: 时间预算（毫秒），至少完成第一批
+        min_trials: 最少试验次数
+        max_trials: 最多试验次数
+        seed: 随机种子（用于复现）
+
+    Returns:
+        EquityEstimate(equity, std_error, trials)
+    """
+    if num_opponents <= 0:
+        return EquityEstimate(0.0, 0.0, 0)
+
+    get_tables()  # 首次构建查找表不计入时间预算
+    deadline = time.perf_counter() + time_budget_ms / 1000.0
+    rng = np.random.default_rng(seed)
+    hero = np.asarray(hero, dtype=np.int64)
+    board = np.asarray(board, dtype=np.int64)
+    deck = _remaining_deck(hero.tolist() + board.tolist())
+    if 5 - board.size + 2 * num_opponents > deck.size:
+        raise ValueError(f"剩余牌不足以发给 {num_opponents} 名对手")
+
+    total = 0.0
+    total_sq = 0.0
+    trials = 0
+    # 至少模拟一次，标准误需要 trials > 0
+    max_trials = max(1, max_trials)
+    rows = max(1, min_trials)
+    while True:
+        rows = min(rows, BATCH_SIZE, max_trials - trials)
+        shares = _simulate_shares(rng, hero, board, deck, rows, num_opponents)
+        total += float(shares.sum())
+        total_sq += float(np.square(shares).sum())
+        trials += rows
+
+        # 含一次虚拟输 (0) 和一次虚拟赢 (1) 的样本方差
+        n = trials + 2
+        mean = (total + 1.0) / n
+        variance = max((total_sq + 1.0) / n - mean * mean, 0.0) * n / (n - 1)
+        std_error = float(np.sqrt(variance / trials))
+
+        if std_error <= target_std_error or trials >= max_trials or time.perf_counter() >= deadline:
+            return EquityEstimate(float(total / trials), std_error, trials)
+        rows = trials  # 批次逐次翻倍
+
+
+def _remaining_deck(known: Sequence[int]) -> np.ndarray:
+    """去掉已知牌后的剩余牌（升序）"""
+    known = set(int(c) for c in known)
+    return np.array([c for c in range(52) if c not in known], dtype=np.int64)
+
+
+def _pairs(size: int) -> np.ndarray:
+    """0..size-1 中所有两两组合的下标，形状 (C(size, 2), 2)"""
+    first, second = np.triu_indices(size, k=1)
+    return np.stack([first, second], axis=1)
+
+
+def board_combo_scores(boards: np.ndarray, combos: np.ndarray) -> np.ndarray:
+    """
+    计算每个公共牌面上每个两张牌组合的牌力（逐牌面的牌力数组）
+
+    利用 key 的可加性: 牌面 key 与组合 key 分别只算一次，再通过广播相加，
+    避免为 B×C 个 7 张手牌逐行求和。与牌面冲突的组合结果无意义，由调用方过滤。
+
+    Args:
+        boards: 形状为 (B, k) 的公共牌数组，k 为 3-5
+        combos: 形状为 (C, 2) 的手牌组合数组
+
+    Returns:
+        形状为 (B, C) 的牌力数组
+    """
+    tables = get_tables()
+    board_ranks, board_suits = boards >> 2, boards & 3
+    combo_ranks, combo_suits = combos >> 2, combos & 3
+
+    keys = _RANK_WEIGHTS[board_ranks].sum(axis=1)[:, None] + _RANK_WEIGHTS[combo_ranks].sum(axis=1)[None, :]
+    index = np.minimum(np.searchsorted(tables.rank_keys, keys), tables.rank_keys.size - 1)
+    scores = tables.rank_values[index]
+
+    for suit in range(4):
+        board_in_suit = board_suits == suit
+        board_count = board_in_suit.sum(axis=1)
+        if board_count.max() + 2 < 5:
+            continue
+        combo_in_suit = combo_suits == suit
+        flush = (board_count[:, None] + combo_in_suit.sum(axis=1)[None, :]) >= 5
+        if not flush.any():
+            continue
+        board_mask = np.where(board_in_suit, 1 << board_ranks, 0).sum(axis=1)
+        combo_mask = np.where(combo_in_suit, 1 << combo_ranks, 0).sum(axis=1)
+        rows, cols = np.nonzero(flush)
+        scores[rows, cols] = np.minimum(
+            scores[rows, cols], tables.flush_values[board_mask[rows] | combo_mask[cols]])
+
+    return scores
+
+
+# 全部 1326 种两张牌组合 (i < j)，下标即范围权重向量的下标
+ALL_COMBOS = _pairs(52)
+
+
+# 牌型等级 (1=同花顺 ... 9=高牌) 的牌力上界
+_CLASS_BOUNDS = np.array(hand_evaluator.CLASS_BOUNDS)
+
+
+def rank_classes(scores: np.ndarray) -> np.ndarray:
+    """批量将牌力转换为牌型等级 (1=同花顺 ... 9=高牌)"""
+    return np.searchsorted(_CLASS_BOUNDS, scores) + 1
+
+
+def next_card_scores(hero: Sequence[int], board: Sequence[int]):
+    """
+    一次性枚举所有未见的下一张牌，评估 Hero 的牌力
+
+    Args:
+        hero: Hero 手牌（整数编码）
+        board: 公共牌（整数编码，3-4 张）
+
+    Returns:
+        (unseen, scores): 未见牌 (U,) 与加入该牌后 Hero 的牌力 (U,)
+    """
+    known = np.asarray(list(hero) + list(board), dtype=np.int64)
+    unseen = _remaining_deck(known.tolist())
+    cards = np.concatenate([np.broadcast_to(known, (unseen.size, known.size)), unseen[:, None]], axis=1)
+    return unseen, evaluate_batch(cards)
+
+
+def runout_scores(hero: Sequence[int], board: Sequence[int]):
+    """
+    一次性枚举翻牌后所有转牌+河牌组合，评估 Hero 的最终牌力
+
+    Args:
+        hero: Hero 手牌（整数编码）
+        board: 翻牌（整数编码，3 张）
+
+    Returns:
+        (runouts, scores): 转牌河牌组合 (P, 2) 与 Hero 的最终牌力 (P,)
+    """
+    known = np.asarray(list(hero) + list(board), dtype=np.int64)
+    unseen = _remaining_deck(known.tolist())
+    runouts = unseen[_pairs(unseen.size)]
+    cards = np.concatenate([np.broadcast_to(known, (runouts.shape[0], known.size)), runouts], axis=1)
+    return runouts, evaluate_batch(cards)
+
+
+def exact_equity(hero: Sequence[int], board: Sequence[int]) -> float:
+    """
+    穷举计算胜率（对抗 1 名随机手牌对手），仅适用于转牌和河牌
+
+    - 河牌: 枚举对手全部 C(45,2)=990 种手牌
+    - 转牌: 枚举 46 张河牌 × C(45,2) 种对手手牌
+
+    每个完整公共牌面生成一个对手手牌牌力数组，一次性批量评估，结果精确且可复现。
+
+    Args:
+        hero: Hero 手牌（整数编码）
+        board: 已知公共牌（整数编码，4 或 5 张）
+
+    Returns:
+        胜率 (0.0 - 1.0)，平局计为 0.5
+    """
+    board = [int(c) for c in board]
+    if len(board) not in (4, 5):
+        raise ValueError("exact_equity 仅支持转牌 (4 张) 或河牌 (5 张) 公共牌")
+
+    hero = np.asarray(hero, dtype=np.int64)
+    deck = _remaining_deck(hero.tolist() + board)
+    combos = deck[_pairs(deck.size)]
+
+    if len(board) == 5:
+        boards = np.asarray(board, dtype=np.int64)[None, :]
+        valid = np.ones((1, combos.shape[0]), dtype=bool)
+    else:
+        # 46 个完整牌面；对手组合不能包含该牌面的河牌
+        rivers = deck
+        boards = np.concatenate([
+            np.broadcast_to(np.asarray(board, dtype=np.int64), (rivers.size, 4)),
+            rivers[:, None]
+        ], axis=1)
+        valid = (combos[None, :, 0] != rivers[:, None]) & (combos[None, :, 1] != rivers[:, None])
+
+    hero_scores = board_combo_scores(boards, hero[None, :])
+    villain_scores = board_combo_scores(boards, combos)
+
+    wins = np.count_nonzero((hero_scores < villain_scores) & valid)
+    ties = np.count_nonzero((hero_scores == villain_scores) & valid)
+    return float((wins + 0.5 * ties) / np.count_nonzero(valid))
+
+
+def _blocked_combos(cards: Sequence[int]) -> np.ndarray:
+    """与给定牌冲突（包含其中任意一张）的组合掩码，形状 (1326,)"""
+    dead = np.zeros(52, dtype=bool)
+    dead[np.asarray(list(cards), dtype=np.int64)] = True
+    return dead[ALL_COMBOS].any(axis=1)
+
+
+def exact_range_equity(hero: Sequence[int], board: Sequence[int], weights: np.ndarray) -> float:
+    """
+    穷举计算 Hero 对抗加权范围的胜率，仅适用于转牌和河牌
+
+    Args:
+        hero: Hero 手牌（整数编码）
+        board: 已知公共牌（整数编码，4 或 5 张）
+        weights: 对手范围权重，形状 (1326,)
+
+    Returns:
+        胜率 (0.0 - 1.0)，平局计为 0.5
+
+    Raises:
+        ValueError: 去除已知牌后范围为空
+    """
+    board = [int(c) for c in board]
+    if len(board) not in (4, 5):
+        raise ValueError("exact_range_equity 仅支持转牌 (4 张) 或河牌 (5 张) 公共牌")
+
+    hero = np.asarray(hero, dtype=np.int64)
+    live = np.where(_blocked_combos(hero.tolist() + board), 0.0, np.asarray(weights, dtype=np.float64))
+
+    if len(board) == 5:
+        boards = np.asarray(board, dtype=np.int64)[None, :]
+        combo_weights = live[None, :]
+    else:
+        rivers = _remaining_deck(hero.tolist() + board)
+        boards = np.concatenate([
+            np.broadcast_to(np.asarray(board, dtype=np.int64), (rivers.size, 4)),
+            rivers[:, None]
+        ], axis=1)
+        contains_river = (ALL_COMBOS[None, :, 0] == rivers[:, None]) | (ALL_COMBOS[None, :, 1] == rivers[:, None])
+        combo_weights = np.where(contains_river, 0.0, live[None, :])
+
+    total = combo_weights.sum()
+    if total <= 0:
+        raise ValueError("对手范围为空（去除已知牌后）")
+
+    hero_scores = board_combo_scores(boards, hero[None, :])
+    villain_scores = board_combo_scores(boards, ALL_COMBOS)
+    result = (hero_scores < villain_scores) + 0.5 * (hero_scores == villain_scores)
+    return float((result * combo_weights).sum() / total)
+
+
+def weighted_equity(
+    ranges: Sequence[np.ndarray],
+    board: Sequence[int],
+    iterations: int,
+    seed: Optional[int] = None
+) -> float:
+    """
+    加权范围之间的 Monte Carlo 胜率（range-vs-range / hand-vs-range 通用）
+
+    每名玩家按各自的 1326 维权重独立抽取组合，拒绝互相冲突的行（拒绝采样，
+    结果等价于在无冲突条件下的联合分布），再为剩余行补全公共牌。
+
+    Args:
+        ranges: 各玩家的范围权重列表，第 0 个为被计算胜率的一方；
+                固定手牌可用只有一个非零权重的向量表示
+        board: 已知公共牌（整数编码，0-5 张）
+        iterations: 有效模拟次数
+        seed: 随机种子（用于复现）
+
+    Returns:
+        第 0 名玩家的胜率 (0.0 - 1.0)，平分底池按份额计入
+
+    Raises:
+        ValueError: 某个范围为空，或范围之间几乎完全冲突
+    """
+    if iterations <= 0:
+        return 0.0
+
+    rng = np.random.default_rng(seed)
+    board = np.asarray(board, dtype=np.int64)
+    blocked = _blocked_combos(board.tolist())
+    cdfs = []
+    for weights in ranges:
+        live = np.where(blocked, 0.0, np.asarray(weights, dtype=np.float64))
+        cdf = np.cumsum(live)
+        if cdf[-1] <= 0:
+            raise ValueError("范围为空（去除公共牌后）")
+        cdfs.append(cdf)
+
+    cards_to_draw_board = 5 - board.size
+    wins = 0.0
+    accepted = 0
+    attempts = 0
+    # 冲突率极高时（例如两个范围都只有 AA）避免无限循环
+    max_attempts = 50 * iterations
+    while accepted < iterations and attempts < max_attempts:
+        rows = BATCH_SIZE
+        attempts += rows
+        picks = np.stack([
+            np.minimum(np.searchsorted(cdf, rng.random(rows) * cdf[-1], side="right"), cdf.size - 1)
+            for cdf in cdfs
+        ], axis=1)
+        hands = ALL_COMBOS[picks]
+
+        # 拒绝玩家之间有重复牌的行
+        flat = np.sort(hands.reshape(rows, -1), axis=1)
+        hands = hands[~(flat[:, 1:] == flat[:, :-1]).any(axis=1)][:iterations - accepted]
+        rows = hands.shape[0]
+        if not rows:
+            continue
+
+        # 补全公共牌：已知牌和玩家手牌的随机 key 设为 2.0，保证不会被抽中
+        sim_board = np.broadcast_to(board, (rows, board.size))
+        if cards_to_draw_board:
+            keys = rng.random((rows, 52))
+            keys[:, board] = 2.0
+            keys[np.arange(rows)[:, None], hands.reshape(rows, -1)] = 2.0
+            picked = np.argpartition(keys, cards_to_draw_board - 1, axis=1)[:, :cards_to_draw_board]
+            sim_board = np.concatenate([sim_board, picked], axis=1)
+
+        scores = _hand_scores(sim_board, hands)
+        hero_scores, villain_scores = scores[:, 0], scores[:, 1:]
+        best_villain = villain_scores.min(axis=1)
+        wins += np.count_nonzero(hero_scores < best_villain)
+        tied = hero_scores == best_villain
+        if tied.any():
+            tie_counts = (villain_scores[tied] == hero_scores[tied, None]).sum(axis=1)
+            wins += float((1.0 / (tie_counts + 1)).sum())
+        accepted += rows
+
+    if not accepted:
+        raise ValueError("范围之间完全冲突，无法计算胜率")
+    return float(wins / accepted)
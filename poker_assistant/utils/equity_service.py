@@ -0,0 +1,161 @@
+"""
+多进程胜率计算服务
+所有牌桌的胜率计算原本都在各自的游戏线程中执行，受 GIL 限制只能共用一个 CPU 核。
+本服务把胜率计算提交到 ProcessPoolExecutor，使吞吐量随 CPU 核数扩展。
+
+- 进程数由 EQUITY_POOL_SIZE 配置，0 表示不启用（同步计算）
+- 每个工作进程启动时预先构建评估查找表并加载翻牌前胜率表
+- 进程池不可用（未启用、启动失败或崩溃）时自动回退到当前线程同步计算
+"""
+import atexit
+import multiprocessing
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import List, Optional
+
+from poker_assistant.utils import equity_engine
+from poker_assistant.utils.config import Config
+from poker_assistant.utils.equity_engine import EquityEstimate
+from poker_assistant.utils.preflop_table import get_preflop_table
+
+
+def _init_worker():
+    """工作进程初始化: 预先构建查找表，避免第一次请求承担构建开销"""
+    equity_engine.get_tables()
+    get_preflop_table()
+
+
+def estimate_equity(hero: List[int], board: List[int], num_opponents: int,
+                    target_std_error: float, time_budget_ms: float) -> EquityEstimate:
+    """
+    计算胜率估计（可在工作进程或当前线程中执行）
+
+    翻牌前查表、单挑转牌/河牌穷举，其余情况自适应 Monte Carlo。
+
+    Args:
+        hero: Hero 手牌（整数编码）
+        board: 公共牌（整数编码）
+        num_opponents: 对手数量
+        target_std_error: 目标标准误
+        time_budget_ms: 模拟的时间预算（毫秒）
+    """
+    if not board:
+        table = get_preflop_table()
+        if table is not None and len(hero) == 2:
+            equity = table.lookup(hero, num_opponents)
+            if equity is not None:
+                return EquityEstimate(equity, 0.0, 0, exact=True)
+    if len(board) >= 4 and num_opponents == 1:
+        return EquityEstimate(equity_engine.exact_equity(hero, board), 0.0, 0, exact=True)
+    return equity_engine.adaptive_equity(
+        hero, board, num_opponents,
+        target_std_error=target_std_error, time_budget_ms=time_budget_ms)
+
+
+class EquityService:
+    """胜率计算服务（进程池 + 同步回退）"""
+
+    def __init__(self, pool_size: int = 0):
+        """
+        Args:
+            pool_size: 工作进程数，0 表示同步计算
+        """
+        self.pool_size = max(0, pool_size)
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self.pool_size > 0
+
+    def _get_executor(self) -> Optional[ProcessPoolExecutor]:
+        """首次使用时创建进程池（spawn 方式，避免在多线程进程中 fork）"""
+        if not self.enabled:
+            return None
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None and self.enabled:
+                    try:
+                        self._executor = ProcessPoolExecutor(
+                            max_workers=self.pool_size,
+                            mp_context=multiprocessing.get_context("spawn"),
+                            initializer=_init_worker,
+                        )
+                        atexit.register(self.shutdown)
+                        print(f"[EquityService] 已启动 {self.pool_size} 个胜率计算进程")
+                    except (OSError, ValueError) as e:
+                        print(f"[EquityService] 进程池启动失败，回退到同步计算: {e}")
+                        self.pool_size = 0
+        return self._executor
+
+    def start(self):
+        """预先启动进程池，并让每个工作进程完成初始化（未启用时为空操作）"""
+        executor = self._get_executor()
+        if executor is not None:
+            for _ in range(self.pool_size):
+                executor.submit(_init_worker)
+
+    def submit(self, hero: List[int], board: List[int], num_opponents: int = 1,
+               target_std_error: float = 0.01, time_budget_ms: float = 50.0) -> "Future[EquityEstimate]":
+        """
+        提交胜率计算请求
+
+        Returns:
+            Future；未启用进程池时返回已完成的 Future（同步计算）
+        """
+        args = (list(hero), list(board), num_opponents, target_std_error, time_budget_ms)
+        executor = self._get_executor()
+        if executor is not None:
+            try:
+                return executor.submit(estimate_equity, *args)
+            except (BrokenProcessPool, RuntimeError) as e:
+                print(f"[EquityService] 进程池不可用，回退到同步计算: {e}")
+                self._disable()
+
+        future: "Future[EquityEstimate]" = Future()
+        try:
+            future.set_result(estimate_equity(*args))
+        except Exception as e:
+            future.set_exception(e)
+        return future
+
+    def estimate(self, hero: List[int], board: List[int], num_opponents: int = 1,
+                 target_std_error: float = 0.01, time_budget_ms: float = 50.0) -> EquityEstimate:
+        """同步获取胜率估计（工作进程崩溃时在当前线程重新计算）"""
+        future = self.submit(hero, board, num_opponents, target_std_error, time_budget_ms)
+        try:
+            return future.result()
+        except BrokenProcessPool as e:
+            print(f"[EquityService] 工作进程异常退出，回退到同步计算: {e}")
+            self._disable()
+            return estimate_equity(list(hero), list(board), num_opponents, target_std_error, time_budget_ms)
+
+    def _disable(self):
+        """关闭损坏的进程池并切换为同步计算"""
+        with self._lock:
+            executor, self._executor = self._executor, None
+            self.pool_size = 0
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def shutdown(self):
+        """关闭进程池"""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+
+_service: Optional[EquityService] = None
+_service_lock = threading.Lock()
+
+
+def get_equity_service() -> EquityService:
+    """获取进程内共享的胜率计算服务（进程数读取 Config.EQUITY_POOL_SIZE）"""
+    global _service
+    if _service is None:
+        with _service_lock:
+            if _service is None:
+                _service = EquityService(Config().EQUITY_POOL_SIZE)
+    return _service
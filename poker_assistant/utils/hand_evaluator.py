@@ -0,0 +1,271 @@
+"""
+7 张牌手牌评估器（完美哈希查找表）
+替代 treys 在热点路径上的 Python 评估（treys 需遍历 7 张牌的全部 21 个 5 张子集做质数乘积字典查询）。
+
+- 非同花: 5/6/7 张牌的点数多重集合排序后 r0 <= r1 <= ... 映射为严格递增序列 ri + i，
+  其组合数系统 (combinatorial number system) 下标 sum C(ri + i, i + 1) 即为完美哈希，
+  直接作为数组下标查表，无需字典或二分查找
+- 同花: 同一花色内的 13 bit 点数位图直接查表
+
+评估结果与 treys 完全一致（1 为皇家同花顺，7462 为最弱高牌，数值越小越强）。
+牌的整数编码见 card_codec。
+
+表文件格式 (little-endian):
+    header: magic(4s) 'HREV' | version(H) | 填充至 16 字节
+    body:   uint16 rank5[C(17,5)] | rank6[C(18,6)] | rank7[C(19,7)] | flush[8192]
+
+生成表文件: python scripts/build_hand_ranks.py
+"""
+import mmap
+import os
+import struct
+import threading
+from itertools import combinations_with_replacement
+from math import comb
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+from treys import Card as TreysCard
+from treys.lookup import LookupTable
+
+TABLE_MAGIC = b"HREV"
+TABLE_VERSION = 1
+HEADER_FORMAT = "<4sH"
+HEADER_SIZE = 16
+
+DEFAULT_TABLE_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "hand_ranks.bin"
+)
+
+HAND_SIZES = (5, 6, 7)
+
+# 点数多重集合个数: 从 13 个点数中可重复地取 k 个
+RANK_TABLE_LENGTHS = {k: comb(13 + k - 1, k) for k in HAND_SIZES}
+FLUSH_TABLE_LENGTH = 1 << 13
+
+# 同花表中 "无同花" 的哨兵值（比任何真实牌力都弱）
+NO_FLUSH = LookupTable.MAX_HIGH_CARD + 1
+
+# 牌型等级 (1=同花顺 ... 9=高牌) 的牌力上界，与 treys Evaluator.get_rank_class 一致
+CLASS_BOUNDS = (
+    LookupTable.MAX_STRAIGHT_FLUSH, LookupTable.MAX_FOUR_OF_A_KIND, LookupTable.MAX_FULL_HOUSE,
+    LookupTable.MAX_FLUSH, LookupTable.MAX_STRAIGHT, LookupTable.MAX_THREE_OF_A_KIND,
+    LookupTable.MAX_TWO_PAIR, LookupTable.MAX_PAIR, LookupTable.MAX_HIGH_CARD,
+)
+# 组合数表 BINOM[n][k] = C(n, k)，n <= 12 + 7
+_BINOM = [[comb(n, k) for k in range(8)] for n in range(20)]
+_BINOM_NP = np.array(_BINOM, dtype=np.int32)
+
+
+def rank_index(sorted_ranks: Sequence[int]) -> int:
+    """已排序点数多重集合 -> 完美哈希下标"""
+    return sum(_BINOM[r + i][i + 1] for i, r in enumerate(sorted_ranks))
+
+
+def _rank_multisets(size: int) -> np.ndarray:
+    """全部张数为 size 的已排序点数多重集合 (M, size)，含超过 4 张的无效组合"""
+    return np.array(list(combinations_with_replacement(range(13), size)), dtype=np.int32)
+
+
+def _batch_rank_index(sorted_ranks: np.ndarray) -> np.ndarray:
+    """批量计算已排序点数多重集合 (N, k) 的完美哈希下标"""
+    k = sorted_ranks.shape[1]
+    return _BINOM_NP[sorted_ranks + np.arange(k), np.arange(1, k + 1)].sum(axis=1)
+
+
+def build_arrays() -> Tuple[Dict[int, np.ndarray], np.ndarray]:
+    """
+    由 treys 的 5 张牌查找表生成完美哈希表
+
+    6/7 张牌的牌力为去掉任意一张后的最佳牌力，按张数逐层推导。
+
+    Returns:
+        ({k: rank_table}, flush_table)，均为 uint16
+    """
+    lookup = LookupTable()
+    primes = TreysCard.PRIMES
+
+    rank_tables: Dict[int, np.ndarray] = {}
+    for size in HAND_SIZES:
+        table = np.zeros(RANK_TABLE_LENGTHS[size], dtype=np.uint16)
+        for ranks in combinations_with_replacement(range(13), size):
+            if any(ranks.count(r) > 4 for r in set(ranks)):
+                continue
+            if size == 5:
+                prime = 1
+                for r in ranks:
+                    prime *= primes[r]
+                value = lookup.unsuited_lookup[prime]
+            else:
+                previous = rank_tables[size - 1]
+                value = min(
+                    previous[rank_index(ranks[:i] + ranks[i + 1:])]
+                    for i in range(size) if i == 0 or ranks[i] != ranks[i - 1]
+                )
+            table[rank_index(ranks)] = value
+        rank_tables[size] = table
+
+    flush_table = np.full(FLUSH_TABLE_LENGTH, NO_FLUSH, dtype=np.uint16)
+    for mask in sorted(range(FLUSH_TABLE_LENGTH), key=lambda m: bin(m).count("1")):
+        bits = bin(mask).count("1")
+        if bits < 5 or bits > 7:
+            continue
+        if bits == 5:
+            prime = 1
+            for r in range(13):
+                if mask >> r & 1:
+                    prime *= primes[r]
+            flush_table[mask] = lookup.flush_lookup[prime]
+        else:
+            flush_table[mask] = min(
+                flush_table[mask & ~(1 << r)]
+                for r in range(13) if mask >> r & 1
+            )
+    return rank_tables, flush_table
+
+
+def build_table_file(path: str = DEFAULT_TABLE_PATH):
+    """离线生成表文件"""
+    rank_tables, flush_table = build_arrays()
+    header = struct.pack(HEADER_FORMAT, TABLE_MAGIC, TABLE_VERSION)
+    with open(path, "wb") as f:
+        f.write(header.ljust(HEADER_SIZE, b"\0"))
+        for size in HAND_SIZES:
+            f.write(rank_tables[size].astype("<u2").tobytes())
+        f.write(flush_table.astype("<u2").tobytes())
+
+
+class HandRankTables:
+    """完美哈希查找表（优先 mmap 只读加载表文件，缺失时在内存中构建）"""
+
+    def __init__(self, path: str = DEFAULT_TABLE_PATH):
+        self.path = path
+        self._mmap = None
+        try:
+            self._load(path)
+        except (OSError, ValueError) as e:
+            print(f"[HandEvaluator] 表文件不可用，在内存中构建: {e}")
+            self.rank_tables, self.flush_table = build_arrays()
+
+        # 标量 API 使用 Python 列表（逐元素访问比 NumPy 标量快得多）
+        self._rank_lists = {size: table.tolist() for size, table in self.rank_tables.items()}
+        self._flush_list = self.flush_table.tolist()
+
+    def _load(self, path: str):
+        with open(path, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version = struct.unpack_from(HEADER_FORMAT, self._mmap, 0)
+        expected_size = HEADER_SIZE + 2 * (sum(RANK_TABLE_LENGTHS.values()) + FLUSH_TABLE_LENGTH)
+        if magic != TABLE_MAGIC or version != TABLE_VERSION or len(self._mmap) != expected_size:
+            self._mmap.close()
+            raise ValueError(f"无效的手牌评估表文件: {path}")
+
+        offset = HEADER_SIZE
+        self.rank_tables = {}
+        for size in HAND_SIZES:
+            count = RANK_TABLE_LENGTHS[size]
+            self.rank_tables[size] = np.frombuffer(self._mmap, dtype="<u2", count=count, offset=offset)
+            offset += 2 * count
+        self.flush_table = np.frombuffer(self._mmap, dtype="<u2", count=FLUSH_TABLE_LENGTH, offset=offset)
+
+    def additive_rank_table(self) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        导出以 5 进制点数计数为 key 的 (已排序 keys, values)
+
+        5 进制 key 可以相加（公共牌 key + 手牌 key），供 equity_engine 的批量枚举使用。
+        """
+        keys, values = [], []
+        weights = 5 ** np.arange(13, dtype=np.int64)
+        for size in HAND_SIZES:
+            ranks = _rank_multisets(size)
+            counts = (ranks[:, :, None] == np.arange(13)).sum(axis=1)
+            valid = counts.max(axis=1) <= 4
+            keys.append(counts[valid] @ weights)
+            values.append(self.rank_tables[size][_batch_rank_index(ranks[valid])].astype(np.int32))
+        keys = np.concatenate(keys)
+        values = np.concatenate(values)
+        order = np.argsort(keys)
+        return keys[order], values[order]
+
+
+_tables: Optional[HandRankTables] = None
+_tables_lock = threading.Lock()
+
+
+def get_hand_tables() -> HandRankTables:
+    """获取进程内共享的评估表（首次调用时加载）"""
+    global _tables
+    if _tables is None:
+        with _tables_lock:
+            if _tables is None:
+                _tables = HandRankTables()
+    return _tables
+
+
+def evaluate(cards: Sequence[int]) -> int:
+    """
+    评估单手牌（标量 API）
+
+    Args:
+        cards: 5-7 张牌（整数编码）
+
+    Returns:
+        牌力（与 treys 一致，数值越小越强）
+    """
+    tables = get_hand_tables()
+    ranks = sorted(c >> 2 for c in cards)
+    score = tables._rank_lists[len(ranks)][sum(_BINOM[r + i][i + 1] for i, r in enumerate(ranks))]
+
+    suit_masks = [0, 0, 0, 0]
+    for c in cards:
+        suit_masks[c & 3] |= 1 << (c >> 2)
+    for mask in suit_masks:
+        if bin(mask).count("1") >= 5:
+            score = min(score, tables._flush_list[mask])
+    return score
+
+
+def evaluate_batch(cards: np.ndarray) -> np.ndarray:
+    """
+    批量评估手牌（NumPy API）
+
+    Args:
+        cards: 形状为 (N, k) 的整数牌数组，k 为 5-7
+
+    Returns:
+        形状为 (N,) 的牌力数组 (int32，与 treys 一致，数值越小越强)
+    """
+    tables = get_hand_tables()
+    cards = np.asarray(cards)
+    ranks = cards >> 2
+    suits = cards & 3
+
+    index = _batch_rank_index(np.sort(ranks, axis=1))
+    scores = tables.rank_tables[cards.shape[1]][index].astype(np.int32)
+
+    # 同花检查：只有少数行需要额外计算
+    suit_counts = (suits[:, :, None] == np.arange(4)).sum(axis=1)
+    flush_rows = np.nonzero(suit_counts.max(axis=1) >= 5)[0]
+    if flush_rows.size:
+        flush_suit = suit_counts[flush_rows].argmax(axis=1)
+        in_suit = suits[flush_rows] == flush_suit[:, None]
+        masks = np.where(in_suit, 1 << ranks[flush_rows], 0).sum(axis=1)
+        scores[flush_rows] = np.minimum(scores[flush_rows], tables.flush_table[masks])
+
+    return scores
+
+
+def rank_class(score: int) -> int:
+    """
+    牌力 -> 牌型等级 (1=同花顺 ... 9=高牌)
+
+    与 treys Evaluator.get_rank_class 一致，但皇家同花顺 (牌力 1) 归入同花顺 (1)，
+    而非 treys 的等级 0（PokerMath.HAND_RANK_NAMES 没有等级 0）。
+    """
+    return _CLASS_LOOKUP[score]
+
+
+_CLASS_LOOKUP: List[int] = [1] + [
+    next(i + 1 for i, bound in enumerate(CLASS_BOUNDS) if score <= bound)
+    for score in range(1, LookupTable.MAX_HIGH_CARD + 1)
+]
@@ -0,0 +1,158 @@
+"""
+手牌范围模块
+用 1326 维权重向量表示对手的手牌范围（每个两张牌组合一个权重），
+支持按起手牌强度取前 x%、公共牌去除 (card removal) 以及按牌面强度收窄范围。
+胜率计算见 equity_engine.weighted_equity / exact_range_equity。
+"""
+import threading
+from typing import Iterable, List, Optional, Sequence
+
+import numpy as np
+
+from poker_assistant.utils import equity_engine
+from poker_assistant.utils.equity_engine import ALL_COMBOS
+from poker_assistant.utils.preflop_table import (
+    NUM_CLASSES, get_preflop_table, hand_class_index, hand_class_name, representative_hand
+)
+
+NUM_COMBOS = 1326
+
+# 每个组合所属的规范起手牌类别 (0-168)
+COMBO_CLASSES = np.array([hand_class_index(int(a), int(b)) for a, b in ALL_COMBOS], dtype=np.int64)
+
+# 排序起手牌强度时参考的对手数量（介于单挑与多人底池之间）
+_STRENGTH_OPPONENTS = 2
+
+_class_order: Optional[np.ndarray] = None
+_class_order_lock = threading.Lock()
+
+
+def class_strength_order() -> np.ndarray:
+    """
+    169 种起手牌类别按强度从强到弱排序的下标
+
+    优先使用翻牌前胜率表；表不可用时用少量模拟现算一次并缓存。
+    """
+    global _class_order
+    if _class_order is None:
+        with _class_order_lock:
+            if _class_order is None:
+                table = get_preflop_table()
+                if table is not None:
+                    strength = np.asarray(table.values[:, _STRENGTH_OPPONENTS - 1], dtype=np.float64)
+                else:
+                    strength = np.array([
+                        equity_engine.monte_carlo_equity(
+                            representative_hand(i), [], 2000, num_opponents=_STRENGTH_OPPONENTS, seed=i)
+                        for i in range(NUM_CLASSES)
+                    ])
+                _class_order = np.argsort(-strength, kind="stable")
+    return _class_order
+
+
+class HandRange:
+    """加权手牌范围 (1326 个组合的权重，0.0 - 1.0)"""
+
+    def __init__(self, weights: Optional[np.ndarray] = None):
+        if weights is None:
+            weights = np.ones(NUM_COMBOS)
+        self.weights = np.clip(np.asarray(weights, dtype=np.float64), 0.0, 1.0)
+
+    @classmethod
+    def uniform(cls) -> "HandRange":
+        """任意两张牌（随机手牌）"""
+        return cls()
+
+    @classmethod
+    def from_top_fraction(cls, fraction: float) -> "HandRange":
+        """
+        起手牌强度前 fraction 比例的组合
+
+        按组合数累计（对子 6 组、同花 4 组、非同花 12 组），边界上的类别按比例取部分权重。
+        """
+        class_combos = np.bincount(COMBO_CLASSES, minlength=NUM_CLASSES).astype(np.float64)
+        order = class_strength_order()
+        starts = np.zeros(NUM_CLASSES)
+        starts[order] = np.concatenate([[0.0], np.cumsum(class_combos[order])[:-1]])
+
+        target = np.clip(fraction, 0.0, 1.0) * NUM_COMBOS
+        class_weights = np.clip((target - starts) / class_combos, 0.0, 1.0)
+        return cls(class_weights[COMBO_CLASSES])
+
+    @classmethod
+    def from_class_names(cls, names: Iterable[str]) -> "HandRange":
+        """由起手牌类别名称构建 (e.g., ['AA', 'KK', 'AKs'])"""
+        wanted = set(names)
+        class_weights = np.array([1.0 if hand_class_name(i) in wanted else 0.0 for i in range(NUM_CLASSES)])
+        return cls(class_weights[COMBO_CLASSES])
+
+    @classmethod
+    def from_hand(cls, cards: Sequence[int]) -> "HandRange":
+        """单一确定手牌（整数编码）"""
+        weights = np.zeros(NUM_COMBOS)
+        low, high = sorted(int(c) for c in cards)
+        weights[np.nonzero((ALL_COMBOS[:, 0] == low) & (ALL_COMBOS[:, 1] == high))[0]] = 1.0
+        return cls(weights)
+
+    @property
+    def combo_count(self) -> float:
+        """加权组合数"""
+        return float(self.weights.sum())
+
+    @property
+    def fraction(self) -> float:
+        """占全部 1326 个组合的比例"""
+        return self.combo_count / NUM_COMBOS
+
+    def copy(self) -> "HandRange":
+        return HandRange(self.weights.copy())
+
+    def remove_cards(self, cards: Sequence[int]) -> "HandRange":
+        """去除包含已知牌（公共牌、己方手牌）的组合"""
+        blocked = np.isin(ALL_COMBOS, np.asarray(list(cards), dtype=np.int64)).any(axis=1)
+        return HandRange(np.where(blocked, 0.0, self.weights))
+
+    def blend(self, other: "HandRange", other_weight: float) -> "HandRange":
+        """与另一个范围线性混合"""
+        return HandRange((1 - other_weight) * self.weights + other_weight * other.weights)
+
+    def narrow_by_strength(self, board: Sequence[int], keep_fraction: float,
+                           floor: float = 0.0) -> "HandRange":
+        """
+        按当前牌面上的成牌强度收窄范围
+
+        范围内（按权重计）最强的 keep_fraction 保留原权重，其余组合乘以 floor
+        （floor > 0 表示保留一部分诈唬/听牌组合）。
+
+        Args:
+            board: 公共牌（整数编码，3-5 张）
+            keep_fraction: 保留比例 (0.0 - 1.0)
+            floor: 未保留组合的权重系数
+        """
+        board = [int(c) for c in board]
+        live = self.remove_cards(board)
+        if len(board) < 3 or live.combo_count <= 0:
+            return live
+
+        scores = equity_engine.board_combo_scores(np.asarray(board, dtype=np.int64)[None, :], ALL_COMBOS)[0]
+        order = np.argsort(scores, kind="stable")
+        cumulative = np.cumsum(live.weights[order]) / live.combo_count
+        keep = np.zeros(NUM_COMBOS, dtype=bool)
+        keep[order] = cumulative - live.weights[order] / live.combo_count < keep_fraction
+        return HandRange(np.where(keep, live.weights, live.weights * floor))
+
+    def top_classes(self, limit: int = 10) -> List[str]:
+        """范围内权重最高、强度最强的若干起手牌类别名称"""
+        class_weight = np.bincount(COMBO_CLASSES, weights=self.weights, minlength=NUM_CLASSES)
+        class_combos = np.bincount(COMBO_CLASSES, minlength=NUM_CLASSES)
+        names = []
+        for index in class_strength_order():
+            if class_weight[index] >= 0.5 * class_combos[index]:
+                names.append(hand_class_name(int(index)))
+                if len(names) >= limit:
+                    break
+        return names
+
+    def describe(self) -> str:
+        """人类可读描述 (用于 Prompt)"""
+        return f"约 {self.fraction * 100:.0f}% 的组合 ({self.combo_count:.0f} 组)"
@@ -2,15 +2,70 @@
 扑克数学工具模块
 负责计算胜率 (Equity)、底池赔率 (Pot Odds) 和期望值 (EV)
 支持 Harrington 理论所需的 SPR、有效筹码深度和牌面纹理分析
-使用 treys 库进行手牌评估
+手牌评估使用 hand_evaluator 完美哈希查表（与 treys 一致），胜率计算默认使用向量化 NumPy 引擎
 """
-from treys import Card, Evaluator, Deck
-from typing import List, Tuple, Union, Dict, Any
+from treys import Evaluator
+from typing import List, Tuple, Union, Dict, Any, Optional
 from collections import Counter
+from concurrent.futures import Future
+import hashlib
+import threading
+
+import numpy as np
+
+from poker_assistant.utils import card_codec, equity_engine, hand_evaluator
+from poker_assistant.utils.equity_engine import EquityEstimate
+from poker_assistant.utils.card_codec import RANK_CHARS
+from poker_assistant.utils.board_texture import board_texture
+from poker_assistant.utils.preflop_table import get_preflop_table
+from poker_assistant.utils.hand_range import HandRange
+from poker_assistant.utils.equity_cache import canonical_key, equity_cache
+from poker_assistant.utils.equity_service import get_equity_service
+
+# 胜率计算引擎及其默认模拟次数
+# - numpy: 向量化批量模拟 (equity_engine)，同样耗时下可跑 10k+ 次
+# - treys: 逐次 Python 循环模拟，仅作兼容/对照
+EQUITY_ENGINES = {
+    "numpy": 10000,
+    "treys": 300,
+}
+DEFAULT_EQUITY_ENGINE = "numpy"
+
+# 进程内共享的只读 treys Evaluator 与 PokerMath（首次使用时创建）
+_shared_evaluator: Optional[Evaluator] = None
+_shared_poker_math: Optional["PokerMath"] = None
+_shared_lock = threading.Lock()
+
+
+def get_shared_evaluator() -> Evaluator:
+    """
+    获取进程内共享的 treys Evaluator
+
+    Evaluator 构建时会生成较大的查找表，且评估过程只读，
+    因此所有机器人、建议引擎和 PatchedGameEvaluator 共用一个实例。
+    """
+    global _shared_evaluator
+    if _shared_evaluator is None:
+        with _shared_lock:
+            if _shared_evaluator is None:
+                _shared_evaluator = Evaluator()
+    return _shared_evaluator
+
+
+def get_poker_math() -> "PokerMath":
+    """获取进程内共享的 PokerMath（无可变状态，可跨线程共用）"""
+    global _shared_poker_math
+    if _shared_poker_math is None:
+        evaluator = get_shared_evaluator()
+        with _shared_lock:
+            if _shared_poker_math is None:
+                _shared_poker_math = PokerMath(evaluator)
+    return _shared_poker_math
+
 
 class PokerMath:
-    def __init__(self):
-        self.evaluator = Evaluator()
+    def __init__(self, evaluator: Optional[Evaluator] = None):
+        self.evaluator = evaluator or get_shared_evaluator()
         
         # 牌型名称映射 (treys rank class -> 中英文名称)
         self.HAND_RANK_NAMES = {
@@ -25,25 +80,6 @@ class PokerMath:
             9: ("High Card", "高牌"),
         }
     
-    def _convert_card_to_treys(self, card: str) -> str:
-        """
-        将 PyPokerEngine 格式的牌转换为 treys 格式
-        
-        PyPokerEngine: 'SA' (Suit + Rank) -> treys: 'As' (Rank + lowercase suit)
-        PyPokerEngine: 'H8' -> treys: '8h'
-        """
-        if not card or len(card) != 2:
-            return card
-        
-        suit = card[0].lower()  # S -> s, H -> h, D -> d, C -> c
-        rank = card[1]  # A, K, Q, J, T, 9, 8, ...
-        
-        return f"{rank}{suit}"
-    
-    def _convert_cards_to_treys(self, cards: List[str]) -> List[str]:
-        """将多张牌转换为 treys 格式"""
-        return [self._convert_card_to_treys(c) for c in cards]
-    
     def evaluate_made_hand(self, hole_cards: List[str], community_cards: List[str]) -> Dict[str, Any]:
         """
         评估当前组成的牌型
@@ -66,16 +102,13 @@ class PokerMath:
             }
         
         try:
-            # 转换牌格式: PyPokerEngine ('SA') -> treys ('As')
-            treys_hole = self._convert_cards_to_treys(hole_cards)
-            treys_board = self._convert_cards_to_treys(community_cards)
-            
-            hero_hand = [Card.new(c) for c in treys_hole]
-            board = [Card.new(c) for c in treys_board]
+            # 解析为整数编码
+            hero_hand = card_codec.parse_cards(hole_cards)
+            board = card_codec.parse_cards(community_cards)
             
             # 评估牌力 (数值越小越强，1是皇家同花顺，7462是最弱高牌)
-            hand_rank = self.evaluator.evaluate(board, hero_hand)
-            hand_rank_class = self.evaluator.get_rank_class(hand_rank)
+            hand_rank = hand_evaluator.evaluate(hero_hand + board)
+            hand_rank_class = hand_evaluator.rank_class(hand_rank)
             
             # 获取牌型名称
             hand_name_en, hand_name_cn = self.HAND_RANK_NAMES.get(hand_rank_class, ("Unknown", "未知"))
@@ -97,8 +130,8 @@ class PokerMath:
                         '4': 4, '3': 3, '2': 2}.get(r, 0)
             
             # 获取手牌和公共牌的点数
-            hole_ranks = [c[1] for c in hole_cards]  # e.g., ['4', 'J'] from ['C4', 'CJ']
-            board_ranks = [c[1] for c in community_cards]  # e.g., ['7', 'Q', 'Q', '9']
+            hole_ranks = [RANK_CHARS[c >> 2] for c in hero_hand]  # e.g., ['4', 'J'] from ['C4', 'CJ']
+            board_ranks = [RANK_CHARS[c >> 2] for c in board]  # e.g., ['7', 'Q', 'Q', '9']
             all_ranks = hole_ranks + board_ranks
             
             # 统计点数出现次数
@@ -202,48 +235,143 @@ class PokerMath:
                 "is_strong": False
             }
 
-    def calculate_equity(self, hole_cards: List[str], community_cards: List[str], num_simulations: int = 300) -> float:
+    def calculate_equity(self, hole_cards: List[str], community_cards: List[str],
+                         num_simulations: Optional[int] = None,
+                         engine: str = DEFAULT_EQUITY_ENGINE,
+                         num_opponents: int = 1) -> float:
         """
-        计算手牌在当前公共牌下的胜率 (Monte Carlo 模拟)
+        计算手牌在当前公共牌下对抗 num_opponents 名随机手牌对手的胜率
+        
+        numpy 引擎在翻牌前直接查预计算胜率表；单挑时在转牌和河牌自动切换为穷举计算
+        （均忽略 num_simulations），结果精确且可复现。其余情况使用 Monte Carlo 模拟。
+        结果按花色规范化的局面缓存在进程内共享的 LRU 缓存中 (equity_cache)。
         
         Args:
             hole_cards: 手牌列表 (e.g., ['SA', 'DK'] 或 ['Ah', 'Kd'])
             community_cards: 公共牌列表 (e.g., ['HT', 'SJ', 'C2'])，可以为空
-            num_simulations: 模拟次数，默认 300 次（优化速度，精度仍足够）
+            num_simulations: 模拟次数，默认使用引擎对应的次数（numpy: 10000, treys: 300）
+            engine: 计算引擎 ('numpy' 向量化批量模拟 / 'treys' 逐次模拟)
+            num_opponents: 仍在牌局中的对手数量（多人底池胜率显著低于单挑）
             
         Returns:
-            胜率 (0.0 - 1.0)
+            胜率 (0.0 - 1.0)，平分底池按份额计入
         """
-        # 转换牌格式: PyPokerEngine ('SA') -> treys ('As')
+        if engine not in EQUITY_ENGINES:
+            raise ValueError(f"不支持的胜率引擎: {engine}")
+        if num_simulations is None:
+            num_simulations = EQUITY_ENGINES[engine]
+        num_opponents = max(1, num_opponents)
+
         try:
-            treys_hole = self._convert_cards_to_treys(hole_cards)
-            treys_board = self._convert_cards_to_treys(community_cards)
-            
-            hero_hand = [Card.new(c) for c in treys_hole]
-            board = [Card.new(c) for c in treys_board]
+            hero_hand = card_codec.parse_cards(hole_cards)
+            board = card_codec.parse_cards(community_cards)
         except KeyError:
             # 处理可能出现的卡牌格式错误
             return 0.0
 
-        deck = Deck()
-        
-        # 从牌堆中移除已知牌
-        for card in hero_hand + board:
-            if card in deck.cards:
-                deck.cards.remove(card)
+        # 花色同构的局面共享同一缓存条目
+        key = canonical_key(hero_hand, board, num_opponents) + (engine, num_simulations)
+        return equity_cache.get_or_compute(
+            key,
+            lambda: self._calculate_equity_uncached(
+                hole_cards, community_cards, hero_hand, board, num_simulations, engine, num_opponents)
+        )
 
-        wins = 0
-        
-        # Monte Carlo 模拟
-        # 仅在 simulations 确实需要时进行
-        if 5 - len(board) == 0:
-            # 如果是 River，且只需要评估对手手牌
-            # 这里简化为仍然跑 Monte Carlo，随机对手手牌
-            pass 
+    def calculate_equity_estimate(self, hole_cards: List[str], community_cards: List[str],
+                                  num_opponents: int = 1,
+                                  target_std_error: float = 0.01,
+                                  time_budget_ms: float = 50.0) -> EquityEstimate:
+        """
+        自适应精度的胜率计算，返回胜率及其置信区间
 
-        return self._monte_carlo_equity(hero_hand, board, deck.cards, num_simulations)
+        翻牌前查表、单挑转牌/河牌穷举（exact=True，标准误为 0）；其余情况按批次模拟，
+        直到标准误低于 target_std_error 或用完 time_budget_ms。
+        启用进程池 (EQUITY_POOL_SIZE > 0) 时在工作进程中计算；结果同样缓存在 equity_cache 中。
+
+        Args:
+            hole_cards: 手牌列表
+            community_cards: 公共牌列表，可以为空
+            num_opponents: 仍在牌局中的对手数量
+            target_std_error: 目标标准误（0.01 约对应 ±2% 的 95% 置信区间）
+            time_budget_ms: 模拟的时间预算（毫秒）
 
-    def _monte_carlo_equity(self, hero_hand, board, remaining_cards, iterations):
+        Returns:
+            EquityEstimate（equity / std_error / trials / exact，margin 为 95% 区间半宽）；
+            卡牌格式错误时返回胜率 0
+        """
+        num_opponents = max(1, num_opponents)
+        try:
+            hero_hand = card_codec.parse_cards(hole_cards)
+            board = card_codec.parse_cards(community_cards)
+        except KeyError:
+            return EquityEstimate(0.0, 0.0, 0)
+
+        key = canonical_key(hero_hand, board, num_opponents) + ("adaptive", target_std_error, time_budget_ms)
+        return equity_cache.get_or_compute(
+            key,
+            lambda: get_equity_service().estimate(
+                hero_hand, board, num_opponents, target_std_error, time_budget_ms)
+        )
+
+    def submit_equity_estimate(self, hole_cards: List[str], community_cards: List[str],
+                               num_opponents: int = 1,
+                               target_std_error: float = 0.01,
+                               time_budget_ms: float = 50.0) -> "Future[EquityEstimate]":
+        """
+        异步提交胜率计算（启用进程池时在工作进程中执行）
+
+        缓存命中或卡牌格式错误时返回已完成的 Future；计算完成后结果写入 equity_cache。
+        """
+        num_opponents = max(1, num_opponents)
+        try:
+            hero_hand = card_codec.parse_cards(hole_cards)
+            board = card_codec.parse_cards(community_cards)
+        except KeyError:
+            future: "Future[EquityEstimate]" = Future()
+            future.set_result(EquityEstimate(0.0, 0.0, 0))
+            return future
+
+        key = canonical_key(hero_hand, board, num_opponents) + ("adaptive", target_std_error, time_budget_ms)
+        cached = equity_cache.peek(key)
+        if cached is not None:
+            future = Future()
+            future.set_result(cached)
+            return future
+
+        def store(done: Future):
+            if not done.cancelled() and done.exception() is None:
+                equity_cache.put(key, done.result())
+
+        future = get_equity_service().submit(hero_hand, board, num_opponents, target_std_error, time_budget_ms)
+        future.add_done_callback(store)
+        return future
+
+    def _calculate_equity_uncached(self, hole_cards: List[str], community_cards: List[str],
+                                   hero_hand: List[int], board: List[int],
+                                   num_simulations: int, engine: str, num_opponents: int) -> float:
+        """calculate_equity 的实际计算（不经过缓存）"""
+        if engine == "numpy":
+            if not board:
+                # 翻牌前: O(1) 查表（表文件缺失或对手数超出范围时回退到 Monte Carlo）
+                table = get_preflop_table()
+                if table is not None and len(hero_hand) == 2:
+                    equity = table.lookup(hero_hand, num_opponents)
+                    if equity is not None:
+                        return equity
+            if len(board) >= 4 and num_opponents == 1:
+                # 单挑转牌/河牌: 剩余组合数很少，直接穷举
+                return equity_engine.exact_equity(hero_hand, board)
+            return equity_engine.monte_carlo_equity(
+                hero_hand, board, num_simulations, num_opponents=num_opponents)
+
+        # treys 引擎: 整数编码查表转换为 treys 整数，剩余牌堆直接由编码生成
+        known = set(hero_hand) | set(board)
+        remaining = [card_codec.to_treys(c) for c in range(52) if c not in known]
+        return self._monte_carlo_equity(
+            card_codec.to_treys_list(hero_hand), card_codec.to_treys_list(board),
+            remaining, num_simulations, num_opponents)
+
+    def _monte_carlo_equity(self, hero_hand, board, remaining_cards, iterations, num_opponents=1):
         import random
         wins = 0
         cards_to_draw_board = 5 - len(board)
@@ -258,25 +386,170 @@ class PokerMath:
 
         for _ in range(iterations):
             # 随机抽样，不改变 remaining_cards
-            drawn = random.sample(remaining_cards, cards_to_draw_board + 2) # board补牌 + 对手2张
+            drawn = random.sample(remaining_cards, cards_to_draw_board + 2 * num_opponents) # board补牌 + 每个对手2张
             
             sim_board = board + drawn[:cards_to_draw_board]
-            villain_hand = drawn[cards_to_draw_board:]
+            villain_cards = drawn[cards_to_draw_board:]
             
             if hero_score is None:
                 current_hero_score = self.evaluator.evaluate(sim_board, hero_hand)
             else:
                 current_hero_score = hero_score
                 
-            villain_score = self.evaluator.evaluate(sim_board, villain_hand)
+            villain_scores = [
+                self.evaluator.evaluate(sim_board, villain_cards[i:i + 2])
+                for i in range(0, len(villain_cards), 2)
+            ]
+            best_villain_score = min(villain_scores)
             
-            if current_hero_score < villain_score:
+            if current_hero_score < best_villain_score:
                 wins += 1
-            elif current_hero_score == villain_score:
-                wins += 0.5
+            elif current_hero_score == best_villain_score:
+                wins += 1 / (villain_scores.count(best_villain_score) + 1)
                 
         return wins / iterations
 
+    def calculate_range_equity(self, hole_cards: List[str], community_cards: List[str],
+                               ranges: List[HandRange],
+                               num_simulations: Optional[int] = None) -> float:
+        """
+        计算手牌对抗对手估计范围（加权组合）的胜率
+
+        单一对手范围且处于转牌/河牌时穷举计算，其余情况使用拒绝采样 Monte Carlo。
+        结果按 (手牌, 公共牌, 各对手范围权重) 缓存在 equity_cache 中。
+
+        Args:
+            hole_cards: 手牌列表 (e.g., ['SA', 'DK'])
+            community_cards: 公共牌列表，可以为空
+            ranges: 每名对手的手牌范围 (HandRange)，为空时视为单挑随机手牌
+            num_simulations: 模拟次数，默认 10000
+
+        Returns:
+            胜率 (0.0 - 1.0)；范围与已知牌完全冲突时返回 0.0
+        """
+        if num_simulations is None:
+            num_simulations = EQUITY_ENGINES["numpy"]
+        if not ranges:
+            ranges = [HandRange.uniform()]
+
+        try:
+            hero_hand = card_codec.parse_cards(hole_cards)
+            board = card_codec.parse_cards(community_cards)
+        except KeyError:
+            return 0.0
+
+        key = ("range", tuple(sorted(hero_hand)), tuple(sorted(board)), num_simulations) + tuple(
+            hashlib.blake2b(r.weights.tobytes(), digest_size=16).digest() for r in ranges)
+        return equity_cache.get_or_compute(
+            key, lambda: self._calculate_range_equity_uncached(hero_hand, board, ranges, num_simulations))
+
+    def _calculate_range_equity_uncached(self, hero_hand: List[int], board: List[int],
+                                         ranges: List[HandRange], num_simulations: int) -> float:
+        """calculate_range_equity 的实际计算（不经过缓存）"""
+        try:
+            if len(ranges) == 1 and len(board) >= 4:
+                return equity_engine.exact_range_equity(hero_hand, board, ranges[0].weights)
+            hero_range = HandRange.from_hand(hero_hand)
+            return equity_engine.weighted_equity(
+                [hero_range.weights] + [r.weights for r in ranges], board, num_simulations)
+        except ValueError:
+            return 0.0
+
+    def calculate_outs(self, hole_cards: List[str], community_cards: List[str],
+                       improve_to: Optional[int] = None) -> Dict[str, Any]:
+        """
+        计算 Hero 的补牌数 (Outs) 及转牌/河牌的改进概率
+
+        在一次向量化计算中枚举全部 45-47 张未见牌；翻牌时另外一次性枚举全部转牌+河牌组合，
+        得到精确的 "到河牌为止" 改进概率。
+
+        Args:
+            hole_cards: 手牌 (e.g., ['SK', 'SQ'])
+            community_cards: 公共牌（3-4 张，翻牌或转牌）
+            improve_to: 目标牌型等级 (1=同花顺 ... 9=高牌)，默认只要牌型等级高于当前即算改进
+
+        Returns:
+            {
+                "current_class": int, "current_hand_cn": str,
+                "unseen_cards": int, "outs": int, "out_cards": List[str],
+                "outs_by_category": {牌型中文名: 张数},
+                "next_card_probability": float,   # 下一张牌改进的概率
+                "by_river_probability": float,    # 到河牌为止改进的概率
+                "description": str
+            }；公共牌不足 3 张或多于 4 张时返回 outs 为 0 的结果
+        """
+        try:
+            hero_hand = card_codec.parse_cards(hole_cards)
+            board = card_codec.parse_cards(community_cards)
+        except KeyError:
+            hero_hand, board = [], []
+
+        if len(hero_hand) != 2 or not 3 <= len(board) <= 4:
+            return {
+                "current_class": 9, "current_hand_cn": "N/A",
+                "unseen_cards": 0, "outs": 0, "out_cards": [], "outs_by_category": {},
+                "next_card_probability": 0.0, "by_river_probability": 0.0,
+                "description": "仅在翻牌和转牌计算补牌"
+            }
+
+        current_score = int(equity_engine.evaluate_batch(np.asarray([hero_hand + board]))[0])
+        current_class = int(equity_engine.rank_classes(np.asarray([current_score]))[0])
+        target_class = current_class - 1 if improve_to is None else min(improve_to, current_class - 1)
+
+        # 只有 Hero 的手牌参与改进才算补牌（排除公共牌自身成对等所有人共享的改进）
+        unseen, scores = equity_engine.next_card_scores(hero_hand, board)
+        classes = equity_engine.rank_classes(scores)
+        is_out = (classes <= target_class) & (classes < self._board_only_classes(board, unseen[:, None]))
+
+        outs_by_category = {}
+        for rank_class, count in zip(*np.unique(classes[is_out], return_counts=True)):
+            outs_by_category[self.HAND_RANK_NAMES[int(rank_class)][1]] = int(count)
+
+        outs = int(is_out.sum())
+        next_card_probability = outs / unseen.size
+        if len(board) == 3:
+            runouts, runout = equity_engine.runout_scores(hero_hand, board)
+            runout_classes = equity_engine.rank_classes(runout)
+            by_river_probability = float(np.mean(
+                (runout_classes <= target_class) & (runout_classes < self._board_only_classes(board, runouts))))
+        else:
+            by_river_probability = next_card_probability
+
+        if outs:
+            categories = ", ".join(f"{name} {count} 张" for name, count in outs_by_category.items())
+            description = (
+                f"{outs} 张补牌 ({categories})，下一张改进 {next_card_probability * 100:.1f}%"
+                + (f"，到河牌改进 {by_river_probability * 100:.1f}%" if len(board) == 3 else "")
+            )
+        else:
+            description = "无直接改进牌型的补牌"
+
+        return {
+            "current_class": current_class,
+            "current_hand_cn": self.HAND_RANK_NAMES[current_class][1],
+            "unseen_cards": int(unseen.size),
+            "outs": outs,
+            "out_cards": [card_codec.to_str(int(c)) for c in unseen[is_out]],
+            "outs_by_category": outs_by_category,
+            "next_card_probability": round(next_card_probability, 3),
+            "by_river_probability": round(by_river_probability, 3),
+            "description": description
+        }
+
+    def _board_only_classes(self, board: List[int], extra: np.ndarray) -> np.ndarray:
+        """
+        仅由公共牌（加上 extra 中每行的新牌）组成的牌型等级
+
+        满 5 张时直接评估；4 张时只可能是四条/三条/两对/一对/高牌，按点数计数判断。
+        """
+        cards = np.concatenate([np.broadcast_to(np.asarray(board), (extra.shape[0], len(board))), extra], axis=1)
+        if cards.shape[1] >= 5:
+            return equity_engine.rank_classes(equity_engine.evaluate_batch(cards))
+        counts = (cards[:, :, None] >> 2 == np.arange(13)).sum(axis=1)
+        max_count = counts.max(axis=1)
+        num_pairs = (counts >= 2).sum(axis=1)
+        return np.select([max_count == 4, max_count == 3, num_pairs == 2, num_pairs == 1], [2, 6, 7, 8], default=9)
+
     def calculate_pot_odds(self, to_call: int, pot_size: int) -> float:
         """
         计算底池赔率
@@ -297,11 +570,17 @@ class PokerMath:
         return to_call / final_pot
 
     def analyze_hand(self, hole_cards: List[str], community_cards: List[str], 
-                    pot_size: int, to_call: int) -> dict:
+                    pot_size: int, to_call: int, num_opponents: int = 1) -> dict:
         """
         综合数学分析
+        
+        胜率使用自适应精度计算，equity_interval 给出 "42.0% ± 2.0%" 形式的 95% 置信区间。
+        
+        Args:
+            num_opponents: 仍在牌局中的对手数量
         """
-        equity = self.calculate_equity(hole_cards, community_cards)
+        estimate = self.calculate_equity_estimate(hole_cards, community_cards, num_opponents=num_opponents)
+        equity = estimate.equity
         pot_odds = self.calculate_pot_odds(to_call, pot_size)
         
         ev_call = 0.0
@@ -314,6 +593,12 @@ class PokerMath:
         return {
             "equity": round(equity, 3),
             "equity_percent": f"{round(equity * 100, 1)}%",
+            "equity_margin": round(estimate.margin, 3),
+            "equity_interval": (
+                f"{round(equity * 100, 1)}%" if estimate.exact
+                else f"{round(equity * 100, 1)}% ± {round(estimate.margin * 100, 1)}%"
+            ),
+            "equity_trials": estimate.trials,
             "pot_odds": round(pot_odds, 3),
             "pot_odds_percent": f"{round(pot_odds * 100, 1)}%",
             "ev_call": round(ev_call, 2),
@@ -387,131 +672,12 @@ class PokerMath:
                 "description": str       # 人类可读描述
             }
         """
-        if not community_cards:
-            return {
-                "texture": "unknown",
-                "texture_cn": "未知",
-                "paired": False,
-                "flush_possible": False,
-                "flush_draw": False,
-                "straight_possible": False,
-                "straight_draw": False,
-                "high_card": "None",
-                "connectedness": 0,
-                "description": "翻牌前，无公共牌"
-            }
-        
-        # 解析牌面
-        ranks = []
-        suits = []
-        rank_values = []
-        
-        rank_map = {'2': 2, '3': 3, '4': 4, '5': 5, '6': 6, '7': 7, '8': 8, 
-                    '9': 9, 'T': 10, 'J': 11, 'Q': 12, 'K': 13, 'A': 14}
-        rank_display = {'2': '2', '3': '3', '4': '4', '5': '5', '6': '6', '7': '7', 
-                        '8': '8', '9': '9', 'T': 'T', 'J': 'J', 'Q': 'Q', 'K': 'K', 'A': 'A'}
-        
-        for card in community_cards:
-            if len(card) >= 2:
-                rank = card[0].upper()
-                suit = card[1].lower()
-                ranks.append(rank)
-                suits.append(suit)
-                if rank in rank_map:
-                    rank_values.append(rank_map[rank])
-        
-        # 1. 检查是否有对子
-        rank_counts = Counter(ranks)
-        paired = any(count >= 2 for count in rank_counts.values())
-        
-        # 2. 检查同花可能性
-        suit_counts = Counter(suits)
-        max_suit_count = max(suit_counts.values()) if suit_counts else 0
-        flush_possible = max_suit_count >= 3
-        flush_draw = max_suit_count == 2
-        
-        # 3. 检查顺子可能性
-        unique_values = sorted(set(rank_values))
-        straight_possible = False
-        straight_draw = False
-        connectedness = 0
-        
-        if len(unique_values) >= 3:
-            # 检查连续性
-            for i in range(len(unique_values) - 2):
-                window = unique_values[i:i+3]
-                gap = window[-1] - window[0]
-                if gap <= 4:  # 3 张牌跨度 <= 4，可能有顺子
-                    straight_possible = True
-                    connectedness = max(connectedness, 5 - gap)
-        
-        if len(unique_values) >= 2 and not straight_possible:
-            for i in range(len(unique_values) - 1):
-                gap = unique_values[i+1] - unique_values[i]
-                if gap <= 3:  # 2 张牌跨度 <= 3，有顺子听牌
-                    straight_draw = True
-                    connectedness = max(connectedness, 4 - gap)
-        
-        # 4. 最高牌
-        high_card = "None"
-        if rank_values:
-            max_val = max(rank_values)
-            for r, v in rank_map.items():
-                if v == max_val:
-                    high_card = rank_display[r]
-                    break
-        
-        # 5. 综合判断纹理
-        wetness_score = 0
-        if flush_possible:
-            wetness_score += 3
-        elif flush_draw:
-            wetness_score += 1
-        if straight_possible:
-            wetness_score += 3
-        elif straight_draw:
-            wetness_score += 1
-        if paired:
-            wetness_score -= 1  # 对子牌面稍微干燥
-        
-        if wetness_score >= 4:
-            texture = "wet"
-            texture_cn = "湿润"
-        elif wetness_score >= 2:
-            texture = "semi_wet"
-            texture_cn = "半湿润"
-        else:
-            texture = "dry"
-            texture_cn = "干燥"
-        
-        # 6. 生成描述
-        desc_parts = []
-        desc_parts.append(f"最高牌 {high_card}")
-        if paired:
-            desc_parts.append("有对子")
-        if flush_possible:
-            desc_parts.append("同花已成或听牌危险")
-        elif flush_draw:
-            desc_parts.append("两张同色")
-        if straight_possible:
-            desc_parts.append("顺子可能")
-        elif straight_draw:
-            desc_parts.append("顺子听牌可能")
-        
-        description = f"{texture_cn}牌面 - " + ", ".join(desc_parts)
-        
-        return {
-            "texture": texture,
-            "texture_cn": texture_cn,
-            "paired": paired,
-            "flush_possible": flush_possible,
-            "flush_draw": flush_draw,
-            "straight_possible": straight_possible,
-            "straight_draw": straight_draw,
-            "high_card": high_card,
-            "connectedness": connectedness,
-            "description": description
-        }
+        # 查表: 翻牌按预计算索引，转牌/河牌在翻牌状态上增量更新
+        try:
+            cards = card_codec.parse_cards(community_cards)
+        except KeyError:
+            cards = []
+        return board_texture(cards)
     
     def analyze_hand_harrington(
         self,
@@ -521,7 +687,8 @@ class PokerMath:
         to_call: int,
         my_stack: int,
         opponent_stacks: List[int],
-        big_blind: int
+        big_blind: int,
+        num_opponents: int = 1
     ) -> Dict[str, Any]:
         """
         Harrington 理论综合分析
@@ -535,12 +702,13 @@ class PokerMath:
             my_stack: 我的筹码
             opponent_stacks: 对手筹码列表
             big_blind: 大盲注
+            num_opponents: 仍在牌局中的对手数量
             
         Returns:
             包含所有 Harrington 分析数据的字典
         """
         # 基础数学分析
-        basic = self.analyze_hand(hole_cards, community_cards, pot_size, to_call)
+        basic = self.analyze_hand(hole_cards, community_cards, pot_size, to_call, num_opponents)
         
         # 有效筹码深度
         effective_stack_bb = self.calculate_effective_stack_bb(my_stack, opponent_stacks, big_blind)
@@ -588,6 +756,9 @@ class PokerMath:
         # 牌型评估（关键！告诉 LLM 实际组成的牌型）
         made_hand = self.evaluate_made_hand(hole_cards, community_cards)
         
+        # 补牌数 (翻牌/转牌)
+        outs = self.calculate_outs(hole_cards, community_cards)
+        
         return {
             # 基础数学
             **basic,
@@ -617,5 +788,12 @@ class PokerMath:
             "is_strong_hand": made_hand["is_strong"],
             "is_monster_hand": made_hand.get("is_monster", False),
             "is_nuts_possible": made_hand.get("is_nuts_possible", False),
+            
+            # 补牌
+            "outs": outs["outs"],
+            "outs_by_category": outs["outs_by_category"],
+            "outs_next_card_probability": outs["next_card_probability"],
+            "outs_by_river_probability": outs["by_river_probability"],
+            "outs_description": outs["description"],
         }
 
@@ -0,0 +1,156 @@
+"""
+翻牌前胜率表模块
+翻牌前胜率只取决于起手牌类别（169 种规范手牌）和对手数量，
+因此预先离线计算好 169 × 1-9 名对手的胜率表，运行时通过 mmap 加载，查表即可。
+
+表文件格式 (little-endian):
+    header: magic(4s) 'PFEQ' | version(H) | num_classes(H) | max_opponents(H) | 填充至 16 字节
+    body:   float32[num_classes][max_opponents]，第 n 列为对抗 n+1 名对手的胜率
+
+生成表文件: python scripts/build_preflop_equity.py
+"""
+import mmap
+import os
+import struct
+import threading
+from typing import Optional, Sequence
+
+import numpy as np
+
+from poker_assistant.utils import equity_engine
+from poker_assistant.utils.card_codec import RANK_CHARS
+
+NUM_CLASSES = 169
+MAX_OPPONENTS = 9
+
+TABLE_MAGIC = b"PFEQ"
+TABLE_VERSION = 1
+HEADER_FORMAT = "<4sHHH"
+HEADER_SIZE = 16
+
+DEFAULT_TABLE_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "preflop_equity.bin"
+)
+
+
+def hand_class_index(card1: int, card2: int) -> int:
+    """
+    计算两张底牌（整数编码）对应的规范手牌类别下标 (0-168)
+
+    类别排布在 13×13 网格中: 对子在对角线 (r, r)，同花为 (高, 低)，非同花为 (低, 高)。
+    """
+    rank1, rank2 = card1 >> 2, card2 >> 2
+    high, low = max(rank1, rank2), min(rank1, rank2)
+    if high == low or (card1 & 3) == (card2 & 3):
+        return high * 13 + low
+    return low * 13 + high
+
+
+def hand_class_name(index: int) -> str:
+    """类别下标 -> 名称 (e.g., 'AA', 'AKs', 'T9o')"""
+    row, col = divmod(index, 13)
+    if row == col:
+        return RANK_CHARS[row] * 2
+    if row > col:
+        return f"{RANK_CHARS[row]}{RANK_CHARS[col]}s"
+    return f"{RANK_CHARS[col]}{RANK_CHARS[row]}o"
+
+
+def representative_hand(index: int) -> Sequence[int]:
+    """类别下标 -> 该类别的一手代表牌（整数编码）"""
+    row, col = divmod(index, 13)
+    if row == col:
+        return [row * 4, row * 4 + 1]
+    if row > col:
+        return [row * 4, col * 4]
+    return [col * 4, row * 4 + 1]
+
+
+class PreflopEquityTable:
+    """通过 mmap 只读加载的翻牌前胜率表"""
+
+    def __init__(self, path: str = DEFAULT_TABLE_PATH):
+        self.path = path
+        with open(path, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, version, num_classes, max_opponents = struct.unpack_from(HEADER_FORMAT, self._mmap, 0)
+        if magic != TABLE_MAGIC or version != TABLE_VERSION or num_classes != NUM_CLASSES:
+            self._mmap.close()
+            raise ValueError(f"无效的翻牌前胜率表文件: {path}")
+
+        self.max_opponents = max_opponents
+        self.values = np.frombuffer(
+            self._mmap, dtype="<f4", count=num_classes * max_opponents, offset=HEADER_SIZE
+        ).reshape(num_classes, max_opponents)
+
+    def lookup(self, hero: Sequence[int], num_opponents: int = 1) -> Optional[float]:
+        """
+        查询翻牌前胜率
+
+        Args:
+            hero: Hero 两张底牌（整数编码）
+            num_opponents: 对手数量
+
+        Returns:
+            胜率 (0.0 - 1.0)；对手数量超出表范围时返回 None
+        """
+        if not 1 <= num_opponents <= self.max_opponents:
+            return None
+        return float(self.values[hand_class_index(hero[0], hero[1]), num_opponents - 1])
+
+
+def build_table(path: str = DEFAULT_TABLE_PATH, iterations: int = 50000,
+                max_opponents: int = MAX_OPPONENTS, progress=None) -> np.ndarray:
+    """
+    离线生成翻牌前胜率表并写入文件
+
+    Args:
+        path: 输出路径
+        iterations: 每个 (类别, 对手数) 单元的模拟次数
+        max_opponents: 最大对手数量
+        progress: 可选回调 progress(index, name)，每完成一个类别调用一次
+
+    Returns:
+        胜率数组 (169, max_opponents)
+    """
+    values = np.zeros((NUM_CLASSES, max_opponents), dtype="<f4")
+    for index in range(NUM_CLASSES):
+        hero = representative_hand(index)
+        for opponents in range(1, max_opponents + 1):
+            values[index, opponents - 1] = equity_engine.monte_carlo_equity(
+                hero, [], iterations, num_opponents=opponents, seed=index * 16 + opponents
+            )
+        if progress:
+            progress(index, hand_class_name(index))
+
+    header = struct.pack(HEADER_FORMAT, TABLE_MAGIC, TABLE_VERSION, NUM_CLASSES, max_opponents)
+    with open(path, "wb") as f:
+        f.write(header.ljust(HEADER_SIZE, b"\0"))
+        f.write(values.tobytes())
+    return values
+
+
+_table: Optional[PreflopEquityTable] = None
+_table_loaded = False
+_table_lock = threading.Lock()
+
+
+def get_preflop_table() -> Optional[PreflopEquityTable]:
+    """
+    获取进程内共享的翻牌前胜率表（首次调用时 mmap 加载）
+
+    Returns:
+        表对象；表文件不存在或无效时返回 None（调用方回退到 Monte Carlo）
+    """
+    global _table, _table_loaded
+    if not _table_loaded:
+        with _table_lock:
+            if not _table_loaded:
+                try:
+                    _table = PreflopEquityTable()
+                except (OSError, ValueError) as e:
+                    print(f"[PreflopTable] 翻牌前胜率表不可用，回退到 Monte Carlo: {e}")
+                    _table = None
+                _table_loaded = True
+    return _table
@@ -0,0 +1,30 @@
+#!/usr/bin/env python3
+"""
+手牌评估表生成脚本
+由 treys 的 5 张牌查找表推导 5/6/7 张牌完美哈希表，写入 poker_assistant/data/hand_ranks.bin
+"""
+import argparse
+import sys
+import os
+import time
+
+# 添加项目根目录到路径
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from poker_assistant.utils.hand_evaluator import DEFAULT_TABLE_PATH, build_table_file
+
+
+def main():
+    """生成手牌评估表"""
+    parser = argparse.ArgumentParser(description="生成手牌评估表")
+    parser.add_argument("--output", default=DEFAULT_TABLE_PATH, help="输出文件路径")
+    args = parser.parse_args()
+
+    start = time.time()
+    build_table_file(args.output)
+
+    print(f"✅ 已写入: {args.output} ({os.path.getsize(args.output)} 字节, {time.time() - start:.1f}s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,43 @@
+#!/usr/bin/env python3
+"""
+翻牌前胜率表生成脚本
+离线计算 169 种规范起手牌 × 1-9 名对手的胜率，写入 poker_assistant/data/preflop_equity.bin
+"""
+import argparse
+import sys
+import os
+import time
+
+# 添加项目根目录到路径
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from poker_assistant.utils.preflop_table import (
+    DEFAULT_TABLE_PATH, MAX_OPPONENTS, NUM_CLASSES, build_table
+)
+
+
+def main():
+    """生成翻牌前胜率表"""
+    parser = argparse.ArgumentParser(description="生成翻牌前胜率表")
+    parser.add_argument("--output", default=DEFAULT_TABLE_PATH, help="输出文件路径")
+    parser.add_argument("--iterations", type=int, default=50000, help="每个单元的模拟次数")
+    parser.add_argument("--max-opponents", type=int, default=MAX_OPPONENTS, help="最大对手数量")
+    args = parser.parse_args()
+
+    print("=" * 50)
+    print(f"生成翻牌前胜率表 ({NUM_CLASSES} × 1-{args.max_opponents}，每单元 {args.iterations} 次模拟)")
+    print("=" * 50)
+
+    start = time.time()
+
+    def progress(index, name):
+        print(f"  [{index + 1:3d}/{NUM_CLASSES}] {name:<4} ({time.time() - start:.0f}s)")
+
+    values = build_table(args.output, args.iterations, args.max_opponents, progress)
+
+    print(f"\n✅ 已写入: {args.output}")
+    print(f"   AA vs 1: {values[12 * 13 + 12, 0]:.3f} | 72o vs 1: {values[0 * 13 + 5, 0]:.3f}")
+
+
+if __name__ == "__main__":
+    main()
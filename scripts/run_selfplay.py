@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+"""
+自博弈模拟脚本
+在 AI Bot 之间无界面地快速对局，评估性格调参效果
+
+示例:
+    python scripts/run_selfplay.py --hands 100000 --workers 8 --seat tag:hard --seat lag:hard --seat tag:medium:stub
+"""
+import argparse
+import sys
+import os
+
+# 添加项目根目录到路径
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from poker_assistant.engine.self_play import SeatSpec, run_simulation
+
+DEFAULT_SEATS = ["tag:medium", "lag:medium", "tag:hard", "lag:hard", "tag:easy", "lag:easy"]
+
+
+def main():
+    """运行自博弈模拟"""
+    parser = argparse.ArgumentParser(description="AI Bot 自博弈模拟")
+    parser.add_argument("--hands", type=int, default=10000, help="总手数")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="进程数")
+    parser.add_argument("--seat", action="append", default=None,
+                        help="座位配置 persona[:difficulty[:mode]]，mode 为 rule 或 stub，可重复指定")
+    parser.add_argument("--hands-per-game", type=int, default=100, help="每局最多手数")
+    parser.add_argument("--stack", type=int, default=1000, help="初始筹码")
+    parser.add_argument("--small-blind", type=int, default=5, help="小盲注")
+    parser.add_argument("--seed", type=int, default=None, help="随机种子")
+    args = parser.parse_args()
+
+    seats = [SeatSpec.parse(text) for text in (args.seat or DEFAULT_SEATS)]
+
+    print("=" * 60)
+    print(f"自博弈: {len(seats)} 个座位, {args.hands} 手, {args.workers} 个进程")
+    print("=" * 60)
+
+    result = run_simulation(
+        seats, args.hands, workers=args.workers, hands_per_game=args.hands_per_game,
+        initial_stack=args.stack, small_blind=args.small_blind, seed=args.seed,
+    )
+    print(result.format_report())
+
+
+if __name__ == "__main__":
+    main()
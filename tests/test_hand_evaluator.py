@@ -0,0 +1,73 @@
+"""
+hand_evaluator 与 treys 的一致性测试
+"""
+import random
+
+import numpy as np
+import pytest
+from treys import Evaluator
+
+from poker_assistant.utils import card_codec, hand_evaluator
+
+_TREYS = Evaluator()
+
+
+def _treys_score(cards):
+    treys_cards = card_codec.to_treys_list(cards)
+    return _TREYS.evaluate(treys_cards[:2], treys_cards[2:])
+
+
+def _random_hands(size, count, seed, flush_heavy=False):
+    rng = random.Random(seed)
+    hands = []
+    for _ in range(count):
+        if flush_heavy:
+            # 至少 5 张同花色，覆盖同花/同花顺路径
+            suit = rng.randrange(4)
+            suited = rng.sample([r * 4 + suit for r in range(13)], 5)
+            rest = rng.sample([c for c in range(52) if c not in suited], size - 5)
+            hand = suited + rest
+            rng.shuffle(hand)
+        else:
+            hand = rng.sample(range(52), size)
+        hands.append(hand)
+    return hands
+
+
+@pytest.mark.parametrize("size", [5, 6, 7])
+@pytest.mark.parametrize("flush_heavy", [False, True])
+def test_evaluate_matches_treys(size, flush_heavy):
+    for hand in _random_hands(size, 2000, seed=size, flush_heavy=flush_heavy):
+        assert hand_evaluator.evaluate(hand) == _treys_score(hand), [card_codec.to_str(c) for c in hand]
+
+
+@pytest.mark.parametrize("size", [5, 6, 7])
+@pytest.mark.parametrize("flush_heavy", [False, True])
+def test_evaluate_batch_matches_treys(size, flush_heavy):
+    hands = _random_hands(size, 2000, seed=100 + size, flush_heavy=flush_heavy)
+    scores = hand_evaluator.evaluate_batch(np.array(hands))
+    assert scores.tolist() == [_treys_score(hand) for hand in hands]
+
+
+def test_rank_class_matches_treys():
+    # treys 把皇家同花顺 (牌力 1) 单独列为等级 0，这里归入同花顺
+    assert hand_evaluator.rank_class(1) == 1
+    for score in range(2, 7463):
+        assert hand_evaluator.rank_class(score) == _TREYS.get_rank_class(score)
+
+
+def test_known_hands():
+    royal = card_codec.parse_cards(["SA", "SK", "SQ", "SJ", "ST", "H2", "D3"])
+    wheel = card_codec.parse_cards(["SA", "H2", "D3", "C4", "S5", "HK", "DQ"])
+    assert hand_evaluator.evaluate(royal) == 1
+    assert hand_evaluator.rank_class(hand_evaluator.evaluate(wheel)) == 5
+
+
+def test_build_arrays_match_table_file(tmp_path):
+    path = tmp_path / "hand_ranks.bin"
+    hand_evaluator.build_table_file(str(path))
+    loaded = hand_evaluator.HandRankTables(str(path))
+    shipped = hand_evaluator.get_hand_tables()
+    for size in hand_evaluator.HAND_SIZES:
+        assert np.array_equal(loaded.rank_tables[size], shipped.rank_tables[size])
+    assert np.array_equal(loaded.flush_table, shipped.flush_table)